@@ -6,7 +6,22 @@ changes. For your final report, you will need to run the application,
 and get results from your run. 
 
 """
+import collections
+import csv
+import itertools
+import json
+import sys
+
 from color_tools import *
+from color_format import format_hex, format_hex_column, hex_digits
+from color_parser import parse_color, parse_color_column, parse_hex
+
+# Batch command line constants
+BATCH_CHUNK_ROWS = 65536
+MEDIUM_BRIGHTNESS = 128
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+OUTPUT_FORMAT_VERSION = 1  # bump when batch output columns or formatting change
+SPOOL_MAX_BYTES = 8 * 1024 * 1024  # output kept in memory before spooling to disk
 
 
 def rgb_to_hex(r: int, g: int, b: int) -> str:
@@ -21,7 +36,7 @@ def rgb_to_hex(r: int, g: int, b: int) -> str:
     Returns:
         str: Hex color code in format #RRGGBB
     """
-    return f"#{r:02x}{g:02x}{b:02x}"
+    return format_hex(r, g, b)
 
 
 def hex_to_rgb(hex_color: str) -> tuple:
@@ -29,20 +44,18 @@ def hex_to_rgb(hex_color: str) -> tuple:
     Convert hex color to RGB values.
 
     Arguments:
-        hex_color (str): Hex color code (with or without #)
+        hex_color (str): Hex color code with 3, 4, 6 or 8 digits (with or without #)
 
     Returns:
         tuple: (r, g, b) values as integers
-    """
-    # Remove # if present
-    hex_color = hex_color.lstrip('#')
 
-    # Convert each pair of hex digits to decimal
-    r = int(hex_color[0:2], 16)
-    g = int(hex_color[2:4], 16)
-    b = int(hex_color[4:6], 16)
-
-    return (r, g, b)
+    Raises:
+        ValueError: If hex_color is not a hex color
+    """
+    color = parse_hex(hex_color)
+    if color is None:
+        raise ValueError(f"invalid hex color {hex_color!r}")
+    return unpack_rgb(color)
 
 
 def create_color_swatch_link(r: int, g: int, b: int) -> str:
@@ -57,7 +70,7 @@ def create_color_swatch_link(r: int, g: int, b: int) -> str:
     Returns:
         str: Either a terminal link or external URL for viewing the color
     """
-    hex_color = rgb_to_hex(r, g, b).lstrip('#')
+    hex_color = hex_digits(r, g, b)
 
     # Try to detect if terminal supports links
     import os
@@ -134,6 +147,24 @@ def display_color_info(r: int, g: int, b: int, label: str = "Color") -> None:
     print(f"  Luminance: {luminance:.3f}")
 
 
+def web_usage(brightness: int) -> str:
+    """
+    Classify a color for web use by its brightness.
+
+    Arguments:
+        brightness (int): Perceived brightness (0-255)
+
+    Returns:
+        str: "background", "text", or "mid-tone"
+    """
+    if brightness > 180:
+        return "background"
+    elif brightness < 80:
+        return "text"
+    else:
+        return "mid-tone"
+
+
 def check_contrast() -> None:
     """
     Check contrast ratio between two colors for WCAG compliance.
@@ -168,8 +199,9 @@ def check_contrast() -> None:
         ("AAA Large Text (4.5:1)", WCAG_AAA_LARGE)
     ]
 
+    level_mask = wcag_level_mask(ratio)
     for test_name, test_level in wcag_tests:
-        if passes_wcag_level(ratio, test_level):
+        if level_mask & WCAG_LEVEL_BITS[test_level]:
             print(f"✓ {test_name} - PASS")
         else:
             print(f"✗ {test_name} - FAIL")
@@ -213,11 +245,11 @@ def analyze_color() -> None:
 
     # Web usage suggestions
     print(f"\nWEB DESIGN SUGGESTIONS:")
-    brightness = calculate_brightness(r, g, b)
-    if brightness > 180:
+    usage = web_usage(calculate_brightness(r, g, b))
+    if usage == "background":
         print("- Good for page backgrounds")
         print("- Pair with dark text colors")
-    elif brightness < 80:
+    elif usage == "text":
         print("- Ideal for text and headings")
         print("- Use on light backgrounds")
     else:
@@ -310,6 +342,563 @@ def test_gray_compatibility() -> None:
         print("- Use with carefully chosen backgrounds only")
 
 
+def read_rows(stream, input_format: str):
+    """
+    Read rows of color strings from a CSV or NDJSON stream, one row at a time.
+    CSV rows are read by position; a first row in which no value is a color
+    is treated as a header. NDJSON lines are either arrays or objects with
+    "foreground"/"background" or "color" keys; other lines are invalid rows.
+
+    Arguments:
+        stream: Open text stream
+        input_format (str): "csv" or "ndjson"
+
+    Yields:
+        tuple: (line_number, list of color strings)
+    """
+    if input_format == "ndjson":
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                yield line_number, []  # reported as an invalid row
+                continue
+            if isinstance(record, dict):
+                if "color" in record:
+                    record = [record["color"]]
+                else:
+                    record = [record.get("foreground"), record.get("background")]
+            elif not isinstance(record, list):
+                yield line_number, []  # e.g. a bare number or null
+                continue
+            yield line_number, [str(value) for value in record]
+    else:
+        for line_number, row in enumerate(csv.reader(stream), 1):
+            if not row:
+                continue
+            if line_number == 1 and all(parse_color(value) is None for value in row):
+                continue  # header row
+            yield line_number, row
+
+
+def compute_contrast(foregrounds, backgrounds) -> dict:
+    """
+    Numeric part of check_contrast() for arrays of foreground/background pairs.
+
+    Arguments:
+        foregrounds, backgrounds: (N, 3) uint8 color arrays
+
+    Returns:
+        dict: "ratio" -> N contrast ratios
+    """
+    return {"ratio": contrast_ratio_batch(foregrounds, backgrounds)}
+
+
+def format_contrast(colors: list, results: dict) -> dict:
+    """
+    Output columns of the contrast subcommand.
+
+    Arguments:
+        colors (list): Foreground and background (N, 3) arrays
+        results (dict): Output of compute_contrast()
+
+    Returns:
+        dict: Output column name -> list of N values
+    """
+    foregrounds, backgrounds = colors
+    ratios = results["ratio"]
+    masks = wcag_level_masks(ratios)
+    return {
+        "foreground": format_hex_column(foregrounds),
+        "background": format_hex_column(backgrounds),
+        "ratio": [round(ratio, 2) for ratio in ratios.tolist()],
+        "aa_normal": masks[WCAG_AA_NORMAL].tolist(),
+        "aa_large": masks[WCAG_AA_LARGE].tolist(),
+        "aaa_normal": masks[WCAG_AAA_NORMAL].tolist(),
+        "aaa_large": masks[WCAG_AAA_LARGE].tolist(),
+        "recommendation": [recommend_adjustment(ratio, WCAG_AA_NORMAL_RATIO)
+                           for ratio in ratios.tolist()],
+    }
+
+
+def compute_analyze(colors, level: str = WCAG_AA_NORMAL) -> dict:
+    """
+    Numeric part of analyze_color() for an array of colors.
+
+    Arguments:
+        colors: (N, 3) uint8 color array
+        level (str): WCAG level for the gray background results
+
+    Returns:
+        dict: "brightness", "luminance", "gray_count", "darkest_gray" -> N values
+    """
+    return {
+        "brightness": calculate_brightness_batch(colors),
+        "luminance": calculate_luminance_batch(colors),
+        "gray_count": calculate_contrast_with_grays_batch(colors, level=level),
+        "darkest_gray": find_accessible_gray_background_batch(colors, level),
+    }
+
+
+def format_analyze(colors: list, results: dict) -> dict:
+    """
+    Output columns of the analyze subcommand.
+
+    Arguments:
+        colors (list): One (N, 3) array of colors
+        results (dict): Output of compute_analyze()
+
+    Returns:
+        dict: Output column name -> list of N values
+    """
+    (rgb,) = colors
+    brightness = results["brightness"].tolist()
+    return {
+        "color": format_hex_column(rgb),
+        "brightness": brightness,
+        "luminance": [round(value, 3) for value in results["luminance"].tolist()],
+        "gray_count": results["gray_count"].tolist(),
+        "darkest_gray": format_hex_column(results["darkest_gray"][:, None].repeat(3, axis=1)),
+        "usage": [web_usage(value) for value in brightness],
+    }
+
+
+def compute_simulate(colors) -> dict:
+    """
+    Numeric part of simulate_colorblind_view() for an array of colors.
+
+    Arguments:
+        colors: (N, 3) uint8 color array
+
+    Returns:
+        dict: Condition string -> (N, 3) simulated colors
+    """
+    return {condition: simulate_colorblindness_batch(colors, condition)
+            for condition in (PROTANOPIA, DEUTERANOPIA, TRITANOPIA)}
+
+
+def format_simulate(colors: list, results: dict) -> dict:
+    """
+    Output columns of the simulate subcommand.
+
+    Arguments:
+        colors (list): One (N, 3) array of colors
+        results (dict): Output of compute_simulate()
+
+    Returns:
+        dict: Output column name -> list of N values
+    """
+    (rgb,) = colors
+    columns = {"color": format_hex_column(rgb)}
+    for condition, simulated in results.items():
+        columns[condition] = format_hex_column(simulated)
+    return columns
+
+
+def compute_grays(colors, level: str = WCAG_AA_NORMAL) -> dict:
+    """
+    Numeric part of test_gray_compatibility() for an array of text colors.
+
+    Arguments:
+        colors: (N, 3) uint8 color array
+        level (str): WCAG level the grays must meet
+
+    Returns:
+        dict: "gray_count", "darkest_gray", "brightness_steps" -> N values
+    """
+    return {
+        "gray_count": calculate_contrast_with_grays_batch(colors, level=level),
+        "darkest_gray": find_accessible_gray_background_batch(colors, level),
+        "brightness_steps": find_minimum_brightness_steps_batch(colors, MEDIUM_BRIGHTNESS),
+    }
+
+
+def format_grays(colors: list, results: dict) -> dict:
+    """
+    Output columns of the grays subcommand.
+
+    Arguments:
+        colors (list): One (N, 3) array of text colors
+        results (dict): Output of compute_grays()
+
+    Returns:
+        dict: Output column name -> list of N values
+    """
+    (rgb,) = colors
+    return {
+        "color": format_hex_column(rgb),
+        "gray_count": results["gray_count"].tolist(),
+        "darkest_gray": format_hex_column(results["darkest_gray"][:, None].repeat(3, axis=1)),
+        "brightness_steps": results["brightness_steps"].tolist(),
+    }
+
+
+def compute_colorblind_contrast(foregrounds, backgrounds) -> dict:
+    """
+    Contrast of foreground/background pairs as seen normally and with each
+    condition simulate_colorblind_view() shows.
+
+    Arguments:
+        foregrounds, backgrounds: (N, 3) uint8 color arrays
+
+    Returns:
+        dict: "ratio" -> (N, 4) contrast ratios, columns in colorblind_sim.AUDIT_VIEWS order
+    """
+    from colorblind_sim import audit_colorblind_contrast
+
+    return {"ratio": audit_colorblind_contrast(foregrounds, backgrounds)["ratio"]}
+
+
+def format_colorblind_contrast(colors: list, results: dict) -> dict:
+    """
+    Output columns of the colorblind-contrast subcommand.
+
+    Arguments:
+        colors (list): Foreground and background (N, 3) arrays
+        results (dict): Output of compute_colorblind_contrast()
+
+    Returns:
+        dict: Output column name -> list of N values
+    """
+    from colorblind_sim import AUDIT_VIEWS
+
+    foregrounds, backgrounds = colors
+    ratios = results["ratio"]
+    masks = wcag_level_masks(ratios)
+    columns = {
+        "foreground": format_hex_column(foregrounds),
+        "background": format_hex_column(backgrounds),
+    }
+    for column, view in enumerate(AUDIT_VIEWS):
+        columns[f"{view}_ratio"] = [round(ratio, 2) for ratio in ratios[:, column].tolist()]
+        columns[f"{view}_aa_normal"] = masks[WCAG_AA_NORMAL][:, column].tolist()
+    return columns
+
+
+# A batch subcommand: color columns per row, compute function, its results as
+# name -> (dtype, shape of one row) (see batch_columns), and the function that
+# formats the rows
+BatchCommand = collections.namedtuple(
+    "BatchCommand", ["color_columns", "compute", "outputs", "format", "options"])
+
+BATCH_COMMANDS = {
+    "contrast": BatchCommand(2, compute_contrast, {"ratio": ("f8", ())},
+                             format_contrast, ()),
+    "analyze": BatchCommand(1, compute_analyze,
+                            {"brightness": ("i8", ()), "luminance": ("f8", ()),
+                             "gray_count": ("i8", ()), "darkest_gray": ("i8", ())},
+                            format_analyze, ("level",)),
+    "simulate": BatchCommand(1, compute_simulate,
+                             {condition: ("u1", (3,))
+                              for condition in (PROTANOPIA, DEUTERANOPIA, TRITANOPIA)},
+                             format_simulate, ()),
+    "colorblind-contrast": BatchCommand(2, compute_colorblind_contrast,
+                                        {"ratio": ("f8", (4,))},
+                                        format_colorblind_contrast, ()),
+    "grays": BatchCommand(1, compute_grays,
+                          {"gray_count": ("i8", ()), "darkest_gray": ("i8", ()),
+                           "brightness_steps": ("i8", ())},
+                          format_grays, ("level",)),
+}
+
+
+def batch_columns(command: str) -> list:
+    """
+    Output column names of a batch subcommand.
+
+    Examples:
+        >>> batch_columns("simulate")
+        ['color', 'protanopia', 'deuteranopia', 'tritanopia']
+
+    Arguments:
+        command (str): Key of BATCH_COMMANDS
+
+    Returns:
+        list: Column names, in output order
+    """
+    import numpy as np
+
+    batch_command = BATCH_COMMANDS[command]
+    colors = [np.zeros((0, 3), dtype=np.uint8)] * batch_command.color_columns
+    results = {name: np.zeros((0,) + tuple(row_shape), dtype=dtype)
+               for name, (dtype, row_shape) in batch_command.outputs.items()}
+    return list(batch_command.format(colors, results))
+
+
+class BatchWriter:
+    """
+    Writes the result rows of one batch subcommand to a text stream in a
+    single format, so that a run over several inputs yields one CSV table
+    (with one header row) or one NDJSON stream.
+
+    Attributes:
+        output: Text stream the rows are written to
+        output_format (str): "csv" or "ndjson"
+    """
+
+    def __init__(self, command: str, output, output_format: str, header: bool = True) -> None:
+        self.output = output
+        self.output_format = output_format
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.writer(output, lineterminator="\n")
+            if header:
+                self._csv.writerow(batch_columns(command))
+
+    def write_rows(self, columns: dict) -> None:
+        """
+        Write rows given as output columns (see the BATCH_COMMANDS formatters).
+
+        Arguments:
+            columns (dict): Output column name -> list of values, one per row
+        """
+        if self._csv is None:
+            names = list(columns)
+            for values in zip(*columns.values()):
+                self.output.write(json.dumps(dict(zip(names, values))) + "\n")
+        else:
+            self._csv.writerows(
+                [("PASS" if value else "FAIL") if isinstance(value, bool) else value
+                 for value in values]
+                for values in zip(*columns.values()))
+
+    def write(self, text: str) -> None:
+        """
+        Write rows already formatted by a writer with the same output format.
+
+        Arguments:
+            text (str): Formatted rows
+        """
+        self.output.write(text)
+
+
+def audit_rows(rows: list, command: str, output_format: str, **options) -> tuple:
+    """
+    Parse, compute and format one chunk of batch rows. This is the unit of
+    work run_batch() hands to worker processes, so it must stay module-level.
+
+    Arguments:
+        rows (list): (line_number, list of color strings) pairs (see read_rows)
+        command (str): Key of BATCH_COMMANDS
+        output_format (str): "csv" or "ndjson"
+        **options: Options of the subcommand's compute function (e.g. level)
+
+    Returns:
+        tuple: (formatted output rows without a header,
+                list of (line_number, values) rows with invalid colors)
+    """
+    import io
+
+    batch_command = BATCH_COMMANDS[command]
+
+    # Parse a whole column of the chunk at a time; short rows are invalid
+    parsed = [parse_color_column([values[column] if column < len(values) else ""
+                                  for _, values in rows])
+              for column in range(batch_command.color_columns)]
+    valid = parsed[0][1]
+    for _, column_valid in parsed[1:]:
+        valid = valid & column_valid
+    invalid = [row for row, row_valid in zip(rows, valid.tolist()) if not row_valid]
+    if not valid.any():
+        return "", invalid
+
+    arrays = [colors[valid] for colors, _ in parsed]
+    results = batch_command.compute(*arrays, **options)
+    buffer = io.StringIO(newline="")
+    BatchWriter(command, buffer, output_format, header=False).write_rows(
+        batch_command.format(arrays, results))
+    return buffer.getvalue(), invalid
+
+
+def run_batch(command: str, rows, writer: BatchWriter,
+              level: str = WCAG_AA_NORMAL, chunk_rows: int = BATCH_CHUNK_ROWS,
+              executor=None) -> int:
+    """
+    Run a batch subcommand over rows of colors and stream the results.
+    Rows are processed chunk_rows at a time through the vectorized
+    color_tools functions, so memory use does not grow with the input.
+    With an executor, each chunk is split into shards that are parsed,
+    computed and formatted in the worker processes (see audit_rows).
+    Rows with invalid colors are reported on stderr and skipped.
+
+    Arguments:
+        command (str): Key of BATCH_COMMANDS
+        rows: Iterable of (line_number, list of color strings) (see read_rows)
+        writer (BatchWriter): Writer for the subcommand's output
+        level (str): WCAG level for the gray columns of analyze and grays
+        chunk_rows (int): Rows per vectorized chunk
+        executor: Optional parallel_audit.ShardedExecutor to spread each
+            chunk over worker processes
+
+    Returns:
+        int: Number of rows skipped because of invalid colors
+    """
+    options = {"level": level} if "level" in BATCH_COMMANDS[command].options else {}
+    skipped = 0
+    rows = iter(rows)
+
+    while True:
+        chunk = list(itertools.islice(rows, chunk_rows))
+        if not chunk:
+            break
+
+        if executor is None:
+            results = [audit_rows(chunk, command, writer.output_format, **options)]
+        else:
+            shards = [chunk[start:start + executor.shard_rows]
+                      for start in range(0, len(chunk), executor.shard_rows)]
+            results = executor.map_text(audit_rows, shards, command=command,
+                                        output_format=writer.output_format, **options)
+        for text, invalid in results:
+            for line_number, values in invalid:
+                print(f"line {line_number}: invalid color row {values!r}", file=sys.stderr)
+            skipped += len(invalid)
+            writer.write(text)
+
+    return skipped
+
+
+class _CopyingStream:
+    """Text stream that writes to an output and, UTF-8 encoded, to a binary copy."""
+
+    def __init__(self, output, copy) -> None:
+        self.output = output
+        self.copy = copy
+
+    def write(self, text: str) -> int:
+        self.output.write(text)
+        self.copy.write(text.encode("utf-8"))
+        return len(text)
+
+
+def run_batch_cached(cache, command: str, path: str, writer: BatchWriter, input_format: str,
+                     level: str = WCAG_AA_NORMAL, chunk_rows: int = BATCH_CHUNK_ROWS,
+                     executor=None) -> int:
+    """
+    run_batch() over an input file, reusing the stored output rows when the
+    file's content, the subcommand, the formats and level, and the algorithm
+    and output format versions are unchanged. Skipped rows are only reported
+    on stderr when the file is actually audited. A fresh audit streams its
+    rows to the output as they are produced, keeping a copy in a spooled
+    temporary file to store afterwards.
+
+    Arguments:
+        cache: audit_cache.AuditCache to read and store results in
+        command (str): Key of BATCH_COMMANDS
+        path (str): Input file
+        writer (BatchWriter): Writer for the subcommand's output
+        input_format (str): "csv" or "ndjson"
+        level (str): WCAG level for the gray columns of analyze and grays
+        chunk_rows (int): Rows per vectorized chunk
+        executor: Optional parallel_audit.ShardedExecutor
+
+    Returns:
+        int: Number of rows skipped because of invalid colors
+    """
+    import tempfile
+
+    from audit_cache import content_key, file_digest
+
+    options = {"format": input_format, "output_format": writer.output_format,
+               "output_version": OUTPUT_FORMAT_VERSION}
+    if "level" in BATCH_COMMANDS[command].options:
+        options["level"] = level
+    key = content_key(file_digest(path), command, **options)
+
+    cached = cache.get(key)
+    if cached is not None:
+        text, skipped = cached
+        writer.output.write(text.decode("utf-8"))
+        return skipped
+
+    # Only the rows are stored; the header belongs to the whole run
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        copying = BatchWriter(command, _CopyingStream(writer.output, spool),
+                              writer.output_format, header=False)
+        with open(path, newline="") as stream:
+            skipped = run_batch(command, read_rows(stream, input_format), copying,
+                                level, chunk_rows, executor)
+        if spool.tell() <= cache.max_bytes:  # larger outputs are not stored
+            spool.seek(0)
+            cache.put(key, spool.read(), skipped)
+    return skipped
+
+
+def batch_main(argv: list) -> int:
+    """
+    Non-interactive entry point: run one batch subcommand over CSV or NDJSON input.
+
+    Arguments:
+        argv (list): Command line arguments after the program name
+
+    Returns:
+        int: Process exit status (1 if any input row was skipped)
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="accessibility_analyzer.py",
+        description="Run the accessibility checks over colors read from CSV or NDJSON.")
+    parser.add_argument("command", choices=sorted(BATCH_COMMANDS))
+    parser.add_argument("inputs", nargs="*", default=["-"],
+                        help="input files (default or '-': stdin)")
+    parser.add_argument("--format", choices=["csv", "ndjson"],
+                        help="input and output format (default: from each file's extension, "
+                             "else csv; the output uses the first input's format)")
+    parser.add_argument("--level", default=WCAG_AA_NORMAL, choices=sorted(WCAG_LEVEL_RATIOS),
+                        help="WCAG level for the gray columns (analyze, grays)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes (0: one per available core)")
+    parser.add_argument("--cache", nargs="?", const="", metavar="PATH",
+                        help="reuse results of unchanged input files from an SQLite cache "
+                             "(default path: audit_cache.DEFAULT_CACHE_PATH)")
+    args = parser.parse_args(argv)
+
+    executor = None
+    chunk_rows = BATCH_CHUNK_ROWS
+    if args.workers != 1:
+        from parallel_audit import ShardedExecutor
+
+        executor = ShardedExecutor(args.workers or None, shard_rows=BATCH_CHUNK_ROWS)
+        chunk_rows = BATCH_CHUNK_ROWS * executor.workers  # one shard per worker
+
+    cache = None
+    if args.cache is not None:
+        from audit_cache import DEFAULT_CACHE_PATH, AuditCache
+
+        cache = AuditCache(args.cache or DEFAULT_CACHE_PATH)
+
+    def input_format(path: str) -> str:
+        if args.format is not None:
+            return args.format
+        return "ndjson" if path.endswith(NDJSON_EXTENSIONS) else "csv"
+
+    # One writer for all inputs, so the output is a single CSV table or NDJSON stream
+    writer = BatchWriter(args.command, sys.stdout, input_format(args.inputs[0]))
+    skipped = 0
+    try:
+        for path in args.inputs:
+            if path == "-":
+                skipped += run_batch(args.command, read_rows(sys.stdin, input_format(path)),
+                                     writer, args.level, chunk_rows, executor)
+            elif cache is not None:
+                skipped += run_batch_cached(cache, args.command, path, writer,
+                                            input_format(path), args.level, chunk_rows, executor)
+            else:
+                with open(path, newline="") as stream:
+                    skipped += run_batch(args.command, read_rows(stream, input_format(path)),
+                                         writer, args.level, chunk_rows, executor)
+    finally:
+        if executor is not None:
+            executor.close()
+        if cache is not None:
+            cache.close()
+
+    return 1 if skipped else 0
+
+
 def display_menu() -> None:
     """
     Display the main menu options for the application.
@@ -326,12 +915,23 @@ def display_menu() -> None:
     print("="*50)
 
 
-def main() -> None:
+def main(argv: list = None) -> None:
     """
     Main application loop for the web accessibility analyzer.
     Provides a menu-driven interface for testing color accessibility compliance
-    and analyzing color properties for inclusive web design.
+    and analyzing color properties for inclusive web design. When command line
+    arguments are given, runs the matching batch subcommand instead (see batch_main).
+
+    Arguments:
+        argv (list): Command line arguments (default sys.argv[1:])
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        sys.exit(batch_main(argv))
+
+    enable_color_atlas()  # per-color gray queries read the atlas file when it is built
+
     print("WEB ACCESSIBILITY COLOR ANALYZER")
     print("Ensure your website colors meet accessibility standards!")
     print("Enter all colors in hex format (e.g., #FF8040)")
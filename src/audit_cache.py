@@ -0,0 +1,187 @@
+"""
+Persistent cache of batch audit results, stored in SQLite.
+
+A result is keyed by the SHA-256 of the input file's content together with the
+subcommand, its options, color_tools.ALGORITHM_VERSION and
+colorblind_sim.SIMULATION_VERSION, so an unchanged file is never audited twice
+and any algorithm change invalidates every entry. When the stored results grow
+past max_bytes, the least recently used entries are evicted; a result larger
+than max_bytes is not stored at all.
+
+The database runs in WAL mode with a busy timeout, and every write is a
+single immediate transaction, so any number of worker processes can share
+one cache file (each opens its own AuditCache).
+
+The file is looked for at AUDIT_CACHE_PATH, or audit_cache.sqlite next to
+this module.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from color_tools import ALGORITHM_VERSION
+from colorblind_sim import SIMULATION_VERSION
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "AUDIT_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "audit_cache.sqlite"))
+
+# Total size of stored results kept before the oldest are evicted
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Seconds to wait for another process to finish writing
+BUSY_TIMEOUT_SECONDS = 30.0
+
+# Bytes read at a time when hashing input files
+HASH_BLOCK_BYTES = 1 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    output BLOB NOT NULL,
+    skipped INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+def content_key(digest: str, command: str, **options) -> str:
+    """
+    Cache key of an audit: the input content digest, the subcommand, its
+    options and the color_tools and colorblind_sim algorithm versions.
+
+    Examples:
+        >>> content_key("ab", "contrast") == content_key("ab", "contrast")
+        True
+        >>> content_key("ab", "grays", level="AA_NORMAL") == content_key("ab", "grays", level="AAA_NORMAL")
+        False
+
+    Arguments:
+        digest (str): Hex SHA-256 of the input (see file_digest)
+        command (str): Batch subcommand
+        **options: Everything else that changes the output, e.g. the
+            formats, the level and the caller's output format version
+
+    Returns:
+        str: Hex SHA-256 key
+    """
+    description = json.dumps([ALGORITHM_VERSION, SIMULATION_VERSION, command, options, digest],
+                             sort_keys=True)
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """
+    SHA-256 of a file's content, read in blocks.
+
+    Arguments:
+        path (str): File to hash
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as stream:
+        for block in iter(lambda: stream.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AuditCache:
+    """
+    SQLite-backed store of audit outputs. Use as a context manager so the
+    connection is closed afterwards.
+
+    Attributes:
+        path (str): Database file
+        max_bytes (int): Total output size kept before eviction
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        # Autocommit mode: transactions are opened explicitly in put()
+        self._connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS,
+                                           isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "AuditCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def get(self, key: str):
+        """
+        Look up a stored audit and mark it as recently used.
+
+        Arguments:
+            key (str): Key from content_key()
+
+        Returns:
+            tuple or None: (output bytes, skipped row count), or None on a miss
+        """
+        row = self._connection.execute(
+            "SELECT output, skipped FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._connection.execute(
+            "UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return bytes(row[0]), row[1]
+
+    def put(self, key: str, output: bytes, skipped: int = 0) -> None:
+        """
+        Store an audit output, then evict the least recently used outputs
+        while the total size is above max_bytes. An output larger than
+        max_bytes on its own is not stored, and nothing is evicted for it.
+
+        Arguments:
+            key (str): Key from content_key()
+            output (bytes): Audit output
+            skipped (int): Number of invalid rows in the input
+        """
+        if len(output) > self.max_bytes:
+            return
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, output, skipped, size, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, output, skipped, len(output), time.time()))
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                evicted = []
+                for old_key, size in connection.execute(
+                        "SELECT key, size FROM results ORDER BY last_used"):
+                    if total <= self.max_bytes:
+                        break
+                    evicted.append((old_key,))
+                    total -= size
+                connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def total_bytes(self) -> int:
+        """
+        Total size of the stored outputs.
+
+        Returns:
+            int: Bytes
+        """
+        return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
@@ -0,0 +1,405 @@
+"""
+Precomputed per-color results for the whole 24-bit sRGB gamut.
+
+The atlas file stores, for every one of the 16,777,216 colors, the
+calculate_luminance() value (float64, so exactly the computed value),
+calculate_brightness(), the calculate_contrast_with_grays() count and the
+find_accessible_gray_background() result (all with their default step and
+level). A color's entry is at index (r << 16) | (g << 8) | b in each section,
+so a query is one indexed read from a memory-mapped file.
+color_tools.enable_color_atlas() makes color_tools' own gray queries read it.
+
+Build the file once (in parallel across cores) with:
+
+    python color_atlas.py build [path] [--workers N]
+
+and check it with:
+
+    python color_atlas.py verify [path]
+
+The file is looked for at COLOR_ATLAS_PATH, or color_atlas.bin next to this
+module. The header records color_tools.ALGORITHM_VERSION; a file built by
+another version is rejected like a missing one, and every query then falls
+back to computing the value with color_tools.
+"""
+import hashlib
+import multiprocessing
+import os
+import struct
+import sys
+
+import numpy as np
+
+from color_tools import (ALGORITHM_VERSION, calculate_brightness, calculate_brightness_batch,
+                         calculate_contrast_with_grays,
+                         calculate_contrast_with_grays_batch,
+                         calculate_luminance, calculate_luminance_batch,
+                         find_accessible_gray_background,
+                         find_accessible_gray_background_batch)
+
+# File layout
+ATLAS_MAGIC = b"CLRATLAS"
+ATLAS_VERSION = 2
+# magic, file format version, color_tools.ALGORITHM_VERSION, color count, sha256
+ATLAS_HEADER = struct.Struct("<8sIII32s")
+ATLAS_HEADER_SIZE = 64  # header is padded so the float64 section is aligned
+COLOR_COUNT = 1 << 24
+COLORS_PER_RED = 1 << 16
+
+# Sections in file order: (name, dtype)
+ATLAS_SECTIONS = (
+    ("luminance", np.float64),
+    ("brightness", np.uint8),
+    ("gray_count", np.uint8),
+    ("gray_background", np.uint8),
+)
+
+DEFAULT_ATLAS_PATH = os.environ.get(
+    "COLOR_ATLAS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "color_atlas.bin"))
+
+CHECKSUM_BLOCK_SIZE = 1 << 24
+
+
+def color_index(r: int, g: int, b: int) -> int:
+    """
+    Position of a color in every atlas section.
+
+    Examples:
+        >>> color_index(0, 0, 0)
+        0
+        >>> color_index(255, 255, 255)
+        16777215
+        >>> color_index(1, 2, 3)
+        66051
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        int: (r << 16) | (g << 8) | b
+    """
+    return (r << 16) | (g << 8) | b
+
+
+def _section_offsets() -> dict:
+    """Byte offset of each section in the atlas file."""
+    offsets = {}
+    offset = ATLAS_HEADER_SIZE
+    for name, dtype in ATLAS_SECTIONS:
+        offsets[name] = offset
+        offset += COLOR_COUNT * np.dtype(dtype).itemsize
+    return offsets
+
+
+def _file_size() -> int:
+    """Total size in bytes of a complete atlas file."""
+    return ATLAS_HEADER_SIZE + sum(COLOR_COUNT * np.dtype(dtype).itemsize
+                                   for _, dtype in ATLAS_SECTIONS)
+
+
+def _map_sections(path: str, mode: str) -> dict:
+    """Memory-map every section of the atlas file at path."""
+    offsets = _section_offsets()
+    return {name: np.memmap(path, dtype=dtype, mode=mode,
+                            offset=offsets[name], shape=(COLOR_COUNT,))
+            for name, dtype in ATLAS_SECTIONS}
+
+
+def _payload_checksum(path: str) -> bytes:
+    """sha256 of everything after the header."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as atlas_file:
+        atlas_file.seek(ATLAS_HEADER_SIZE)
+        for block in iter(lambda: atlas_file.read(CHECKSUM_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+class ColorAtlas:
+    """
+    A loaded atlas file. Each attribute is a read-only memory-mapped array of
+    COLOR_COUNT entries indexed by color_index().
+
+    Attributes:
+        luminance (np.memmap): float64 calculate_luminance() values
+        brightness (np.memmap): uint8 calculate_brightness() values
+        gray_count (np.memmap): uint8 calculate_contrast_with_grays() counts
+        gray_background (np.memmap): uint8 find_accessible_gray_background() grays
+    """
+
+    def __init__(self, path: str, sections: dict) -> None:
+        self.path = path
+        self.luminance = sections["luminance"]
+        self.brightness = sections["brightness"]
+        self.gray_count = sections["gray_count"]
+        self.gray_background = sections["gray_background"]
+
+
+def load_atlas(path: str = DEFAULT_ATLAS_PATH, verify: bool = False) -> ColorAtlas:
+    """
+    Memory-map an atlas file after checking its header.
+
+    Arguments:
+        path (str): Atlas file to open
+        verify (bool): Also recompute the payload checksum (reads the whole file)
+
+    Returns:
+        ColorAtlas: The mapped atlas
+
+    Raises:
+        FileNotFoundError: If there is no file at path
+        ValueError: If the file is not a complete atlas of this format and
+            algorithm version
+    """
+    with open(path, "rb") as atlas_file:
+        header = atlas_file.read(ATLAS_HEADER.size)
+    if len(header) < ATLAS_HEADER.size:
+        raise ValueError(f"{path} is too short to be a color atlas")
+
+    magic, version, algorithm_version, count, checksum = ATLAS_HEADER.unpack(header)
+    if magic != ATLAS_MAGIC:
+        raise ValueError(f"{path} is not a color atlas")
+    if version != ATLAS_VERSION:
+        raise ValueError(f"{path} is atlas version {version}, expected {ATLAS_VERSION}")
+    if algorithm_version != ALGORITHM_VERSION:
+        raise ValueError(f"{path} was built by algorithm version {algorithm_version}, "
+                         f"expected {ALGORITHM_VERSION}; rebuild it")
+    if count != COLOR_COUNT or os.path.getsize(path) != _file_size():
+        raise ValueError(f"{path} is incomplete")
+    if verify and _payload_checksum(path) != checksum:
+        raise ValueError(f"{path} failed its checksum")
+
+    return ColorAtlas(path, _map_sections(path, "r"))
+
+
+_loaded_atlas = None
+_atlas_checked = False
+
+
+def get_atlas():
+    """
+    Return the default atlas, mapping it on first use.
+
+    Returns:
+        ColorAtlas or None: None when the file is missing or unusable
+    """
+    global _loaded_atlas, _atlas_checked
+    if not _atlas_checked:
+        _atlas_checked = True
+        try:
+            _loaded_atlas = load_atlas(DEFAULT_ATLAS_PATH)
+        except (OSError, ValueError):
+            _loaded_atlas = None
+    return _loaded_atlas
+
+
+def atlas_luminance(r: int, g: int, b: int) -> float:
+    """
+    calculate_luminance() from the atlas, or computed live.
+
+    Examples:
+        >>> round(atlas_luminance(255, 255, 255), 3)
+        1.0
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        float: Relative luminance value (0.0-1.0)
+    """
+    atlas = get_atlas()
+    if atlas is None:
+        return calculate_luminance(r, g, b)
+    return float(atlas.luminance[color_index(r, g, b)])
+
+
+def atlas_brightness(r: int, g: int, b: int) -> int:
+    """
+    calculate_brightness() from the atlas, or computed live.
+
+    Examples:
+        >>> atlas_brightness(255, 0, 0)
+        76
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        int: Perceived brightness (0-255)
+    """
+    atlas = get_atlas()
+    if atlas is None:
+        return calculate_brightness(r, g, b)
+    return int(atlas.brightness[color_index(r, g, b)])
+
+
+def atlas_gray_count(r: int, g: int, b: int) -> int:
+    """
+    calculate_contrast_with_grays() from the atlas, or computed live.
+
+    Examples:
+        >>> atlas_gray_count(0, 0, 0)
+        28
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        int: Count of gray levels that provide AA contrast
+    """
+    atlas = get_atlas()
+    if atlas is None:
+        return calculate_contrast_with_grays(r, g, b)
+    return int(atlas.gray_count[color_index(r, g, b)])
+
+
+def atlas_gray_background(r: int, g: int, b: int) -> int:
+    """
+    find_accessible_gray_background() from the atlas, or computed live.
+
+    Examples:
+        >>> atlas_gray_background(0, 0, 0)
+        117
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        int: Darkest gray value (0-255) that provides AA contrast
+    """
+    atlas = get_atlas()
+    if atlas is None:
+        return find_accessible_gray_background(r, g, b)
+    return int(atlas.gray_background[color_index(r, g, b)])
+
+
+def atlas_lookup_batch(colors) -> dict:
+    """
+    Every atlas value for an (N, 3) array of colors, or computed live.
+
+    Examples:
+        >>> atlas_lookup_batch([(0, 0, 0)])["gray_background"].tolist()
+        [117]
+
+    Arguments:
+        colors: (N, 3) uint8 colors
+
+    Returns:
+        dict: Section name -> N-length array
+    """
+    colors = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+    atlas = get_atlas()
+    if atlas is None:
+        return {
+            "luminance": calculate_luminance_batch(colors),
+            "brightness": calculate_brightness_batch(colors).astype(np.uint8),
+            "gray_count": calculate_contrast_with_grays_batch(colors).astype(np.uint8),
+            "gray_background": find_accessible_gray_background_batch(colors).astype(np.uint8),
+        }
+    indices = ((colors[:, 0].astype(np.int64) << 16)
+               | (colors[:, 1].astype(np.int64) << 8) | colors[:, 2])
+    return {name: getattr(atlas, name)[indices] for name, _ in ATLAS_SECTIONS}
+
+
+def _fill_red_slice(task: tuple) -> None:
+    """Compute and write every color with red values in [start, stop)."""
+    path, start, stop = task
+    sections = _map_sections(path, "r+")
+    green, blue = np.divmod(np.arange(COLORS_PER_RED), 256)
+    for red in range(start, stop):
+        colors = np.empty((COLORS_PER_RED, 3), dtype=np.uint8)
+        colors[:, 0] = red
+        colors[:, 1] = green
+        colors[:, 2] = blue
+        window = slice(red * COLORS_PER_RED, (red + 1) * COLORS_PER_RED)
+        sections["luminance"][window] = calculate_luminance_batch(colors)
+        sections["brightness"][window] = calculate_brightness_batch(colors)
+        sections["gray_count"][window] = calculate_contrast_with_grays_batch(colors)
+        sections["gray_background"][window] = find_accessible_gray_background_batch(colors)
+    for section in sections.values():
+        section.flush()
+
+
+def build_atlas(path: str = DEFAULT_ATLAS_PATH, workers: int = None) -> None:
+    """
+    Compute the full atlas and write it to path.
+    Workers write their slices straight into the memory-mapped file; the
+    header (with the checksum) is written last, so an interrupted build
+    leaves a file that load_atlas() rejects.
+
+    Arguments:
+        path (str): File to create (replaced if it exists)
+        workers (int): Number of processes (default: one per CPU)
+    """
+    workers = workers or os.cpu_count() or 1
+    with open(path, "wb") as atlas_file:
+        atlas_file.truncate(_file_size())
+
+    # Several red values per task keeps the per-task overhead small
+    reds_per_task = 4
+    tasks = [(path, start, min(start + reds_per_task, 256))
+             for start in range(0, 256, reds_per_task)]
+    if workers == 1:
+        for task in tasks:
+            _fill_red_slice(task)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for _ in pool.imap_unordered(_fill_red_slice, tasks):
+                pass
+
+    _write_header(path)
+
+
+def _write_header(path: str) -> None:
+    """
+    Write the header of a filled atlas file: the current format and
+    algorithm versions and the checksum of the payload.
+
+    Arguments:
+        path (str): Atlas file whose sections are complete
+    """
+    header = ATLAS_HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, ALGORITHM_VERSION, COLOR_COUNT,
+                               _payload_checksum(path))
+    with open(path, "r+b") as atlas_file:
+        atlas_file.write(header.ljust(ATLAS_HEADER_SIZE, b"\0"))
+
+
+def main(argv: list = None) -> int:
+    """
+    Command line entry point: build or verify an atlas file.
+
+    Arguments:
+        argv (list): Arguments after the program name (default sys.argv[1:])
+
+    Returns:
+        int: Process exit status
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or check the color atlas file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="compute and write the atlas")
+    build_parser.add_argument("path", nargs="?", default=DEFAULT_ATLAS_PATH)
+    build_parser.add_argument("--workers", type=int, default=None,
+                              help="number of processes (default: one per CPU)")
+    verify_parser = commands.add_parser("verify", help="check header and checksum")
+    verify_parser.add_argument("path", nargs="?", default=DEFAULT_ATLAS_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build_atlas(args.path, args.workers)
+        print(f"Wrote {args.path}")
+        return 0
+
+    try:
+        load_atlas(args.path, verify=True)
+    except (OSError, ValueError) as error:
+        print(f"Invalid atlas: {error}", file=sys.stderr)
+        return 1
+    print(f"{args.path} is a valid atlas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
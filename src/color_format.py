@@ -0,0 +1,108 @@
+"""
+Hex formatting of colors, the counterpart of color_parser.
+
+Every channel is turned into its two hex digits with a lookup in a 256-entry
+table instead of a format call. format_hex_column() and format_hex_bytes()
+format whole (N, 3) arrays at once by gathering from the table as bytes.
+"""
+from color_tools import as_rgb_array
+
+try:
+    import numpy as np
+except ImportError:  # the column functions need numpy; the rest does not
+    np = None
+
+# Two lowercase hex digits of every channel value
+HEX_BYTE_TABLE = tuple(f"{value:02x}" for value in range(256))
+_HEX_BYTE_ARRAY = None if np is None else np.frombuffer(
+    "".join(HEX_BYTE_TABLE).encode("ascii"), dtype=np.uint8).reshape(256, 2)
+
+
+def hex_digits(r: int, g: int, b: int) -> str:
+    """
+    The six hex digits of a color, without "#".
+
+    Examples:
+        >>> hex_digits(255, 128, 64)
+        'ff8040'
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        str: "rrggbb"
+    """
+    return HEX_BYTE_TABLE[r] + HEX_BYTE_TABLE[g] + HEX_BYTE_TABLE[b]
+
+
+def format_hex(r: int, g: int, b: int) -> str:
+    """
+    Hex code of a color.
+
+    Examples:
+        >>> format_hex(0, 0, 128)
+        '#000080'
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        str: "#rrggbb"
+    """
+    return "#" + HEX_BYTE_TABLE[r] + HEX_BYTE_TABLE[g] + HEX_BYTE_TABLE[b]
+
+
+def _hex_rows(colors, prefix: bytes, suffix: bytes) -> "np.ndarray":
+    """(N, len(prefix) + 6 + len(suffix)) uint8 array of ASCII rows."""
+    if np is None:
+        raise ImportError("numpy is required for the hex column functions")
+    colors = as_rgb_array(colors)
+    width = len(prefix) + 6 + len(suffix)
+    rows = np.empty((len(colors), width), dtype=np.uint8)
+    rows[:, :len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+    for channel in range(3):
+        start = len(prefix) + 2 * channel
+        rows[:, start:start + 2] = _HEX_BYTE_ARRAY[colors[:, channel]]
+    rows[:, width - len(suffix):] = np.frombuffer(suffix, dtype=np.uint8)
+    return rows
+
+
+def format_hex_column(colors, prefix: str = "#") -> list:
+    """
+    Hex codes of an array of colors.
+
+    Examples:
+        >>> format_hex_column([(255, 128, 64), (0, 0, 0)])
+        ['#ff8040', '#000000']
+
+    Arguments:
+        colors: (N, 3) colors (see color_tools.as_rgb_array)
+        prefix (str): Text before the digits ("" for none)
+
+    Returns:
+        list: N strings
+    """
+    rows = _hex_rows(colors, prefix.encode("ascii"), b"")
+    if not len(rows):
+        return []
+    return rows.view(f"S{rows.shape[1]}").ravel().astype(f"U{rows.shape[1]}").tolist()
+
+
+def format_hex_bytes(colors, prefix: bytes = b"#", separator: bytes = b"\n") -> bytes:
+    """
+    Hex codes of an array of colors as one bytes buffer, each code followed
+    by separator, ready to be written to a binary stream.
+
+    Examples:
+        >>> format_hex_bytes([(255, 128, 64), (0, 0, 0)])
+        b'#ff8040\\n#000000\\n'
+
+    Arguments:
+        colors: (N, 3) colors (see color_tools.as_rgb_array)
+        prefix (bytes): Bytes before each code
+        separator (bytes): Bytes after each code
+
+    Returns:
+        bytes: Formatted codes
+    """
+    return _hex_rows(colors, prefix, separator).tobytes()
@@ -0,0 +1,265 @@
+"""
+Parsing of CSS color strings: hex (#rgb, #rgba, #rrggbb, #rrggbbaa, "#" optional),
+rgb()/rgba(), hsl()/hsla() and the 148 CSS named colors.
+
+Colors are parsed to packed 0xRRGGBB ints (see color_tools.pack_rgb); alpha is
+accepted and ignored. parse_color_column() parses a whole column of strings
+into an (N, 3) uint8 array for the batch functions, parsing each distinct
+string only once.
+"""
+import colorsys
+import re
+import string
+
+from color_tools import RGB_MAX, unpack_rgb, unpack_rgb_array
+
+try:
+    import numpy as np
+except ImportError:  # parse_color_column() needs numpy; the rest does not
+    np = None
+
+# Hex digits of a 3- or 4-digit color, expanded by repetition (0xF -> 0xFF)
+SHORT_HEX_SCALE = 0x11
+
+# CSS named colors (CSS Color Module Level 4)
+NAMED_COLORS = {
+    "aliceblue": 0xF0F8FF, "antiquewhite": 0xFAEBD7, "aqua": 0x00FFFF,
+    "aquamarine": 0x7FFFD4, "azure": 0xF0FFFF, "beige": 0xF5F5DC,
+    "bisque": 0xFFE4C4, "black": 0x000000, "blanchedalmond": 0xFFEBCD,
+    "blue": 0x0000FF, "blueviolet": 0x8A2BE2, "brown": 0xA52A2A,
+    "burlywood": 0xDEB887, "cadetblue": 0x5F9EA0, "chartreuse": 0x7FFF00,
+    "chocolate": 0xD2691E, "coral": 0xFF7F50, "cornflowerblue": 0x6495ED,
+    "cornsilk": 0xFFF8DC, "crimson": 0xDC143C, "cyan": 0x00FFFF,
+    "darkblue": 0x00008B, "darkcyan": 0x008B8B, "darkgoldenrod": 0xB8860B,
+    "darkgray": 0xA9A9A9, "darkgreen": 0x006400, "darkgrey": 0xA9A9A9,
+    "darkkhaki": 0xBDB76B, "darkmagenta": 0x8B008B, "darkolivegreen": 0x556B2F,
+    "darkorange": 0xFF8C00, "darkorchid": 0x9932CC, "darkred": 0x8B0000,
+    "darksalmon": 0xE9967A, "darkseagreen": 0x8FBC8F, "darkslateblue": 0x483D8B,
+    "darkslategray": 0x2F4F4F, "darkslategrey": 0x2F4F4F, "darkturquoise": 0x00CED1,
+    "darkviolet": 0x9400D3, "deeppink": 0xFF1493, "deepskyblue": 0x00BFFF,
+    "dimgray": 0x696969, "dimgrey": 0x696969, "dodgerblue": 0x1E90FF,
+    "firebrick": 0xB22222, "floralwhite": 0xFFFAF0, "forestgreen": 0x228B22,
+    "fuchsia": 0xFF00FF, "gainsboro": 0xDCDCDC, "ghostwhite": 0xF8F8FF,
+    "gold": 0xFFD700, "goldenrod": 0xDAA520, "gray": 0x808080,
+    "green": 0x008000, "greenyellow": 0xADFF2F, "grey": 0x808080,
+    "honeydew": 0xF0FFF0, "hotpink": 0xFF69B4, "indianred": 0xCD5C5C,
+    "indigo": 0x4B0082, "ivory": 0xFFFFF0, "khaki": 0xF0E68C,
+    "lavender": 0xE6E6FA, "lavenderblush": 0xFFF0F5, "lawngreen": 0x7CFC00,
+    "lemonchiffon": 0xFFFACD, "lightblue": 0xADD8E6, "lightcoral": 0xF08080,
+    "lightcyan": 0xE0FFFF, "lightgoldenrodyellow": 0xFAFAD2, "lightgray": 0xD3D3D3,
+    "lightgreen": 0x90EE90, "lightgrey": 0xD3D3D3, "lightpink": 0xFFB6C1,
+    "lightsalmon": 0xFFA07A, "lightseagreen": 0x20B2AA, "lightskyblue": 0x87CEFA,
+    "lightslategray": 0x778899, "lightslategrey": 0x778899, "lightsteelblue": 0xB0C4DE,
+    "lightyellow": 0xFFFFE0, "lime": 0x00FF00, "limegreen": 0x32CD32,
+    "linen": 0xFAF0E6, "magenta": 0xFF00FF, "maroon": 0x800000,
+    "mediumaquamarine": 0x66CDAA, "mediumblue": 0x0000CD, "mediumorchid": 0xBA55D3,
+    "mediumpurple": 0x9370DB, "mediumseagreen": 0x3CB371, "mediumslateblue": 0x7B68EE,
+    "mediumspringgreen": 0x00FA9A, "mediumturquoise": 0x48D1CC, "mediumvioletred": 0xC71585,
+    "midnightblue": 0x191970, "mintcream": 0xF5FFFA, "mistyrose": 0xFFE4E1,
+    "moccasin": 0xFFE4B5, "navajowhite": 0xFFDEAD, "navy": 0x000080,
+    "oldlace": 0xFDF5E6, "olive": 0x808000, "olivedrab": 0x6B8E23,
+    "orange": 0xFFA500, "orangered": 0xFF4500, "orchid": 0xDA70D6,
+    "palegoldenrod": 0xEEE8AA, "palegreen": 0x98FB98, "paleturquoise": 0xAFEEEE,
+    "palevioletred": 0xDB7093, "papayawhip": 0xFFEFD5, "peachpuff": 0xFFDAB9,
+    "peru": 0xCD853F, "pink": 0xFFC0CB, "plum": 0xDDA0DD,
+    "powderblue": 0xB0E0E6, "purple": 0x800080, "rebeccapurple": 0x663399,
+    "red": 0xFF0000, "rosybrown": 0xBC8F8F, "royalblue": 0x4169E1,
+    "saddlebrown": 0x8B4513, "salmon": 0xFA8072, "sandybrown": 0xF4A460,
+    "seagreen": 0x2E8B57, "seashell": 0xFFF5EE, "sienna": 0xA0522D,
+    "silver": 0xC0C0C0, "skyblue": 0x87CEEB, "slateblue": 0x6A5ACD,
+    "slategray": 0x708090, "slategrey": 0x708090, "snow": 0xFFFAFA,
+    "springgreen": 0x00FF7F, "steelblue": 0x4682B4, "tan": 0xD2B48C,
+    "teal": 0x008080, "thistle": 0xD8BFD8, "tomato": 0xFF6347,
+    "turquoise": 0x40E0D0, "violet": 0xEE82EE, "wheat": 0xF5DEB3,
+    "white": 0xFFFFFF, "whitesmoke": 0xF5F5F5, "yellow": 0xFFFF00,
+    "yellowgreen": 0x9ACD32,
+}
+
+# rgb()/rgba()/hsl()/hsla() with comma- or space-separated arguments
+_FUNCTION_PATTERN = re.compile(r"(rgba?|hsla?)\(\s*([^()]*?)\s*\)", re.IGNORECASE)
+_ARGUMENT_SPLIT = re.compile(r"\s*,\s*|\s*/\s*|\s+")
+_NUMBER_PATTERN = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?(%|deg|turn|rad|grad)?",
+                             re.IGNORECASE)
+_HUE_UNITS_PER_TURN = {"": 360.0, "deg": 360.0, "turn": 1.0, "rad": 6.283185307179586,
+                       "grad": 400.0}
+
+
+def parse_hex(text: str):
+    """
+    Parse a hex color with 3, 4, 6 or 8 digits, "#" optional.
+    The digits are converted with one int() call and split with shifts.
+
+    Examples:
+        >>> hex(parse_hex("#FF8040"))
+        '0xff8040'
+        >>> hex(parse_hex("f84"))
+        '0xff8844'
+        >>> hex(parse_hex("#ff804080"))
+        '0xff8040'
+        >>> parse_hex("#12345") is None
+        True
+        >>> parse_hex("0xff") is None
+        True
+
+    Arguments:
+        text (str): Hex color code
+
+    Returns:
+        int or None: Packed color, or None if text is not a hex color
+    """
+    digits = text.strip()
+    if digits.startswith("#"):
+        digits = digits[1:]
+    length = len(digits)
+    # int() alone would also accept a "0x" prefix, underscores and spaces
+    if length not in (3, 4, 6, 8) or not all(digit in string.hexdigits for digit in digits):
+        return None
+    value = int(digits, 16)
+    if length == 6:
+        return value
+    if length == 8:
+        return value >> 8
+    if length == 4:
+        value >>= 4
+    return (((value >> 8) * SHORT_HEX_SCALE) << 16
+            | (((value >> 4) & 0xF) * SHORT_HEX_SCALE) << 8
+            | (value & 0xF) * SHORT_HEX_SCALE)
+
+
+def _number(text: str, allowed_units: tuple):
+    """Parse a CSS number with one of the allowed units ("" for none) as (value, unit)."""
+    match = _NUMBER_PATTERN.fullmatch(text)
+    if match is None:
+        return None
+    unit = (match.group(1) or "").lower()
+    if unit not in allowed_units:
+        return None
+    return float(text[:len(text) - len(unit)]), unit
+
+
+def _clamp_channel(value: float) -> int:
+    """Round a 0-255 channel value, clamping it like browsers do."""
+    return int(round(min(max(value, 0.0), float(RGB_MAX))))
+
+
+def _parse_function(name: str, arguments: str):
+    """Packed color of rgb()/hsl() arguments, or None."""
+    parts = [part for part in _ARGUMENT_SPLIT.split(arguments) if part]
+    if len(parts) not in (3, 4):
+        return None
+    if len(parts) == 4 and _number(parts[3], ("", "%")) is None:
+        return None  # alpha is validated, then ignored
+
+    if name.startswith("rgb"):
+        channels, units = [], set()
+        for part in parts[:3]:
+            number = _number(part, ("", "%"))
+            if number is None:
+                return None
+            value, unit = number
+            units.add(unit)
+            channels.append(_clamp_channel(value * RGB_MAX / 100 if unit == "%" else value))
+        if "," in arguments and len(units) > 1:
+            return None  # the legacy comma syntax cannot mix numbers and percentages
+        r, g, b = channels
+    else:
+        hue = _number(parts[0], tuple(_HUE_UNITS_PER_TURN))
+        saturation = _number(parts[1], ("%",))
+        lightness = _number(parts[2], ("%",))
+        if hue is None or saturation is None or lightness is None:
+            return None
+        turns = hue[0] / _HUE_UNITS_PER_TURN[hue[1]] % 1.0
+        r, g, b = colorsys.hls_to_rgb(turns, min(max(lightness[0] / 100, 0.0), 1.0),
+                                      min(max(saturation[0] / 100, 0.0), 1.0))
+        r, g, b = (_clamp_channel(channel * RGB_MAX) for channel in (r, g, b))
+    return (r << 16) | (g << 8) | b
+
+
+def parse_color_packed(text: str):
+    """
+    Parse any supported color string.
+
+    Examples:
+        >>> hex(parse_color_packed("rebeccapurple"))
+        '0x663399'
+        >>> hex(parse_color_packed("rgb(255, 128, 0)"))
+        '0xff8000'
+        >>> hex(parse_color_packed("rgb(100% 50% 0% / 0.5)"))
+        '0xff8000'
+        >>> hex(parse_color_packed("hsl(120deg, 100%, 25%)"))
+        '0x8000'
+        >>> parse_color_packed("not a color") is None
+        True
+
+    Arguments:
+        text (str): Color string (case-insensitive)
+
+    Returns:
+        int or None: Packed color, or None if text is not a color
+    """
+    text = text.strip()
+    packed = parse_hex(text)
+    if packed is not None:
+        return packed
+    lowered = text.lower()
+    if lowered in NAMED_COLORS:
+        return NAMED_COLORS[lowered]
+    match = _FUNCTION_PATTERN.fullmatch(lowered)
+    if match is None:
+        return None
+    return _parse_function(match.group(1), match.group(2))
+
+
+def parse_color(text: str):
+    """
+    Parse any supported color string to (r, g, b).
+
+    Examples:
+        >>> parse_color("#FF8040")
+        (255, 128, 64)
+        >>> parse_color("Navy")
+        (0, 0, 128)
+        >>> parse_color("#GG0000") is None
+        True
+
+    Arguments:
+        text (str): Color string
+
+    Returns:
+        tuple or None: (r, g, b) values, or None if text is not a color
+    """
+    packed = parse_color_packed(text)
+    return None if packed is None else unpack_rgb(packed)
+
+
+def parse_color_column(values) -> tuple:
+    """
+    Parse a column of color strings into an array, for the batch functions.
+    Each distinct string is parsed once, which matters for real columns
+    where the same colors repeat many times.
+
+    Examples:
+        >>> colors, valid = parse_color_column(["#fff", "red", "oops", "#fff"])
+        >>> colors.tolist(), valid.tolist()
+        ([[255, 255, 255], [255, 0, 0], [0, 0, 0], [255, 255, 255]], [True, True, False, True])
+
+    Arguments:
+        values: Iterable of color strings
+
+    Returns:
+        tuple: ((N, 3) uint8 colors, (N,) bool mask of valid strings);
+            invalid strings give black
+    """
+    if np is None:
+        raise ImportError("numpy is required for parse_color_column")
+    cache = {}
+    packed = []
+    for value in values:
+        color = cache.get(value)
+        if color is None:
+            color = parse_color_packed(value)
+            color = cache[value] = -1 if color is None else color
+        packed.append(color)
+    packed = np.array(packed, dtype=np.int64)
+    valid = packed >= 0
+    return unpack_rgb_array(np.where(valid, packed, 0)), valid
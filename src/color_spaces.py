@@ -0,0 +1,244 @@
+"""
+Conversions from sRGB to the CIE color spaces used by the perceptual features.
+
+The pipeline is sRGB -> linear light -> XYZ -> CIELAB -> LCh(ab), all for the
+D65 white point. Linear light uses the WCAG gamma formula and constants from
+color_tools, so the Y of a color is exactly its calculate_luminance() value and
+L* follows from it. The array functions take any number of colors at once;
+lab() and lch() convert one color and remember recent results.
+"""
+import functools
+import math
+
+import numpy as np
+
+from color_tools import (BLUE_LUMINANCE_COEFFICIENT, GAMMA_DIVISOR, GAMMA_EXPONENT,
+                         GAMMA_MULTIPLIER, GAMMA_OFFSET, GAMMA_THRESHOLD,
+                         GREEN_LUMINANCE_COEFFICIENT, LINEAR_RGB_ARRAY,
+                         LINEAR_RGB_TABLE, RED_LUMINANCE_COEFFICIENT, RGB_MAX,
+                         as_rgb_array)
+
+# Linear sRGB -> XYZ (IEC 61966-2-1); the Y row is the WCAG luminance weighting
+RGB_TO_XYZ = ((0.4124, 0.3576, 0.1805),
+              (RED_LUMINANCE_COEFFICIENT, GREEN_LUMINANCE_COEFFICIENT, BLUE_LUMINANCE_COEFFICIENT),
+              (0.0193, 0.1192, 0.9505))
+# D65 white in the same scale, so that white maps to L* = 100, a* = b* = 0
+WHITE_XYZ = tuple(sum(row) for row in RGB_TO_XYZ)
+
+# CIELAB companding constants
+LAB_DELTA = 6 / 29
+LAB_EPSILON = LAB_DELTA ** 3
+LAB_SLOPE = 1 / (3 * LAB_DELTA ** 2)
+LAB_INTERCEPT = 4 / 29
+
+# Colors remembered by lab() and lch()
+LAB_CACHE_SIZE = 4096
+
+_RGB_TO_XYZ_T = np.array(RGB_TO_XYZ).T
+_WHITE_XYZ = np.array(WHITE_XYZ)
+
+
+def srgb_to_linear(values) -> np.ndarray:
+    """
+    Convert normalized sRGB values (0.0-1.0) to linear light.
+    Use rgb_to_linear() for 8-bit colors; it is a table lookup.
+
+    Examples:
+        >>> srgb_to_linear([0.0, 0.5, 1.0]).round(4).tolist()
+        [0.0, 0.214, 1.0]
+
+    Arguments:
+        values: Array-like of channel values already divided by RGB_MAX
+
+    Returns:
+        np.ndarray: float64 linear-light values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(values <= GAMMA_THRESHOLD, values / GAMMA_DIVISOR,
+                    ((values + GAMMA_OFFSET) / GAMMA_MULTIPLIER) ** GAMMA_EXPONENT)
+
+
+def rgb_to_linear(colors) -> np.ndarray:
+    """
+    Linear-light channels of 8-bit colors.
+
+    Examples:
+        >>> rgb_to_linear([(255, 0, 128)]).round(4).tolist()
+        [[1.0, 0.0, 0.2159]]
+
+    Arguments:
+        colors: (N, 3) colors (see color_tools.as_rgb_array)
+
+    Returns:
+        np.ndarray: (N, 3) float64 linear-light values
+    """
+    return LINEAR_RGB_ARRAY[as_rgb_array(colors)]
+
+
+def linear_to_xyz(linear) -> np.ndarray:
+    """
+    Convert linear-light RGB to CIE XYZ (D65, Y of white = 1.0).
+
+    Arguments:
+        linear: Array-like whose last axis is linear (r, g, b)
+
+    Returns:
+        np.ndarray: Same shape, last axis (X, Y, Z)
+    """
+    return np.asarray(linear, dtype=np.float64) @ _RGB_TO_XYZ_T
+
+
+def xyz_to_lab(xyz) -> np.ndarray:
+    """
+    Convert CIE XYZ to CIELAB.
+
+    Examples:
+        >>> xyz_to_lab([WHITE_XYZ, (0.0, 0.0, 0.0)]).round(4).tolist()
+        [[100.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+
+    Arguments:
+        xyz: Array-like whose last axis is (X, Y, Z)
+
+    Returns:
+        np.ndarray: Same shape, last axis (L*, a*, b*)
+    """
+    ratio = np.asarray(xyz, dtype=np.float64) / _WHITE_XYZ
+    f = np.where(ratio > LAB_EPSILON, np.cbrt(ratio), ratio * LAB_SLOPE + LAB_INTERCEPT)
+    lab = np.empty_like(f)
+    lab[..., 0] = 116 * f[..., 1] - 16
+    lab[..., 1] = 500 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+def lab_to_lch(lab) -> np.ndarray:
+    """
+    Convert CIELAB to cylindrical LCh(ab): lightness, chroma, hue in degrees (0-360).
+
+    Examples:
+        >>> lab_to_lch([(50.0, 0.0, 10.0)]).tolist()
+        [[50.0, 10.0, 90.0]]
+
+    Arguments:
+        lab: Array-like whose last axis is (L*, a*, b*)
+
+    Returns:
+        np.ndarray: Same shape, last axis (L*, C*, h)
+    """
+    lab = np.asarray(lab, dtype=np.float64)
+    lch = np.empty_like(lab)
+    lch[..., 0] = lab[..., 0]
+    lch[..., 1] = np.hypot(lab[..., 1], lab[..., 2])
+    lch[..., 2] = np.degrees(np.arctan2(lab[..., 2], lab[..., 1])) % 360
+    return lch
+
+
+def lch_to_lab(lch) -> np.ndarray:
+    """
+    Convert LCh(ab) back to CIELAB.
+
+    Arguments:
+        lch: Array-like whose last axis is (L*, C*, h in degrees)
+
+    Returns:
+        np.ndarray: Same shape, last axis (L*, a*, b*)
+    """
+    lch = np.asarray(lch, dtype=np.float64)
+    lab = np.empty_like(lch)
+    hue = np.radians(lch[..., 2])
+    lab[..., 0] = lch[..., 0]
+    lab[..., 1] = lch[..., 1] * np.cos(hue)
+    lab[..., 2] = lch[..., 1] * np.sin(hue)
+    return lab
+
+
+def rgb_to_xyz(colors) -> np.ndarray:
+    """
+    CIE XYZ of 8-bit colors; the Y column equals calculate_luminance_batch().
+
+    Arguments:
+        colors: (N, 3) colors (see color_tools.as_rgb_array)
+
+    Returns:
+        np.ndarray: (N, 3) float64 (X, Y, Z)
+    """
+    return linear_to_xyz(rgb_to_linear(colors))
+
+
+def rgb_to_lab(colors) -> np.ndarray:
+    """
+    CIELAB of 8-bit colors.
+
+    Examples:
+        >>> rgb_to_lab([(255, 0, 0), (0, 0, 255)]).round(2).tolist()
+        [[53.23, 80.11, 67.22], [32.3, 79.19, -107.85]]
+
+    Arguments:
+        colors: (N, 3) colors (see color_tools.as_rgb_array)
+
+    Returns:
+        np.ndarray: (N, 3) float64 (L*, a*, b*)
+    """
+    return xyz_to_lab(rgb_to_xyz(colors))
+
+
+def rgb_to_lch(colors) -> np.ndarray:
+    """
+    LCh(ab) of 8-bit colors.
+
+    Arguments:
+        colors: (N, 3) colors (see color_tools.as_rgb_array)
+
+    Returns:
+        np.ndarray: (N, 3) float64 (L*, C*, h)
+    """
+    return lab_to_lch(rgb_to_lab(colors))
+
+
+def _companded(ratio: float) -> float:
+    """Scalar form of the CIELAB companding function used by xyz_to_lab()."""
+    if ratio > LAB_EPSILON:
+        return ratio ** (1 / 3)
+    return ratio * LAB_SLOPE + LAB_INTERCEPT
+
+
+@functools.lru_cache(maxsize=LAB_CACHE_SIZE)
+def lab(r: int, g: int, b: int) -> tuple:
+    """
+    CIELAB of one color, without numpy overhead. Results for the most recently
+    used LAB_CACHE_SIZE colors are cached (see lab.cache_info()).
+
+    Examples:
+        >>> [round(value, 2) for value in lab(0, 0, 255)]
+        [32.3, 79.19, -107.85]
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        tuple: (L*, a*, b*)
+    """
+    if not all(0 <= channel <= RGB_MAX for channel in (r, g, b)):
+        raise ValueError("RGB values must be between 0 and 255")
+    linear = (LINEAR_RGB_TABLE[r], LINEAR_RGB_TABLE[g], LINEAR_RGB_TABLE[b])
+    fx, fy, fz = (_companded(sum(weight * channel for weight, channel in zip(row, linear)) / white)
+                  for row, white in zip(RGB_TO_XYZ, WHITE_XYZ))
+    return (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+
+
+def lch(r: int, g: int, b: int) -> tuple:
+    """
+    LCh(ab) of one color, from the lab() cache.
+
+    Examples:
+        >>> [round(value, 2) for value in lch(0, 0, 255)]
+        [32.3, 133.81, 306.29]
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        tuple: (L*, C*, h in degrees)
+    """
+    lightness, a, b_star = lab(r, g, b)
+    return (lightness, math.hypot(a, b_star), math.degrees(math.atan2(b_star, a)) % 360)
@@ -5,6 +5,21 @@ Name: Emmanuel Wooten
 Semester: Fall 2025
 """
 
+import array
+import bisect
+import collections
+import math
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed by the *_batch functions
+    np = None
+
+# Version of the results computed here; bump it whenever any function's
+# output changes, so cached audit results (see audit_cache) are recomputed
+ALGORITHM_VERSION = 1
+
 # Constants to avoid magic numbers
 GAMMA_THRESHOLD = 0.03928
 GAMMA_DIVISOR = 12.92
@@ -49,6 +64,253 @@ WCAG_AA_LARGE = "AA_LARGE"
 WCAG_AAA_NORMAL = "AAA_NORMAL"
 WCAG_AAA_LARGE = "AAA_LARGE"
 
+# Minimum contrast ratio for each WCAG level string
+WCAG_LEVEL_RATIOS = {
+    WCAG_AA_NORMAL: WCAG_AA_NORMAL_RATIO,
+    WCAG_AA_LARGE: WCAG_AA_LARGE_RATIO,
+    WCAG_AAA_NORMAL: WCAG_AAA_NORMAL_RATIO,
+    WCAG_AAA_LARGE: WCAG_AAA_LARGE_RATIO,
+}
+
+# Bit of each WCAG level in a level mask (see wcag_level_mask)
+WCAG_AA_NORMAL_BIT = 1
+WCAG_AA_LARGE_BIT = 2
+WCAG_AAA_NORMAL_BIT = 4
+WCAG_AAA_LARGE_BIT = 8
+WCAG_LEVEL_BITS = {
+    WCAG_AA_NORMAL: WCAG_AA_NORMAL_BIT,
+    WCAG_AA_LARGE: WCAG_AA_LARGE_BIT,
+    WCAG_AAA_NORMAL: WCAG_AAA_NORMAL_BIT,
+    WCAG_AAA_LARGE: WCAG_AAA_LARGE_BIT,
+}
+
+# Distinct level ratios in increasing order, and the mask of every level met
+# by a ratio of at least each of them; the levels are nested, so a ratio's
+# mask is the entry of the highest threshold it reaches
+WCAG_MASK_THRESHOLDS = tuple(sorted(set(WCAG_LEVEL_RATIOS.values())))
+WCAG_MASK_STEPS = (0,) + tuple(
+    sum(WCAG_LEVEL_BITS[level] for level, ratio in WCAG_LEVEL_RATIOS.items() if ratio <= threshold)
+    for threshold in WCAG_MASK_THRESHOLDS)
+
+# Packed colors: 0xRRGGBB ints, stored in array(PACKED_TYPECODE) containers
+RED_SHIFT = 16
+GREEN_SHIFT = 8
+CHANNEL_MASK = 0xFF
+PACKED_TYPECODE = "I"
+
+# Batch function constants
+CONTRAST_CHUNK_CELLS = 1 << 22  # ratios per block (32 MiB of float64)
+
+# Lightness solver constants
+LIGHTNESS_BISECTION_STEPS = 40  # halvings of the HSL lightness interval
+
+# Memoization (ContrastCache)
+DEFAULT_CACHE_CAPACITY = 4096  # entries per cache
+PAIR_SHIFT = 24  # contrast keys are (fg << 24) | bg, 48 bits
+
+
+def gamma_correct(channel: float) -> float:
+    """
+    Convert a normalized sRGB channel (0.0-1.0) to linear light (WCAG formula).
+
+    Examples:
+        >>> gamma_correct(0.0)
+        0.0
+        >>> gamma_correct(1.0)
+        1.0
+        >>> round(gamma_correct(0.5), 4)
+        0.214
+
+    Arguments:
+        channel (float): Channel value already divided by RGB_MAX
+
+    Returns:
+        float: Linear-light channel value (0.0-1.0)
+    """
+    if channel <= GAMMA_THRESHOLD:
+        return channel / GAMMA_DIVISOR
+    else:
+        return ((channel + GAMMA_OFFSET) / GAMMA_MULTIPLIER) ** GAMMA_EXPONENT
+
+
+# Linear-light value of every 8-bit channel, built once at import so that
+# calculate_luminance() is three lookups instead of three power functions.
+LINEAR_RGB_TABLE = tuple(gamma_correct(value / RGB_MAX)
+                         for value in range(RGB_MAX + 1))
+LINEAR_RGB_ARRAY = None if np is None else np.array(LINEAR_RGB_TABLE)
+
+
+def _require_numpy() -> None:
+    """Raise a helpful error when a batch function is used without numpy."""
+    if np is None:
+        raise ImportError("numpy is required for the batch color functions")
+
+
+def as_rgb_array(colors) -> "np.ndarray":
+    """
+    Convert colors to an (N, 3) uint8 array for the batch functions.
+
+    Examples:
+        >>> as_rgb_array([(255, 128, 0)]).tolist()
+        [[255, 128, 0]]
+        >>> as_rgb_array(bytes([1, 2, 3, 4, 5, 6])).shape
+        (2, 3)
+        >>> as_rgb_array(pack_colors([(1, 2, 3)])).tolist()
+        [[1, 2, 3]]
+        >>> as_rgb_array([(256, 0, 0)])
+        Traceback (most recent call last):
+        ...
+        ValueError: RGB values must be between 0 and 255
+        >>> as_rgb_array([[255, 128, 0, 255]])
+        Traceback (most recent call last):
+        ...
+        ValueError: colors must have shape (N, 3) or (..., 3), or be a flat buffer
+
+    Arguments:
+        colors: (..., 3) array-like of integer RGB values, a flat sequence or
+            bytes-like buffer of R, G, B values, or an array('I') of packed colors
+
+    Returns:
+        np.ndarray: (N, 3) uint8 array (a view when no conversion is needed)
+    """
+    _require_numpy()
+    if isinstance(colors, array.array) and colors.typecode == PACKED_TYPECODE:
+        return unpack_rgb_array(np.frombuffer(colors, dtype=np.uintc))
+    if isinstance(colors, (bytes, bytearray, memoryview)):
+        colors = np.frombuffer(colors, dtype=np.uint8)
+    colors = np.asarray(colors)
+    if colors.ndim == 1 and colors.size % 3 == 0 or colors.ndim > 1 and colors.shape[-1] == 3:
+        colors = colors.reshape(-1, 3)
+    else:
+        raise ValueError("colors must have shape (N, 3) or (..., 3), or be a flat buffer")
+    if colors.dtype != np.uint8:
+        if not (np.issubdtype(colors.dtype, np.integer) or np.all(np.mod(colors, 1) == 0)):
+            raise ValueError("RGB values must be integers")
+        if colors.size and (colors.min() < RGB_MIN or colors.max() > RGB_MAX):
+            raise ValueError("RGB values must be between 0 and 255")
+        colors = colors.astype(np.uint8)
+    return colors
+
+
+def pack_rgb(r: int, g: int, b: int) -> int:
+    """
+    Pack a color into one int, 0xRRGGBB.
+
+    Examples:
+        >>> hex(pack_rgb(255, 128, 0))
+        '0xff8000'
+        >>> pack_rgb(0, 0, 0)
+        0
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        int: Packed color (0-0xFFFFFF)
+    """
+    return (r << RED_SHIFT) | (g << GREEN_SHIFT) | b
+
+
+def unpack_rgb(color: int) -> tuple:
+    """
+    Split a packed color into (r, g, b).
+
+    Examples:
+        >>> unpack_rgb(0xFF8000)
+        (255, 128, 0)
+
+    Arguments:
+        color (int): Packed color (see pack_rgb)
+
+    Returns:
+        tuple: (r, g, b) values (0-255)
+    """
+    return (color >> RED_SHIFT, (color >> GREEN_SHIFT) & CHANNEL_MASK, color & CHANNEL_MASK)
+
+
+def pack_colors(colors) -> array.array:
+    """
+    Pack (r, g, b) colors into a compact array('I'): 4 bytes per color instead
+    of a tuple and three int objects.
+
+    Examples:
+        >>> pack_colors([(255, 128, 0), (1, 2, 3)]).tolist()
+        [16744448, 66051]
+
+    Arguments:
+        colors: Iterable of (r, g, b) values (0-255)
+
+    Returns:
+        array.array: Packed colors, typecode PACKED_TYPECODE
+    """
+    packed = array.array(PACKED_TYPECODE)
+    for r, g, b in colors:
+        if not (RGB_MIN <= r <= RGB_MAX and RGB_MIN <= g <= RGB_MAX and RGB_MIN <= b <= RGB_MAX):
+            raise ValueError("RGB values must be between 0 and 255")
+        packed.append((r << RED_SHIFT) | (g << GREEN_SHIFT) | b)
+    return packed
+
+
+def pack_rgb_array(colors) -> "np.ndarray":
+    """
+    Packed uint32 colors of an (N, 3) array (the batch form of pack_rgb).
+
+    Examples:
+        >>> pack_rgb_array([(255, 128, 0)]).tolist()
+        [16744448]
+
+    Arguments:
+        colors: (N, 3) colors (see as_rgb_array)
+
+    Returns:
+        np.ndarray: N uint32 packed colors
+    """
+    colors = as_rgb_array(colors).astype(np.uint32)
+    return (colors[:, 0] << RED_SHIFT) | (colors[:, 1] << GREEN_SHIFT) | colors[:, 2]
+
+
+def unpack_rgb_array(packed) -> "np.ndarray":
+    """
+    (N, 3) uint8 colors of packed colors (the batch form of unpack_rgb).
+
+    Examples:
+        >>> unpack_rgb_array([0xFF8000, 0x010203]).tolist()
+        [[255, 128, 0], [1, 2, 3]]
+
+    Arguments:
+        packed: Array-like of packed colors (0-0xFFFFFF)
+
+    Returns:
+        np.ndarray: (N, 3) uint8 colors
+    """
+    _require_numpy()
+    packed = np.asarray(packed).astype(np.uint32).reshape(-1)
+    if packed.size and packed.max() > 0xFFFFFF:
+        raise ValueError("packed colors must be between 0 and 0xFFFFFF")
+    colors = np.empty((len(packed), 3), dtype=np.uint8)
+    colors[:, 0] = packed >> RED_SHIFT
+    colors[:, 1] = (packed >> GREEN_SHIFT) & CHANNEL_MASK
+    colors[:, 2] = packed & CHANNEL_MASK
+    return colors
+
+
+def calculate_luminance_packed(color: int) -> float:
+    """
+    calculate_luminance() of a packed color.
+
+    Examples:
+        >>> calculate_luminance_packed(0xFFFFFF)
+        1.0
+
+    Arguments:
+        color (int): Packed color (see pack_rgb)
+
+    Returns:
+        float: Relative luminance value (0.0-1.0)
+    """
+    return calculate_luminance(color >> RED_SHIFT, (color >> GREEN_SHIFT) & CHANNEL_MASK,
+                               color & CHANNEL_MASK)
+
 
 def calculate_luminance(r: int, g: int, b: int) -> float:
     """
@@ -76,30 +338,52 @@ def calculate_luminance(r: int, g: int, b: int) -> float:
 
     Returns:
         float: Relative luminance value (0.0-1.0)
+
+    Raises:
+        ValueError: If a channel is outside 0-255 (a negative index would
+            otherwise wrap around the lookup table)
     """
-    # Convert to 0-1 range
-    r_norm = r / RGB_MAX
-    g_norm = g / RGB_MAX
-    b_norm = b / RGB_MAX
+    if not (RGB_MIN <= r <= RGB_MAX and RGB_MIN <= g <= RGB_MAX and RGB_MIN <= b <= RGB_MAX):
+        raise ValueError("RGB values must be between 0 and 255")
+    # Look up the gamma-corrected (linear-light) value of each channel
+    luminance = (
+        RED_LUMINANCE_COEFFICIENT * LINEAR_RGB_TABLE[r]
+        + GREEN_LUMINANCE_COEFFICIENT * LINEAR_RGB_TABLE[g]
+        + BLUE_LUMINANCE_COEFFICIENT * LINEAR_RGB_TABLE[b]
+    )
+    return luminance
 
-    # Apply gamma correction (WCAG formula)
-    def gamma_correct(channel):
-        if channel <= GAMMA_THRESHOLD:
-            return channel / GAMMA_DIVISOR
-        else:
-            return ((channel + GAMMA_OFFSET) / GAMMA_MULTIPLIER) ** GAMMA_EXPONENT
 
-    r_linear = gamma_correct(r_norm)
-    g_linear = gamma_correct(g_norm)
-    b_linear = gamma_correct(b_norm)
+def calculate_luminance_batch(colors) -> "np.ndarray":
+    """
+    Calculate relative luminance for many colors at once.
+    Gives exactly the same values as calling calculate_luminance() per color.
 
-    # Calculate luminance using WCAG coefficients
-    luminance = (
-        RED_LUMINANCE_COEFFICIENT * r_linear
-        + GREEN_LUMINANCE_COEFFICIENT * g_linear
-        + BLUE_LUMINANCE_COEFFICIENT * b_linear
+    Examples:
+        >>> calculate_luminance_batch([(255, 255, 255), (0, 0, 0)]).tolist()
+        [1.0, 0.0]
+        >>> calculate_luminance_batch(bytes([128] * 3)).round(3).tolist()
+        [0.216]
+
+    Arguments:
+        colors: (N, 3) uint8 array-like or packed RGB buffer (see as_rgb_array)
+
+    Returns:
+        np.ndarray: N float64 luminance values (0.0-1.0)
+    """
+    colors = as_rgb_array(colors)
+    return (
+        RED_LUMINANCE_COEFFICIENT * LINEAR_RGB_ARRAY[colors[:, 0]]
+        + GREEN_LUMINANCE_COEFFICIENT * LINEAR_RGB_ARRAY[colors[:, 1]]
+        + BLUE_LUMINANCE_COEFFICIENT * LINEAR_RGB_ARRAY[colors[:, 2]]
     )
-    return luminance
+
+
+# Luminance of every gray (v, v, v); strictly increasing with v, which lets the
+# gray background functions bisect instead of scanning
+GRAY_LUMINANCE_TABLE = tuple(calculate_luminance(value, value, value)
+                             for value in range(RGB_MAX + 1))
+GRAY_LUMINANCE_ARRAY = None if np is None else np.array(GRAY_LUMINANCE_TABLE)
 
 
 def simulate_colorblindness(r: int, g: int, b: int, condition: str) -> tuple:
@@ -146,6 +430,56 @@ def simulate_colorblindness(r: int, g: int, b: int, condition: str) -> tuple:
         # Unknown condition, return original
         return (r, g, b)
 
+
+def simulate_colorblindness_packed(color: int, condition: str) -> int:
+    """
+    simulate_colorblindness() of a packed color.
+
+    Examples:
+        >>> hex(simulate_colorblindness_packed(0xFF8040, "protanopia"))
+        '0xbfbf40'
+
+    Arguments:
+        color (int): Packed color (see pack_rgb)
+        condition (str): "protanopia", "deuteranopia", or "tritanopia"
+
+    Returns:
+        int: Packed color as perceived by colorblind person
+    """
+    return pack_rgb(*simulate_colorblindness(*unpack_rgb(color), condition))
+
+
+def simulate_colorblindness_batch(colors, condition: str) -> "np.ndarray":
+    """
+    Simulate colorblindness for many colors at once.
+    Gives exactly the same colors as calling simulate_colorblindness() per color.
+
+    Examples:
+        >>> simulate_colorblindness_batch([(255, 128, 64), (255, 0, 0)], "deuteranopia").tolist()
+        [[223, 223, 64], [191, 191, 0]]
+        >>> simulate_colorblindness_batch([(100, 150, 200)], "unknown").tolist()
+        [[100, 150, 200]]
+
+    Arguments:
+        colors: (N, 3) colors (see as_rgb_array)
+        condition (str): "protanopia", "deuteranopia", or "tritanopia"
+
+    Returns:
+        np.ndarray: (N, 3) uint8 colors as perceived by colorblind person
+    """
+    colors = as_rgb_array(colors)
+    simulated = colors.copy()
+    r = colors[:, 0].astype(np.int64)
+    g = colors[:, 1].astype(np.int64)
+    b = colors[:, 2].astype(np.int64)
+    if condition == PROTANOPIA:
+        simulated[:, 0] = simulated[:, 1] = (r + g) // 2
+    elif condition == DEUTERANOPIA:
+        simulated[:, 0] = simulated[:, 1] = (r * 0.75 + g * 0.25).astype(np.int64)
+    elif condition == TRITANOPIA:
+        simulated[:, 2] = (g + b) // 2
+    return simulated
+
 # Student - you will start implementing each function below
 # Remember, you need to have at least six (6) examples in the doctests.
 # this is meant to encourage you to think through the function
@@ -208,6 +542,24 @@ def contrast_ratio(fg_r: int, fg_g: int, fg_b: int,
     return ratio
 
 
+def contrast_ratio_packed(fg: int, bg: int) -> float:
+    """
+    contrast_ratio() of packed foreground and background colors.
+
+    Examples:
+        >>> round(contrast_ratio_packed(0x000000, 0xFFFFFF), 1)
+        21.0
+
+    Arguments:
+        fg (int): Packed foreground color (see pack_rgb)
+        bg (int): Packed background color
+
+    Returns:
+        float: Contrast ratio (1.0-21.0)
+    """
+    return contrast_ratio(*unpack_rgb(fg), *unpack_rgb(bg))
+
+
 # Thinking
 """
 docstring gives WCAG contrast formula: (L1 + 0.05) / (L2 + 0.05)
@@ -215,6 +567,161 @@ fg = foreground; bg = background (I find it useful to define these things, even
 """
 
 
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "evictions", "size", "capacity"])
+
+
+class PackedLRUCache:
+    """
+    Bounded least-recently-used memo of a function of one int key, with
+    counters for hits, misses and evictions.
+
+    Examples:
+        >>> cache = PackedLRUCache(calculate_luminance_packed, capacity=1)
+        >>> cache(0xFFFFFF), cache(0xFFFFFF), cache(0)
+        (1.0, 1.0, 0.0)
+        >>> cache.info()
+        CacheInfo(hits=1, misses=2, evictions=1, size=1, capacity=1)
+
+    Attributes:
+        function: Function being memoized
+        capacity (int): Maximum number of stored results
+        hits, misses, evictions (int): Counters since creation or clear()
+    """
+
+    def __init__(self, function, capacity: int = DEFAULT_CACHE_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.function = function
+        self.capacity = capacity
+        self._results = collections.OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def __call__(self, key: int):
+        results = self._results
+        try:
+            value = results[key]
+        except KeyError:
+            self.misses += 1
+            value = results[key] = self.function(key)
+            if len(results) > self.capacity:
+                results.popitem(last=False)
+                self.evictions += 1
+            return value
+        results.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def info(self) -> CacheInfo:
+        """
+        Current counters.
+
+        Returns:
+            CacheInfo: (hits, misses, evictions, size, capacity)
+        """
+        return CacheInfo(self.hits, self.misses, self.evictions, len(self._results), self.capacity)
+
+    def clear(self) -> None:
+        """Drop every stored result and reset the counters."""
+        self._results.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+def _checked_pack(r: int, g: int, b: int) -> int:
+    """
+    pack_rgb() for a cache key. Channels are checked first, since an
+    out-of-range channel would spill into its neighbour and alias another key.
+
+    Raises:
+        ValueError: If a channel is outside 0-255
+    """
+    if not (RGB_MIN <= r <= RGB_MAX and RGB_MIN <= g <= RGB_MAX and RGB_MIN <= b <= RGB_MAX):
+        raise ValueError("RGB values must be between 0 and 255")
+    return (r << RED_SHIFT) | (g << GREEN_SHIFT) | b
+
+
+def _checked_packed(color: int) -> int:
+    """
+    A packed color used as a cache key, checked to fit in 24 bits.
+
+    Raises:
+        ValueError: If color is outside 0-0xFFFFFF
+    """
+    if not 0 <= color <= 0xFFFFFF:
+        raise ValueError("packed colors must be between 0 and 0xFFFFFF")
+    return color
+
+
+class ContrastCache:
+    """
+    Opt-in memoization of calculate_luminance() and contrast_ratio() for
+    inputs that repeat the same colors. Luminances are keyed by the packed
+    24-bit color and contrast ratios by the 48-bit (fg << 24) | bg, and
+    both give exactly the values of the uncached functions. Channels and
+    packed colors are range-checked before they become keys (ValueError).
+
+    Examples:
+        >>> cache = ContrastCache(capacity=16)
+        >>> round(cache.contrast_ratio(0, 0, 0, 255, 255, 255), 1)
+        21.0
+        >>> round(cache.contrast_ratio(0, 0, 0, 255, 255, 255), 1)
+        21.0
+        >>> cache.contrast_info()
+        CacheInfo(hits=1, misses=1, evictions=0, size=1, capacity=16)
+        >>> cache.luminance_info().misses
+        2
+
+    Attributes:
+        luminance_cache (PackedLRUCache): Luminances by packed color
+        contrast_cache (PackedLRUCache): Ratios by packed pair
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CACHE_CAPACITY) -> None:
+        self.luminance_cache = PackedLRUCache(calculate_luminance_packed, capacity)
+        self.contrast_cache = PackedLRUCache(self._pair_contrast, capacity)
+
+    def _pair_contrast(self, pair: int) -> float:
+        """contrast_ratio_packed() of a packed pair, with cached luminances."""
+        fg_lumin = self.luminance_cache(pair >> PAIR_SHIFT)
+        bg_lumin = self.luminance_cache(pair & 0xFFFFFF)
+        if fg_lumin > bg_lumin:
+            return (fg_lumin + LUMINANCE_OFFSET) / (bg_lumin + LUMINANCE_OFFSET)
+        return (bg_lumin + LUMINANCE_OFFSET) / (fg_lumin + LUMINANCE_OFFSET)
+
+    def luminance_packed(self, color: int) -> float:
+        """calculate_luminance_packed(), memoized."""
+        return self.luminance_cache(_checked_packed(color))
+
+    def luminance(self, r: int, g: int, b: int) -> float:
+        """calculate_luminance(), memoized."""
+        return self.luminance_cache(_checked_pack(r, g, b))
+
+    def contrast_ratio_packed(self, fg: int, bg: int) -> float:
+        """contrast_ratio_packed(), memoized."""
+        return self.contrast_cache((_checked_packed(fg) << PAIR_SHIFT) | _checked_packed(bg))
+
+    def contrast_ratio(self, fg_r: int, fg_g: int, fg_b: int,
+                       bg_r: int, bg_g: int, bg_b: int) -> float:
+        """contrast_ratio(), memoized."""
+        return self.contrast_cache(
+            (_checked_pack(fg_r, fg_g, fg_b) << PAIR_SHIFT) | _checked_pack(bg_r, bg_g, bg_b))
+
+    def luminance_info(self) -> CacheInfo:
+        """Counters of the luminance cache."""
+        return self.luminance_cache.info()
+
+    def contrast_info(self) -> CacheInfo:
+        """Counters of the contrast cache."""
+        return self.contrast_cache.info()
+
+    def clear(self) -> None:
+        """Empty both caches and reset their counters."""
+        self.luminance_cache.clear()
+        self.contrast_cache.clear()
+
+
 def passes_wcag_level(ratio: float, level: str) -> bool:
     """
     Check if contrast ratio meets WCAG standards.
@@ -283,6 +790,311 @@ Constants above already written.
 """
 
 
+def contrast_ratio_batch(foregrounds, backgrounds) -> "np.ndarray":
+    """
+    Calculate the contrast ratio of each foreground against its own background.
+    Entry i equals contrast_ratio(*foregrounds[i], *backgrounds[i]).
+
+    Examples:
+        >>> contrast_ratio_batch([(0, 0, 0), (255, 0, 0)],
+        ...                      [(255, 255, 255), (255, 255, 255)]).round(1).tolist()
+        [21.0, 4.0]
+
+    Arguments:
+        foregrounds: (N, 3) colors (see as_rgb_array)
+        backgrounds: (N, 3) colors (see as_rgb_array)
+
+    Returns:
+        np.ndarray: N float64 contrast ratios (1.0-21.0)
+    """
+    fg_lumin = calculate_luminance_batch(foregrounds)
+    bg_lumin = calculate_luminance_batch(backgrounds)
+    if fg_lumin.shape != bg_lumin.shape:
+        raise ValueError("foregrounds and backgrounds must have the same length")
+    return contrast_ratio_from_luminance(fg_lumin, bg_lumin)
+
+
+def contrast_ratio_from_luminance(fg_lumin, bg_lumin) -> "np.ndarray":
+    """
+    The contrast_ratio() formula applied to arrays of luminances that were
+    already calculated (broadcasting like any numpy operation).
+
+    Examples:
+        >>> contrast_ratio_from_luminance([0.0, 1.0], 1.0).round(1).tolist()
+        [21.0, 1.0]
+
+    Arguments:
+        fg_lumin: Array-like of foreground luminances
+        bg_lumin: Array-like of background luminances
+
+    Returns:
+        np.ndarray: Contrast ratios (1.0-21.0)
+    """
+    _require_numpy()
+    lighter = np.maximum(fg_lumin, bg_lumin)
+    darker = np.minimum(fg_lumin, bg_lumin)
+    return (lighter + LUMINANCE_OFFSET) / (darker + LUMINANCE_OFFSET)
+
+
+def iter_contrast_matrix(foregrounds, backgrounds,
+                         chunk_cells: int = CONTRAST_CHUNK_CELLS):
+    """
+    Yield the foreground x background contrast matrix one block of rows at a time.
+    Each block holds at most chunk_cells ratios (but always at least one row),
+    so the memory used does not grow with the number of foregrounds.
+
+    Examples:
+        >>> blocks = list(iter_contrast_matrix([(0, 0, 0), (255, 255, 255)],
+        ...                                    [(255, 255, 255)], chunk_cells=1))
+        >>> [(start, ratios.round(1).tolist()) for start, ratios in blocks]
+        [(0, [[21.0]]), (1, [[1.0]])]
+
+    Arguments:
+        foregrounds: (N, 3) colors (see as_rgb_array)
+        backgrounds: (M, 3) colors (see as_rgb_array)
+        chunk_cells (int): Maximum number of ratios per yielded block
+
+    Yields:
+        tuple: (first_row, ratios) where ratios is a (rows, M) float64 block
+    """
+    fg_lumin = calculate_luminance_batch(foregrounds)
+    bg_lumin = calculate_luminance_batch(backgrounds)
+    rows = max(1, chunk_cells // max(1, len(bg_lumin)))
+
+    for start in range(0, len(fg_lumin), rows):
+        fg_block = fg_lumin[start:start + rows, None]
+        lighter = np.maximum(fg_block, bg_lumin)
+        darker = np.minimum(fg_block, bg_lumin)
+        lighter += LUMINANCE_OFFSET
+        darker += LUMINANCE_OFFSET
+        lighter /= darker
+        yield start, lighter
+
+
+def contrast_ratio_matrix(foregrounds, backgrounds,
+                          chunk_cells: int = CONTRAST_CHUNK_CELLS) -> "np.ndarray":
+    """
+    Calculate the contrast ratio of every foreground against every background.
+    Entry [i, j] equals contrast_ratio(*foregrounds[i], *backgrounds[j]).
+
+    Examples:
+        >>> contrast_ratio_matrix([(0, 0, 0), (128, 128, 128)],
+        ...                       [(255, 255, 255), (0, 0, 0)]).round(1).tolist()
+        [[21.0, 1.0], [3.9, 5.3]]
+
+    Arguments:
+        foregrounds: (N, 3) colors (see as_rgb_array)
+        backgrounds: (M, 3) colors (see as_rgb_array)
+        chunk_cells (int): Working-memory limit passed to iter_contrast_matrix()
+
+    Returns:
+        np.ndarray: (N, M) float64 contrast ratios (1.0-21.0)
+    """
+    foregrounds = as_rgb_array(foregrounds)
+    backgrounds = as_rgb_array(backgrounds)
+    matrix = np.empty((len(foregrounds), len(backgrounds)))
+    for start, ratios in iter_contrast_matrix(foregrounds, backgrounds, chunk_cells):
+        matrix[start:start + len(ratios)] = ratios
+    return matrix
+
+
+def wcag_level_mask(ratio: float) -> int:
+    """
+    Every WCAG level a contrast ratio meets, as a mask of WCAG_LEVEL_BITS.
+    Bit level is set exactly when passes_wcag_level(ratio, level) is True.
+
+    Examples:
+        >>> wcag_level_mask(21.0)
+        15
+        >>> wcag_level_mask(4.5) == WCAG_AA_NORMAL_BIT | WCAG_AA_LARGE_BIT | WCAG_AAA_LARGE_BIT
+        True
+        >>> wcag_level_mask(3.2) == WCAG_AA_LARGE_BIT
+        True
+        >>> wcag_level_mask(1.0)
+        0
+
+    Arguments:
+        ratio (float): Contrast ratio
+
+    Returns:
+        int: Level mask (0-15)
+    """
+    # bisect_right counts thresholds <= ratio; NaN passes nothing
+    if ratio != ratio:
+        return 0
+    return WCAG_MASK_STEPS[bisect.bisect_right(WCAG_MASK_THRESHOLDS, ratio)]
+
+
+def wcag_level_mask_batch(ratios) -> "np.ndarray":
+    """
+    wcag_level_mask() of an array of contrast ratios, in one search over the
+    thresholds.
+
+    Examples:
+        >>> wcag_level_mask_batch([1.0, 3.0, 4.5, 7.0]).tolist()
+        [0, 2, 11, 15]
+
+    Arguments:
+        ratios: Array-like of contrast ratios (any shape)
+
+    Returns:
+        np.ndarray: uint8 level masks shaped like ratios
+    """
+    _require_numpy()
+    ratios = np.asarray(ratios, dtype=float)
+    steps = np.searchsorted(WCAG_MASK_THRESHOLDS, ratios, side="right")
+    steps[np.isnan(ratios)] = 0  # searchsorted places NaN after every threshold
+    return np.array(WCAG_MASK_STEPS, dtype=np.uint8)[steps]
+
+
+def wcag_level_masks(ratios) -> dict:
+    """
+    Check an array of contrast ratios against every WCAG level at once.
+    Each mask agrees with passes_wcag_level() for the same ratio and level.
+
+    Examples:
+        >>> masks = wcag_level_masks([3.0, 4.5, 7.0])
+        >>> masks["AA_NORMAL"].tolist(), masks["AAA_NORMAL"].tolist()
+        ([False, True, True], [False, False, True])
+
+    Arguments:
+        ratios: Array-like of contrast ratios (any shape)
+
+    Returns:
+        dict: WCAG level string -> boolean array shaped like ratios
+    """
+    level_mask = wcag_level_mask_batch(ratios)
+    return {level: (level_mask & bit) != 0 for level, bit in WCAG_LEVEL_BITS.items()}
+
+
+# Cutoffs of the foreground luminances that pass against one background:
+# those at or below dark_cutoff and those at or above light_cutoff
+ContrastPlan = collections.namedtuple("ContrastPlan", ["dark_cutoff", "light_cutoff"])
+
+
+def _float_bits(value: float) -> int:
+    """Bit pattern of a non-negative float; it orders like the floats do."""
+    return struct.unpack("<q", struct.pack("<d", value))[0]
+
+
+def _bits_float(bits: int) -> float:
+    """Inverse of _float_bits()."""
+    return struct.unpack("<d", struct.pack("<q", bits))[0]
+
+
+def _float_boundary(passes, passing: float, failing: float) -> float:
+    """
+    The passing float next to the failing ones, between a passing and a
+    failing value in [0, 1], where passes() switches only once in between.
+    Bisects over the bit patterns, so it takes at most 64 steps.
+    """
+    passing_bits, failing_bits = _float_bits(passing), _float_bits(failing)
+    while abs(failing_bits - passing_bits) > 1:
+        middle = (passing_bits + failing_bits) // 2
+        if passes(_bits_float(middle)):
+            passing_bits = middle
+        else:
+            failing_bits = middle
+    return _bits_float(passing_bits)
+
+
+def plan_contrast_luminance(bg_lumin: float, target_ratio: float) -> ContrastPlan:
+    """
+    Compile a background luminance and a target ratio into luminance cutoffs.
+    A foreground of luminance L (0.0-1.0) reaches target_ratio exactly when
+    L <= dark_cutoff or L >= light_cutoff, with the same float results as
+    contrast_ratio(): each cutoff is the last passing float, found by
+    bisecting over the floats between 0 or 1 and the background.
+
+    Examples:
+        >>> plan = plan_contrast_luminance(1.0, 4.5)
+        >>> round(plan.dark_cutoff, 4), plan.light_cutoff
+        (0.1833, inf)
+
+    Arguments:
+        bg_lumin (float): Background luminance (0.0-1.0)
+        target_ratio (float): Required contrast ratio (greater than 1)
+
+    Returns:
+        ContrastPlan: (dark_cutoff, light_cutoff), -inf or inf for a side
+            where no luminance passes
+    """
+    if target_ratio <= 1:
+        raise ValueError("target_ratio must be greater than 1")
+
+    def passes_dark(lumin):
+        return lumin <= bg_lumin and (bg_lumin + LUMINANCE_OFFSET) / (lumin + LUMINANCE_OFFSET) >= target_ratio
+
+    def passes_light(lumin):
+        return lumin > bg_lumin and (lumin + LUMINANCE_OFFSET) / (bg_lumin + LUMINANCE_OFFSET) >= target_ratio
+
+    # Contrast rises away from the background, so 0 and 1 pass if anything does
+    dark = _float_boundary(passes_dark, 0.0, bg_lumin) if passes_dark(0.0) else -math.inf
+    light = _float_boundary(passes_light, 1.0, bg_lumin) if passes_light(1.0) else math.inf
+    return ContrastPlan(dark, light)
+
+
+def plan_contrast(bg_r: int, bg_g: int, bg_b: int, level: str = WCAG_AA_NORMAL) -> ContrastPlan:
+    """
+    Compile a background color and WCAG level into luminance cutoffs, so that
+    plan_passes(plan, calculate_luminance(*fg)) equals
+    passes_wcag_level(contrast_ratio(*fg, bg_r, bg_g, bg_b), level).
+
+    Examples:
+        >>> plan = plan_contrast(255, 255, 255)
+        >>> plan_passes(plan, calculate_luminance(118, 118, 118))
+        True
+        >>> plan_passes(plan, calculate_luminance(119, 119, 119))
+        False
+
+    Arguments:
+        bg_r, bg_g, bg_b (int): Background RGB values (0-255)
+        level (str): WCAG level, e.g. "AA_NORMAL"
+
+    Returns:
+        ContrastPlan: Cutoffs; an unknown level gets cutoffs no luminance passes
+    """
+    if level not in WCAG_LEVEL_RATIOS:
+        return ContrastPlan(-math.inf, math.inf)
+    return plan_contrast_luminance(calculate_luminance(bg_r, bg_g, bg_b), WCAG_LEVEL_RATIOS[level])
+
+
+def plan_passes(plan: ContrastPlan, lumin: float) -> bool:
+    """
+    Whether a foreground luminance passes a plan (see plan_contrast).
+
+    Arguments:
+        plan (ContrastPlan): Compiled cutoffs
+        lumin (float): Foreground luminance
+
+    Returns:
+        bool: True if the foreground meets the plan's level
+    """
+    return lumin <= plan.dark_cutoff or lumin >= plan.light_cutoff
+
+
+def plan_passes_batch(plan: ContrastPlan, luminances) -> "np.ndarray":
+    """
+    plan_passes() of an array of foreground luminances: two comparisons and
+    no division per candidate.
+
+    Examples:
+        >>> plan = plan_contrast(255, 255, 255, "AA_LARGE")
+        >>> plan_passes_batch(plan, calculate_luminance_batch([(0, 0, 0), (200, 200, 200)])).tolist()
+        [True, False]
+
+    Arguments:
+        plan (ContrastPlan): Compiled cutoffs
+        luminances: Array-like of foreground luminances (any shape)
+
+    Returns:
+        np.ndarray: Boolean array shaped like luminances
+    """
+    _require_numpy()
+    luminances = np.asarray(luminances)
+    return (luminances <= plan.dark_cutoff) | (luminances >= plan.light_cutoff)
+
+
 def calculate_brightness(r: int, g: int, b: int) -> int:
     """
     Calculate perceived brightness of a color.
@@ -322,6 +1134,49 @@ def calculate_brightness(r: int, g: int, b: int) -> int:
     return int(brightness)
 
 
+def calculate_brightness_packed(color: int) -> int:
+    """
+    calculate_brightness() of a packed color.
+
+    Examples:
+        >>> calculate_brightness_packed(0xFF0000)
+        76
+
+    Arguments:
+        color (int): Packed color (see pack_rgb)
+
+    Returns:
+        int: Perceived brightness (0-255)
+    """
+    return calculate_brightness(*unpack_rgb(color))
+
+
+def _brightness_of_channels(r, g, b) -> "np.ndarray":
+    """calculate_brightness() over integer channel arrays."""
+    brightness = (RED_BRIGHTNESS_COEFFICIENT * r) + \
+        (GREEN_BRIGHTNESS_COEFFICIENT * g) + (BLUE_BRIGHTNESS_COEFFICIENT * b)
+    return brightness.astype(np.int64)
+
+
+def calculate_brightness_batch(colors) -> "np.ndarray":
+    """
+    Calculate perceived brightness for many colors at once.
+    Gives exactly the same values as calling calculate_brightness() per color.
+
+    Examples:
+        >>> calculate_brightness_batch([(255, 255, 255), (255, 0, 0), (0, 0, 255)]).tolist()
+        [255, 76, 29]
+
+    Arguments:
+        colors: (N, 3) colors (see as_rgb_array)
+
+    Returns:
+        np.ndarray: N brightness values (int64, 0-255)
+    """
+    colors = as_rgb_array(colors).astype(np.int64)
+    return _brightness_of_channels(colors[:, 0], colors[:, 1], colors[:, 2])
+
+
 # Thinking
 """
 Had to look up the 'standard luminance formula' from the docstring hint.
@@ -387,14 +1242,14 @@ Once again, the implementation notes are a blessing in figuring it out.
 def find_minimum_brightness_steps(r: int, g: int, b: int, min_brightness: int) -> int:
     """
     Count steps needed to reach minimum brightness by incrementing RGB values equally.
-    Uses while loop to increase brightness until threshold is met.
+    Solves for the step count directly instead of looping one step at a time.
 
     Implementation:
     First check if the color is already bright enough using calculate_brightness().
-    If so, return 0. Otherwise, use a while loop to increment all three RGB values
-    by RGB_INCREMENT each iteration (but don't exceed 255). Count each iteration as a step.
-    Continue until calculate_brightness() returns a value >= min_brightness. Include
-    a safety check to prevent infinite loops when the target can't be reached.
+    If so, return 0. Otherwise, a step increments all three RGB values by
+    RGB_INCREMENT (but doesn't exceed 255). The answer is the first step count where
+    calculate_brightness() returns a value >= min_brightness, or the step count that
+    brings every channel to 255 when the target can't be reached.
 
     Examples:
         >>> find_minimum_brightness_steps(0, 0, 0, 50)
@@ -427,36 +1282,314 @@ def find_minimum_brightness_steps(r: int, g: int, b: int, min_brightness: int) -
     if brightness >= min_brightness:
         return 0
 
-    steps = 0
+    # Each step raises every channel by one until it clamps at 255, so the
+    # brightness is piecewise linear in the step count with at most three
+    # pieces (one per channel clamping). Solve each piece arithmetically.
+    coefficients = (RED_BRIGHTNESS_COEFFICIENT, GREEN_BRIGHTNESS_COEFFICIENT,
+                    BLUE_BRIGHTNESS_COEFFICIENT)
+    distances = [max(0, MAX_RGB_VALUE - channel) for channel in (r, g, b)]
+    max_steps = max(1, max(distances))  # every channel is 255 by now
+
+    value = sum(coefficient * min(channel, MAX_RGB_VALUE)
+                for coefficient, channel in zip(coefficients, (r, g, b)))
+    slope = sum(coefficients)
+    previous = 0
+    steps = max_steps
+
+    for distance, coefficient in sorted(zip(distances, coefficients)):
+        if distance > previous:
+            segment_gain = slope * (distance - previous)
+            if value + segment_gain >= min_brightness:
+                steps = previous + math.ceil((min_brightness - value) / slope)
+                break
+            value += segment_gain
+            previous = distance
+        slope -= coefficient
+
+    steps = min(max(steps, 1), max_steps)
+
+    # Nudge by a step if float rounding put us next to the loop's answer
+    while steps > 1 and _brightness_after_steps(r, g, b, steps - 1) >= min_brightness:
+        steps -= 1
+    while steps < max_steps and _brightness_after_steps(r, g, b, steps) < min_brightness:
+        steps += 1
 
-    while brightness < min_brightness:
+    return steps
 
-        if r + RGB_INCREMENT > MAX_RGB_VALUE:
-            r = MAX_RGB_VALUE
-        else:
-            r = r + RGB_INCREMENT
 
-        if g + RGB_INCREMENT > MAX_RGB_VALUE:
-            g = MAX_RGB_VALUE
-        else:
-            g = g + RGB_INCREMENT
+def _brightness_after_steps(r: int, g: int, b: int, steps: int) -> int:
+    """Brightness after find_minimum_brightness_steps() has taken steps steps."""
+    return calculate_brightness(min(r + steps, MAX_RGB_VALUE),
+                                min(g + steps, MAX_RGB_VALUE),
+                                min(b + steps, MAX_RGB_VALUE))
 
-        if b + RGB_INCREMENT > MAX_RGB_VALUE:
-            b = MAX_RGB_VALUE
-        else:
-            b = b + RGB_INCREMENT
 
-        brightness = calculate_brightness(r, g, b)  # Recalcs after increment
+def find_minimum_brightness_steps_batch(colors, min_brightness) -> "np.ndarray":
+    """
+    Count brightness steps for many colors at once.
+    Gives exactly the same counts as calling find_minimum_brightness_steps()
+    per color.
 
-        steps += 1
+    Examples:
+        >>> find_minimum_brightness_steps_batch(
+        ...     [(0, 0, 0), (100, 100, 100), (10, 20, 30)], 100).tolist()
+        [100, 0, 82]
+        >>> find_minimum_brightness_steps_batch([(240, 240, 240)] * 2, [300, 0]).tolist()
+        [15, 0]
 
-        # Stops infinite Loop w/ BREAK
-        if r == MAX_RGB_VALUE and g == MAX_RGB_VALUE and b == MAX_RGB_VALUE:
+    Arguments:
+        colors: (N, 3) colors (see as_rgb_array)
+        min_brightness: Target brightness, one int or one per color
+
+    Returns:
+        np.ndarray: N step counts (int64)
+    """
+    colors = as_rgb_array(colors).astype(np.int64)
+    target = np.clip(np.broadcast_to(min_brightness, len(colors)), 0, 255)
+    coefficients = np.array([RED_BRIGHTNESS_COEFFICIENT,
+                             GREEN_BRIGHTNESS_COEFFICIENT,
+                             BLUE_BRIGHTNESS_COEFFICIENT])
+
+    distances = MAX_RGB_VALUE - colors
+    max_steps = np.maximum(1, distances.max(axis=1))
+    order = np.argsort(distances, axis=1)
+    d0, d1, d2 = np.take_along_axis(distances, order, axis=1).T
+    c0, c1, c2 = coefficients[order].T
+
+    # Value and slope at the start of each linear piece (see the scalar version)
+    slope0, slope1, slope2 = c0 + c1 + c2, c1 + c2, c2
+    value0 = colors @ coefficients
+    value1 = value0 + slope0 * d0
+    value2 = value1 + slope1 * (d1 - d0)
+    value3 = value2 + slope2 * (d2 - d1)
+
+    steps = np.select(
+        [target <= value1, target <= value2, target <= value3],
+        [np.ceil((target - value0) / slope0),
+         d0 + np.ceil((target - value1) / slope1),
+         d1 + np.ceil((target - value2) / slope2)],
+        default=max_steps).astype(np.int64)
+    steps = np.clip(steps, 1, max_steps)
+
+    def brightness_after(steps):
+        stepped = np.minimum(colors + steps[:, None], MAX_RGB_VALUE)
+        return _brightness_of_channels(stepped[:, 0], stepped[:, 1], stepped[:, 2])
+
+    while True:
+        lower = (steps > 1) & (brightness_after(steps - 1) >= target)
+        if not lower.any():
             break
+        steps -= lower
+    while True:
+        higher = (steps < max_steps) & (brightness_after(steps) < target)
+        if not higher.any():
+            break
+        steps += higher
 
+    already_bright = _brightness_of_channels(colors[:, 0], colors[:, 1],
+                                             colors[:, 2]) >= target
+    steps[already_bright] = 0
     return steps
 
 
+def _rgb_to_hsl(r: int, g: int, b: int) -> tuple:
+    """Hue, saturation and lightness (each 0.0-1.0) of an 8-bit color."""
+    r, g, b = r / RGB_MAX, g / RGB_MAX, b / RGB_MAX
+    high, low = max(r, g, b), min(r, g, b)
+    lightness = (high + low) / 2
+    spread = high - low
+    if spread == 0:
+        return 0.0, 0.0, lightness
+    if lightness <= 0.5:
+        saturation = spread / (high + low)
+    else:
+        saturation = spread / (2.0 - high - low)
+    if r == high:
+        hue = (g - b) / spread
+    elif g == high:
+        hue = 2.0 + (b - r) / spread
+    else:
+        hue = 4.0 + (r - g) / spread
+    return (hue / 6.0) % 1.0, saturation, lightness
+
+
+def _hsl_channel(low: float, high: float, hue: float) -> float:
+    """One RGB channel (0.0-1.0) of an HSL color, offset hue in turns."""
+    hue %= 1.0
+    if hue < 1 / 6:
+        return low + (high - low) * hue * 6
+    if hue < 0.5:
+        return high
+    if hue < 2 / 3:
+        return low + (high - low) * (2 / 3 - hue) * 6
+    return low
+
+
+def _hsl_to_rgb(hue: float, saturation: float, lightness: float) -> tuple:
+    """The 8-bit color nearest to an HSL color."""
+    if lightness <= 0.5:
+        high = lightness * (1 + saturation)
+    else:
+        high = lightness + saturation - lightness * saturation
+    low = 2 * lightness - high
+    return tuple(int(round(min(max(_hsl_channel(low, high, hue + offset), 0.0), 1.0) * RGB_MAX))
+                 for offset in (1 / 3, 0.0, -1 / 3))
+
+
+def _rgb_to_hsl_batch(colors) -> tuple:
+    """_rgb_to_hsl() of an (N, 3) uint8 array, as three float64 arrays."""
+    r, g, b = (colors[:, channel] / RGB_MAX for channel in range(3))
+    high = np.maximum(np.maximum(r, g), b)
+    low = np.minimum(np.minimum(r, g), b)
+    lightness = (high + low) / 2
+    spread = high - low
+    gray = spread == 0
+    safe_spread = np.where(gray, 1.0, spread)
+    saturation = np.where(lightness <= 0.5, spread / np.where(gray, 1.0, high + low),
+                          spread / np.where(gray, 1.0, 2.0 - high - low))
+    hue = np.where(r == high, (g - b) / safe_spread,
+                   np.where(g == high, 2.0 + (b - r) / safe_spread,
+                            4.0 + (r - g) / safe_spread))
+    hue = (hue / 6.0) % 1.0
+    return np.where(gray, 0.0, hue), np.where(gray, 0.0, saturation), lightness
+
+
+def _hsl_to_rgb_batch(hue, saturation, lightness) -> "np.ndarray":
+    """_hsl_to_rgb() of float64 arrays, as an (N, 3) uint8 array."""
+    high = np.where(lightness <= 0.5, lightness * (1 + saturation),
+                    lightness + saturation - lightness * saturation)
+    low = 2 * lightness - high
+    colors = np.empty((len(lightness), 3), dtype=np.uint8)
+    for channel, offset in enumerate((1 / 3, 0.0, -1 / 3)):
+        shifted = (hue + offset) % 1.0
+        value = np.select(
+            [shifted < 1 / 6, shifted < 0.5, shifted < 2 / 3],
+            [low + (high - low) * shifted * 6, high,
+             low + (high - low) * (2 / 3 - shifted) * 6],
+            default=low)
+        colors[:, channel] = np.rint(np.clip(value, 0.0, 1.0) * RGB_MAX)
+    return colors
+
+
+def adjust_lightness_for_contrast(r: int, g: int, b: int,
+                                  bg_r: int, bg_g: int, bg_b: int,
+                                  target_ratio: float):
+    """
+    Find the color with the same HSL hue and saturation, and the smallest
+    lightness change up or down, that reaches target_ratio against the
+    background. Lightness moves luminance monotonically, so each direction is
+    a bisection (LIGHTNESS_BISECTION_STEPS halvings) rather than a step loop.
+
+    Examples:
+        >>> adjust_lightness_for_contrast(119, 119, 119, 255, 255, 255, 4.5)
+        (118, 118, 118)
+        >>> adjust_lightness_for_contrast(255, 0, 0, 255, 255, 255, 4.5)
+        (238, 0, 0)
+        >>> adjust_lightness_for_contrast(0, 0, 0, 255, 255, 255, 4.5)
+        (0, 0, 0)
+        >>> adjust_lightness_for_contrast(51, 102, 204, 0, 0, 0, 7.0)
+        (113, 149, 220)
+        >>> adjust_lightness_for_contrast(0, 0, 0, 118, 118, 118, 7.0) is None
+        True
+
+    Arguments:
+        r, g, b (int): Color to adjust (0-255)
+        bg_r, bg_g, bg_b (int): Background color (0-255)
+        target_ratio (float): Contrast ratio to reach, e.g. WCAG_AA_NORMAL_RATIO
+
+    Returns:
+        tuple or None: (r, g, b), unchanged if it already passes, or None when
+            no lightness reaches the target
+    """
+    bg_lumin = calculate_luminance(bg_r, bg_g, bg_b)
+    if contrast_ratio(r, g, b, bg_r, bg_g, bg_b) >= target_ratio:
+        return (r, g, b)
+    hue, saturation, lightness = _rgb_to_hsl(r, g, b)
+
+    def passes(candidate: float, darker: bool) -> bool:
+        lumin = calculate_luminance(*_hsl_to_rgb(hue, saturation, candidate))
+        if darker:
+            return lumin <= bg_lumin and (bg_lumin + LUMINANCE_OFFSET) / (lumin + LUMINANCE_OFFSET) >= target_ratio
+        return lumin >= bg_lumin and (lumin + LUMINANCE_OFFSET) / (bg_lumin + LUMINANCE_OFFSET) >= target_ratio
+
+    options = []
+    for darker, bound in ((True, 0.0), (False, 1.0)):
+        if not passes(bound, darker):
+            continue
+        passing, failing = bound, lightness
+        for _ in range(LIGHTNESS_BISECTION_STEPS):
+            middle = (passing + failing) / 2
+            if passes(middle, darker):
+                passing = middle
+            else:
+                failing = middle
+        options.append((abs(passing - lightness), passing))
+
+    if not options:
+        return None
+    return _hsl_to_rgb(hue, saturation, min(options)[1])
+
+
+def adjust_lightness_for_contrast_batch(colors, backgrounds, target_ratio) -> tuple:
+    """
+    adjust_lightness_for_contrast() for many colors at once, with every
+    bisection running in lockstep. Gives exactly the same colors as the scalar
+    version.
+
+    Examples:
+        >>> adjusted, changes = adjust_lightness_for_contrast_batch(
+        ...     [(119, 119, 119), (255, 0, 0)], [(255, 255, 255)] * 2, 4.5)
+        >>> adjusted.tolist(), changes.round(3).tolist()
+        ([[118, 118, 118], [238, 0, 0]], [-0.002, -0.032])
+
+    Arguments:
+        colors: (N, 3) colors to adjust (see as_rgb_array)
+        backgrounds: (N, 3) background colors
+        target_ratio: Contrast ratio to reach, one float or one per color
+
+    Returns:
+        tuple: ((N, 3) uint8 colors, (N,) signed HSL lightness changes); rows
+            that cannot reach the target keep their color and get NaN
+    """
+    colors = as_rgb_array(colors)
+    backgrounds = as_rgb_array(backgrounds)
+    if len(colors) != len(backgrounds):
+        raise ValueError("colors and backgrounds must have the same length")
+    target = np.broadcast_to(np.asarray(target_ratio, dtype=np.float64), len(colors))
+    bg_lumin = calculate_luminance_batch(backgrounds)
+    hue, saturation, lightness = _rgb_to_hsl_batch(colors)
+
+    def passes(candidate, darker: bool) -> "np.ndarray":
+        lumin = calculate_luminance_batch(_hsl_to_rgb_batch(hue, saturation, candidate))
+        if darker:
+            return (lumin <= bg_lumin) & ((bg_lumin + LUMINANCE_OFFSET) / (lumin + LUMINANCE_OFFSET) >= target)
+        return (lumin >= bg_lumin) & ((lumin + LUMINANCE_OFFSET) / (bg_lumin + LUMINANCE_OFFSET) >= target)
+
+    best = np.full(len(colors), np.nan)
+    for darker, bound in ((True, 0.0), (False, 1.0)):
+        passing = np.full(len(colors), bound)
+        reachable = passes(passing, darker)
+        failing = lightness.copy()
+        for _ in range(LIGHTNESS_BISECTION_STEPS):
+            middle = (passing + failing) / 2
+            ok = passes(middle, darker)
+            passing = np.where(ok, middle, passing)
+            failing = np.where(ok, failing, middle)
+        # Ties go to the darker option, as min() does in the scalar version
+        closer = reachable & ~(np.abs(best - lightness) <= np.abs(passing - lightness))
+        best = np.where(closer, passing, best)
+
+    adjusted = colors.copy()
+    found = ~np.isnan(best)
+    adjusted[found] = _hsl_to_rgb_batch(hue[found], saturation[found], best[found])
+    changes = best - lightness
+
+    already = contrast_ratio_from_luminance(calculate_luminance_batch(colors), bg_lumin) >= target
+    adjusted[already] = colors[already]
+    changes[already] = 0.0
+    return adjusted, changes
+
+
 # Thinking
 """
 This was the hardest function so far before re-reviewing Module 4 fundamentals. A lot of places to get tripped up. 
@@ -466,18 +1599,151 @@ Min() is a built-in python function I already know. I could use it here, but I d
 """
 
 
-def calculate_contrast_with_grays(color_r: int, color_g: int, color_b: int) -> int:
+# Loaded color_atlas.ColorAtlas used by the per-color gray queries, if any
+_color_atlas = None
+
+
+def enable_color_atlas(path: str = None) -> bool:
+    """
+    Answer calculate_contrast_with_grays() and find_accessible_gray_background()
+    with their default step and level by an indexed read of a color atlas file
+    (see color_atlas) instead of computing them. Luminance and brightness stay
+    computed: their table lookups are cheaper than a read from the file.
+
+    Arguments:
+        path (str): Atlas file (default color_atlas.DEFAULT_ATLAS_PATH)
+
+    Returns:
+        bool: True if the atlas was loaded; False (and nothing changes) when
+            numpy is not installed, or the file is missing, incomplete or
+            built by another ALGORITHM_VERSION
+    """
+    global _color_atlas
+    try:
+        import color_atlas  # color_atlas imports this module, and numpy
+
+        _color_atlas = color_atlas.load_atlas(path or color_atlas.DEFAULT_ATLAS_PATH)
+    except (ImportError, OSError, ValueError):
+        return False
+    return True
+
+
+def disable_color_atlas() -> None:
+    """Compute every per-color query again (see enable_color_atlas)."""
+    global _color_atlas
+    _color_atlas = None
+
+
+def _atlas_index(r: int, g: int, b: int) -> int:
+    """Atlas position of a color, or -1 when the atlas is off or a channel is out of range."""
+    if (_color_atlas is None or not (RGB_MIN <= r <= RGB_MAX and RGB_MIN <= g <= RGB_MAX
+                                     and RGB_MIN <= b <= RGB_MAX)):
+        return -1
+    return (r << RED_SHIFT) | (g << GREEN_SHIFT) | b
+
+
+def _gray_contrast(text_lumin: float, gray: int) -> float:
+    """contrast_ratio() between a color of luminance text_lumin and gray (gray, gray, gray)."""
+    gray_lumin = GRAY_LUMINANCE_TABLE[gray]
+    if text_lumin > gray_lumin:
+        return (text_lumin + LUMINANCE_OFFSET) / (gray_lumin + LUMINANCE_OFFSET)
+    return (gray_lumin + LUMINANCE_OFFSET) / (text_lumin + LUMINANCE_OFFSET)
+
+
+def _gray_contrast_batch(text_lumin, grays) -> "np.ndarray":
+    """_gray_contrast() over arrays of luminances and gray values."""
+    gray_lumin = GRAY_LUMINANCE_ARRAY[grays]
+    lighter = np.maximum(text_lumin, gray_lumin)
+    darker = np.minimum(text_lumin, gray_lumin)
+    return (lighter + LUMINANCE_OFFSET) / (darker + LUMINANCE_OFFSET)
+
+
+def _gray_pass_bounds(text_lumin: float, target_ratio: float) -> tuple:
+    """
+    Find which grays reach target_ratio against a color of luminance text_lumin.
+    Contrast falls as a gray approaches the color's luminance and rises again past
+    it, so the passing grays are 0..dark (darker than the color) and light..255
+    (lighter than it). Each cutoff is solved from the WCAG formula, bisected in
+    GRAY_LUMINANCE_TABLE, then confirmed with the exact ratio.
+
+    Returns:
+        tuple: (dark, light) with dark = -1 and light = 256 when a side has no pass
+    """
+    def passes_dark(gray):
+        return (GRAY_LUMINANCE_TABLE[gray] <= text_lumin
+                and _gray_contrast(text_lumin, gray) >= target_ratio)
+
+    def passes_light(gray):
+        return (GRAY_LUMINANCE_TABLE[gray] > text_lumin
+                and _gray_contrast(text_lumin, gray) >= target_ratio)
+
+    # (text + 0.05) / (gray + 0.05) >= target, solved for the gray luminance
+    dark_cutoff = (text_lumin + LUMINANCE_OFFSET) / target_ratio - LUMINANCE_OFFSET
+    dark = bisect.bisect_right(GRAY_LUMINANCE_TABLE, dark_cutoff) - 1
+    while dark >= 0 and not passes_dark(dark):
+        dark -= 1
+    while dark < 255 and passes_dark(dark + 1):
+        dark += 1
+
+    # (gray + 0.05) / (text + 0.05) >= target, solved for the gray luminance
+    light_cutoff = target_ratio * (text_lumin + LUMINANCE_OFFSET) - LUMINANCE_OFFSET
+    light = bisect.bisect_left(GRAY_LUMINANCE_TABLE, light_cutoff)
+    while light > 0 and passes_light(light - 1):
+        light -= 1
+    while light <= 255 and not passes_light(light):
+        light += 1
+
+    return dark, light
+
+
+def _gray_pass_bounds_batch(text_lumin, target_ratio: float) -> tuple:
+    """_gray_pass_bounds() over an array of luminances."""
+    def passes_dark(grays):
+        grays = np.clip(grays, 0, 255)
+        return ((GRAY_LUMINANCE_ARRAY[grays] <= text_lumin)
+                & (_gray_contrast_batch(text_lumin, grays) >= target_ratio))
+
+    def passes_light(grays):
+        grays = np.clip(grays, 0, 255)
+        return ((GRAY_LUMINANCE_ARRAY[grays] > text_lumin)
+                & (_gray_contrast_batch(text_lumin, grays) >= target_ratio))
+
+    dark_cutoff = (text_lumin + LUMINANCE_OFFSET) / target_ratio - LUMINANCE_OFFSET
+    dark = np.searchsorted(GRAY_LUMINANCE_ARRAY, dark_cutoff, side="right") - 1
+    _step_while(dark, -1, lambda: (dark >= 0) & ~passes_dark(dark))
+    _step_while(dark, 1, lambda: (dark < 255) & passes_dark(dark + 1))
+
+    light_cutoff = target_ratio * (text_lumin + LUMINANCE_OFFSET) - LUMINANCE_OFFSET
+    light = np.searchsorted(GRAY_LUMINANCE_ARRAY, light_cutoff)
+    _step_while(light, -1, lambda: (light > 0) & passes_light(light - 1))
+    _step_while(light, 1, lambda: (light <= 255) & ~passes_light(light))
+
+    return dark, light
+
+
+def _step_while(values, step: int, condition) -> None:
+    """Move values by step, in place, wherever condition() holds, until it holds nowhere."""
+    while True:
+        mask = condition()
+        if not mask.any():
+            return
+        values[mask] += step
+
+
+def calculate_contrast_with_grays(color_r: int, color_g: int, color_b: int,
+                                  step: int = GRAY_STEP_SIZE,
+                                  level: str = WCAG_AA_NORMAL) -> int:
     """
-    Find how many gray levels (0, 5, 10, 15... 255) meet AA contrast standards.
-    Uses while loop to test gray values from 0 to 255 in steps of 5.
+    Find how many gray levels (0, step, 2*step... up to 255; by default 0, 5,
+    10... 255) meet a WCAG level against the color (by default AA normal text,
+    4.5:1). Counts from the two gray cutoffs instead of testing every gray.
 
     Implementation:
-    Initialize a counter and a gray value variable. Use a while loop to iterate
-    through gray levels from 0 to 255 in steps of 5. For each gray level, create
-    a gray color by using the same value for R, G, and B components. Calculate the
-    contrast ratio between the input color and this gray using contrast_ratio().
-    If the ratio meets AA standards (4.5:1), increment your counter. Return the
-    total count of passing gray levels.
+    The grays that meet the level are every gray from black up to one cutoff and
+    every gray from a second cutoff up to white (see _gray_pass_bounds()). Count the
+    multiples of step (0, step, 2*step... up to 255) that fall inside those two
+    ranges. This is the same count as testing each of those grays with
+    contrast_ratio() and passes_wcag_level().
 
     Examples:
         >>> calculate_contrast_with_grays(0, 0, 0)
@@ -492,25 +1758,74 @@ def calculate_contrast_with_grays(color_r: int, color_g: int, color_b: int) -> i
         20
         >>> calculate_contrast_with_grays(255, 0, 0)
         5
+        >>> calculate_contrast_with_grays(0, 0, 0, step=1, level="AAA_NORMAL")
+        107
 
     Arguments:
         color_r, color_g, color_b (int): RGB values of the test color
+        step (int): Distance between tested gray levels (default 5)
+        level (str): WCAG level the grays must meet (default "AA_NORMAL");
+            an unknown level counts no grays
 
     Returns:
-        int: Count of gray levels that provide AA contrast (4.5:1 or better)
+        int: Count of tested gray levels that meet level
+
+    Raises:
+        ValueError: If step is less than 1
     """
+    if step < 1:
+        raise ValueError("step must be at least 1")
+    if level not in WCAG_LEVEL_RATIOS:
+        return 0  # passes_wcag_level() fails every gray for unknown levels
+    if step == GRAY_STEP_SIZE and level == WCAG_AA_NORMAL:
+        index = _atlas_index(color_r, color_g, color_b)
+        if index >= 0:
+            return int(_color_atlas.gray_count[index])
+
+    dark, light = _gray_pass_bounds(
+        calculate_luminance(color_r, color_g, color_b), WCAG_LEVEL_RATIOS[level])
+
     passing_count = 0
-    gray = 0
+    if dark >= 0:
+        passing_count += dark // step + 1  # 0, step... up to dark
+    if light <= 255:
+        passing_count += 255 // step - (light + step - 1) // step + 1
+    return passing_count
 
-    while gray <= 255:
-        contrast = contrast_ratio(color_r, color_g, color_b, gray, gray, gray)
 
-        if contrast >= WCAG_AA_NORMAL_RATIO:
-            passing_count += 1  # iterative steps
+def calculate_contrast_with_grays_batch(colors, step: int = GRAY_STEP_SIZE,
+                                        level: str = WCAG_AA_NORMAL) -> "np.ndarray":
+    """
+    Count the accessible gray levels for many colors at once.
+    Gives exactly the same counts as calling calculate_contrast_with_grays()
+    per color.
 
-        gray += GRAY_STEP_SIZE  # iterate thru steps defined above
+    Examples:
+        >>> calculate_contrast_with_grays_batch(
+        ...     [(0, 0, 0), (255, 255, 255), (128, 128, 128)]).tolist()
+        [28, 24, 5]
+        >>> calculate_contrast_with_grays_batch([(0, 0, 0)], step=1, level="AAA_NORMAL").tolist()
+        [107]
 
-    return passing_count
+    Arguments:
+        colors: (N, 3) colors (see as_rgb_array)
+        step (int): Distance between tested gray levels (default 5)
+        level (str): WCAG level the grays must meet (default "AA_NORMAL")
+
+    Returns:
+        np.ndarray: N counts (int64)
+    """
+    if step < 1:
+        raise ValueError("step must be at least 1")
+    text_lumin = calculate_luminance_batch(colors)
+    if level not in WCAG_LEVEL_RATIOS:
+        return np.zeros(len(text_lumin), dtype=np.int64)
+
+    dark, light = _gray_pass_bounds_batch(text_lumin, WCAG_LEVEL_RATIOS[level])
+    dark_count = np.where(dark >= 0, dark // step + 1, 0)
+    light_count = np.where(light <= 255,
+                           255 // step - (light + step - 1) // step + 1, 0)
+    return dark_count + light_count
 
 
 # Thinking
@@ -524,18 +1839,18 @@ Also, variable 'gray' is defined LOCALLY because I am just using it here. It doe
 """
 
 
-def find_accessible_gray_background(text_r: int, text_g: int, text_b: int) -> int:
+def find_accessible_gray_background(text_r: int, text_g: int, text_b: int,
+                                    level: str = WCAG_AA_NORMAL) -> int:
     """
     Find the darkest gray background that still provides AA contrast with given text.
-    Uses while loop to test gray values starting from white (255).
+    Uses bisection over the precomputed gray luminance table.
 
     Implementation:
-    Start with the lightest gray (255) and work toward darker values (0). Use a
-    while loop to decrement the gray value. For each gray level, calculate the
-    contrast ratio with the text color using contrast_ratio(). Keep track of the
-    darkest gray that still provides AA contrast (4.5:1). The key insight is that
-    you want the darkest valid option, so continue testing even after finding
-    valid grays. Return the darkest gray that meets the standard.
+    Contrast against a gray falls as the gray approaches the text luminance and
+    rises again past it. If black (0) already passes, it is the darkest valid gray.
+    Otherwise only grays lighter than the text can pass, and those pass from a
+    cutoff up to white; _gray_pass_bounds() finds that cutoff by bisection. The
+    answer matches checking every gray with contrast_ratio().
 
     Examples:
         >>> find_accessible_gray_background(0, 0, 0)
@@ -554,31 +1869,54 @@ def find_accessible_gray_background(text_r: int, text_g: int, text_b: int) -> in
 
     Arguments:
         text_r, text_g, text_b (int): RGB values of the text color
+        level (str): WCAG level the gray must meet (default "AA_NORMAL")
 
     Returns:
-        int: Darkest gray value (0-255) that provides AA contrast, or 255 if none work
+        int: Darkest gray value (0-255) that provides the contrast, or 255 if none work
     """
+    if level not in WCAG_LEVEL_RATIOS:
+        return 255  # passes_wcag_level() fails every gray for unknown levels
+    if level == WCAG_AA_NORMAL:
+        index = _atlas_index(text_r, text_g, text_b)
+        if index >= 0:
+            return int(_color_atlas.gray_background[index])
 
-    gray = 255  # It starts white
-    darkest_valid_gray = 255
+    dark, light = _gray_pass_bounds(
+        calculate_luminance(text_r, text_g, text_b), WCAG_LEVEL_RATIOS[level])
 
-    while gray >= 0:
-        contrast = contrast_ratio(text_r, text_g, text_b, gray, gray, gray)
-        if contrast >= WCAG_AA_NORMAL_RATIO:
-            darkest_valid_gray = gray
-        gray -= GRAY_STEP_SIZE  # goes darker
+    if dark >= 0:  # black already works
+        return 0
+    if light > 255:  # My fallback if checks fail
+        return 255
+    return light
 
-    gray = darkest_valid_gray  # start from last good value
-    while gray >= 0:
-        contrast = contrast_ratio(text_r, text_g, text_b, gray, gray, gray)
-        if contrast < WCAG_AA_NORMAL_RATIO:
-            break
-        darkest_valid_gray = gray
-        gray -= 1
 
-    if darkest_valid_gray == 255:  # My fallback if checks fail
-        return 255
-    return int(darkest_valid_gray)
+def find_accessible_gray_background_batch(colors, level: str = WCAG_AA_NORMAL) -> "np.ndarray":
+    """
+    Find the darkest accessible gray background for many text colors at once.
+    Gives exactly the same grays as calling find_accessible_gray_background()
+    per color.
+
+    Examples:
+        >>> find_accessible_gray_background_batch(
+        ...     [(0, 0, 0), (255, 255, 255), (100, 100, 100)]).tolist()
+        [117, 0, 225]
+        >>> find_accessible_gray_background_batch([(0, 0, 0)], "AAA_NORMAL").tolist()
+        [149]
+
+    Arguments:
+        colors: (N, 3) text colors (see as_rgb_array)
+        level (str): WCAG level the gray must meet (default "AA_NORMAL")
+
+    Returns:
+        np.ndarray: N gray values (int64, 0-255)
+    """
+    text_lumin = calculate_luminance_batch(colors)
+    if level not in WCAG_LEVEL_RATIOS:
+        return np.full(len(text_lumin), 255, dtype=np.int64)
+
+    dark, light = _gray_pass_bounds_batch(text_lumin, WCAG_LEVEL_RATIOS[level])
+    return np.where(dark >= 0, 0, np.minimum(light, 255))
 
 
 # Thinking
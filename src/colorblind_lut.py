@@ -0,0 +1,146 @@
+"""
+3D lookup tables for colorblind_sim, for simulating video-rate frame streams.
+
+An exact table holds the simulated color of all 16,777,216 inputs for one
+(condition, model) (48 MiB each), so simulating a frame is one gather per
+pixel. Tables are saved as .npy files and loaded memory-mapped. File names
+carry colorblind_sim.SIMULATION_VERSION and color_tools.ALGORITHM_VERSION (the
+legacy model), so a table saved before a simulation change is never loaded;
+ensure_exact_lut() builds a fresh one instead.
+
+There are no interpolated (grid) tables: the machado and vienot models are
+a 3x3 matrix in linear light, which simulate_image() already applies
+directly, so a grid could only add interpolation error without saving time.
+"""
+import os
+
+import numpy as np
+
+from colorblind_sim import MACHADO, SIMULATION_VERSION, simulate_image
+from color_tools import ALGORITHM_VERSION
+
+COLOR_COUNT = 1 << 24
+LUT_BLOCK_COLORS = 1 << 20
+
+
+def color_indices(image) -> np.ndarray:
+    """
+    Exact-table index (r << 16) | (g << 8) | b of every pixel.
+
+    Examples:
+        >>> color_indices([[0, 0, 1], [1, 2, 3]]).tolist()
+        [1, 66051]
+
+    Arguments:
+        image: uint8 array-like whose last axis is (r, g, b)
+
+    Returns:
+        np.ndarray: int64 indices, shape of image without its last axis
+    """
+    image = np.asarray(image, dtype=np.uint8)
+    return ((image[..., 0].astype(np.int64) << 16)
+            | (image[..., 1].astype(np.int64) << 8) | image[..., 2])
+
+
+def _gamut_block(start: int, stop: int) -> np.ndarray:
+    """Colors with exact-table indices start..stop-1 as an (N, 3) uint8 array."""
+    indices = np.arange(start, stop, dtype=np.int64)
+    colors = np.empty((len(indices), 3), dtype=np.uint8)
+    colors[:, 0] = indices >> 16
+    colors[:, 1] = (indices >> 8) & 0xFF
+    colors[:, 2] = indices & 0xFF
+    return colors
+
+
+def build_exact_lut(condition: str, model: str = MACHADO) -> np.ndarray:
+    """
+    Simulate every 24-bit color once.
+
+    Arguments:
+        condition (str): "protanopia", "deuteranopia", or "tritanopia"
+        model (str): "machado", "vienot" or "legacy"
+
+    Returns:
+        np.ndarray: (16777216, 3) uint8 table indexed by color_indices()
+    """
+    lut = np.empty((COLOR_COUNT, 3), dtype=np.uint8)
+    for start in range(0, COLOR_COUNT, LUT_BLOCK_COLORS):
+        stop = start + LUT_BLOCK_COLORS
+        simulate_image(_gamut_block(start, stop), condition, model, out=lut[start:stop])
+    return lut
+
+
+def apply_exact_lut(image, lut) -> np.ndarray:
+    """
+    Simulate an image with an exact table: one gather per pixel.
+
+    Arguments:
+        image: uint8 array-like whose last axis is (r, g, b)
+        lut: Table from build_exact_lut() or load_exact_lut()
+
+    Returns:
+        np.ndarray: Simulated colors, same shape as image
+    """
+    return lut[color_indices(image)]
+
+
+def exact_lut_path(directory: str, condition: str, model: str = MACHADO) -> str:
+    """
+    File name used for a saved exact table of the current simulation.
+
+    Examples:
+        >>> exact_lut_path("luts", "protanopia").startswith("luts/machado_protanopia_")
+        True
+
+    Arguments:
+        directory (str): Folder holding the tables
+        condition (str): Simulated condition
+        model (str): Simulation model
+
+    Returns:
+        str: Path of the .npy file
+    """
+    return os.path.join(directory, f"{model}_{condition}_sim{SIMULATION_VERSION}"
+                                   f"_alg{ALGORITHM_VERSION}.npy")
+
+
+def save_exact_lut(directory: str, condition: str, model: str = MACHADO) -> str:
+    """
+    Build an exact table and save it as a .npy file in directory.
+
+    Returns:
+        str: Path of the written file
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = exact_lut_path(directory, condition, model)
+    np.save(path, build_exact_lut(condition, model))
+    return path
+
+
+def load_exact_lut(directory: str, condition: str, model: str = MACHADO) -> np.ndarray:
+    """
+    Memory-map a saved exact table (pages are read only as pixels need them).
+
+    Raises:
+        FileNotFoundError: If no table has been saved for the current versions
+        ValueError: If the file is not a complete exact table
+    """
+    lut = np.load(exact_lut_path(directory, condition, model), mmap_mode="r")
+    if lut.shape != (COLOR_COUNT, 3) or lut.dtype != np.uint8:
+        raise ValueError("not an exact colorblindness lookup table")
+    return lut
+
+
+def ensure_exact_lut(directory: str, condition: str, model: str = MACHADO) -> np.ndarray:
+    """
+    Memory-map a saved exact table, first building and saving it when there
+    is none for the current versions or the saved file is damaged.
+
+    Returns:
+        np.ndarray: Table from load_exact_lut()
+    """
+    try:
+        return load_exact_lut(directory, condition, model)
+    except (OSError, ValueError):
+        save_exact_lut(directory, condition, model)
+        return load_exact_lut(directory, condition, model)
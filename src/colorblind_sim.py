@@ -0,0 +1,263 @@
+"""
+Colorblindness simulation on whole images.
+
+Colors are converted to linear light with the same table calculate_luminance()
+uses, multiplied by a 3x3 matrix for the condition, and converted back to
+8-bit sRGB. This works on any (..., 3) uint8 array, from a single color to a
+full-page screenshot, in one vectorized pass.
+
+Models:
+    "machado": Machado, Oliveira & Fernandes (2009), severity 1.0 (all three conditions)
+    "vienot": Vienot, Brettel & Mollon (1999) (protanopia and deuteranopia)
+    "legacy": the simplified channel blends of color_tools.simulate_colorblindness()
+"""
+import numpy as np
+
+from color_tools import (DEUTERANOPIA, GAMMA_DIVISOR, GAMMA_EXPONENT,
+                         GAMMA_MULTIPLIER, GAMMA_OFFSET, GAMMA_THRESHOLD,
+                         LINEAR_RGB_ARRAY, LINEAR_RGB_TABLE, PROTANOPIA,
+                         RED_LUMINANCE_COEFFICIENT, GREEN_LUMINANCE_COEFFICIENT,
+                         BLUE_LUMINANCE_COEFFICIENT, RGB_MAX, TRITANOPIA,
+                         as_rgb_array, calculate_luminance_batch,
+                         contrast_ratio_from_luminance,
+                         simulate_colorblindness_batch, wcag_level_masks)
+
+MACHADO = "machado"
+VIENOT = "vienot"
+LEGACY = "legacy"
+
+# Linear-RGB simulation matrices, applied as simulated = matrix @ [r, g, b]
+CONDITION_MATRICES = {
+    MACHADO: {
+        PROTANOPIA: ((0.152286, 1.052583, -0.204868),
+                     (0.114503, 0.786281, 0.099216),
+                     (-0.003882, -0.048116, 1.051998)),
+        DEUTERANOPIA: ((0.367322, 0.860646, -0.227968),
+                       (0.280085, 0.672501, 0.047413),
+                       (-0.011820, 0.042940, 0.968881)),
+        TRITANOPIA: ((1.255528, -0.076749, -0.178779),
+                     (-0.078411, 0.930809, 0.147602),
+                     (0.004733, 0.691367, 0.303900)),
+    },
+    VIENOT: {
+        PROTANOPIA: ((0.11238, 0.88762, 0.0),
+                     (0.11238, 0.88762, 0.0),
+                     (0.00401, -0.00401, 1.0)),
+        DEUTERANOPIA: ((0.29275, 0.70725, 0.0),
+                       (0.29275, 0.70725, 0.0),
+                       (-0.02234, 0.02234, 1.0)),
+    },
+}
+
+SIMULATION_MODELS = (MACHADO, VIENOT, LEGACY)
+
+# Bump whenever simulated colors change, so stored audits are recomputed
+SIMULATION_VERSION = 1
+
+# Views compared by audit_colorblind_contrast(), in result column order
+ORIGINAL = "original"
+AUDIT_VIEWS = (ORIGINAL, PROTANOPIA, DEUTERANOPIA, TRITANOPIA)
+
+# Pixels converted per block, to bound the float working memory
+SIMULATION_BLOCK_PIXELS = 1 << 20
+
+# float32 is plenty for 8-bit output and halves the memory traffic
+_LINEAR_RGB_FLOAT32 = np.array(LINEAR_RGB_TABLE, dtype=np.float32)
+
+# Linear value where the WCAG gamma curve switches from linear to power
+_LINEAR_THRESHOLD = GAMMA_THRESHOLD / GAMMA_DIVISOR
+
+
+def linear_to_srgb(linear) -> np.ndarray:
+    """
+    Convert linear-light values (0.0-1.0) back to 8-bit sRGB channels.
+    This is the inverse of the gamma correction in color_tools.
+
+    Examples:
+        >>> linear_to_srgb([0.0, 1.0, 0.21404114]).tolist()
+        [0, 255, 128]
+
+    Arguments:
+        linear: Array-like of linear-light values (clipped to 0.0-1.0)
+
+    Returns:
+        np.ndarray: uint8 channel values
+    """
+    linear = np.clip(np.asarray(linear, dtype=np.float32), 0.0, 1.0)
+    encoded = np.where(
+        linear <= _LINEAR_THRESHOLD,
+        linear * GAMMA_DIVISOR,
+        GAMMA_MULTIPLIER * np.power(linear, 1 / GAMMA_EXPONENT) - GAMMA_OFFSET)
+    return np.rint(encoded * RGB_MAX).astype(np.uint8)
+
+
+def condition_matrix(condition: str, model: str = MACHADO):
+    """
+    The linear-RGB matrix for a condition, or None when the color is unchanged.
+
+    Examples:
+        >>> condition_matrix("protanopia")[0]
+        (0.152286, 1.052583, -0.204868)
+        >>> condition_matrix("unknown") is None
+        True
+
+    Arguments:
+        condition (str): "protanopia", "deuteranopia", or "tritanopia"
+        model (str): "machado" or "vienot"
+
+    Returns:
+        tuple or None: 3x3 matrix rows
+
+    Raises:
+        ValueError: For an unknown model, or a condition the model does not cover
+    """
+    if model not in CONDITION_MATRICES:
+        raise ValueError(f"unknown simulation model {model!r}")
+    if condition not in (PROTANOPIA, DEUTERANOPIA, TRITANOPIA):
+        return None  # unknown condition, like simulate_colorblindness()
+    if condition not in CONDITION_MATRICES[model]:
+        raise ValueError(f"the {model} model does not simulate {condition}")
+    return CONDITION_MATRICES[model][condition]
+
+
+def simulate_image(image, condition: str, model: str = MACHADO, out=None) -> np.ndarray:
+    """
+    Simulate how an image (or any array of colors) appears with a colorblindness
+    condition.
+
+    Examples:
+        >>> simulate_image([[255, 0, 0]], "protanopia").tolist()
+        [[109, 95, 0]]
+        >>> simulate_image([[255, 128, 64]], "deuteranopia", model="legacy").tolist()
+        [[223, 223, 64]]
+        >>> simulate_image([[10, 20, 30]], "unknown").tolist()
+        [[10, 20, 30]]
+
+    Arguments:
+        image: uint8 array-like whose last axis is (r, g, b), e.g. (H, W, 3)
+        condition (str): "protanopia", "deuteranopia", or "tritanopia"
+        model (str): "machado", "vienot" or "legacy"
+        out: Optional uint8 array of the same shape to write into
+
+    Returns:
+        np.ndarray: Simulated colors, same shape as image
+    """
+    image = np.asarray(image, dtype=np.uint8)
+    if image.shape[-1:] != (3,):
+        raise ValueError("image must have 3 channels in its last axis")
+    if out is None:
+        out = np.empty_like(image)
+    pixels = image.reshape(-1, 3)
+    simulated = out.reshape(-1, 3)
+
+    if model == LEGACY:
+        simulated[:] = simulate_colorblindness_batch(pixels, condition)
+        return out
+
+    matrix = condition_matrix(condition, model)
+    if matrix is None:
+        simulated[:] = pixels
+        return out
+
+    for start in range(0, len(pixels), SIMULATION_BLOCK_PIXELS):
+        block = slice(start, start + SIMULATION_BLOCK_PIXELS)
+        simulated[block] = _simulate_linear(_LINEAR_RGB_FLOAT32[pixels[block]], matrix)
+    return out
+
+
+def _simulate_linear(linear, matrix) -> np.ndarray:
+    """Apply a condition matrix to (N, 3) linear-light colors and encode to uint8."""
+    return linear_to_srgb(linear @ np.array(matrix, dtype=np.float32).T)
+
+
+def simulate_color(r: int, g: int, b: int, condition: str, model: str = MACHADO) -> tuple:
+    """
+    simulate_image() for a single color.
+
+    Examples:
+        >>> simulate_color(0, 0, 255, "tritanopia")
+        (0, 107, 150)
+        >>> simulate_color(255, 0, 0, "protanopia", model="legacy")
+        (127, 127, 0)
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+        condition (str): "protanopia", "deuteranopia", or "tritanopia"
+        model (str): "machado", "vienot" or "legacy"
+
+    Returns:
+        tuple: (r, g, b) values as perceived by colorblind person
+    """
+    return tuple(simulate_image([[r, g, b]], condition, model)[0].tolist())
+
+
+def _luminance_of_uint8(colors) -> np.ndarray:
+    """calculate_luminance_batch() for an (N, 3) uint8 array known to be valid."""
+    return (RED_LUMINANCE_COEFFICIENT * LINEAR_RGB_ARRAY[colors[:, 0]]
+            + GREEN_LUMINANCE_COEFFICIENT * LINEAR_RGB_ARRAY[colors[:, 1]]
+            + BLUE_LUMINANCE_COEFFICIENT * LINEAR_RGB_ARRAY[colors[:, 2]])
+
+
+def audit_colorblind_contrast(foregrounds, backgrounds, model: str = LEGACY) -> dict:
+    """
+    Contrast ratio and WCAG results of each foreground/background pair, as seen
+    normally and with each colorblindness condition, in one pass.
+    Column j of every result is the view AUDIT_VIEWS[j]. Each simulated column
+    equals contrast_ratio() of the two colors after simulating them. With the
+    matrix models every color is linearized once and shared by all views.
+
+    Examples:
+        >>> audit = audit_colorblind_contrast([(255, 0, 0)], [(0, 128, 0)])
+        >>> audit["ratio"].round(2).tolist()
+        [[1.28, 2.53, 8.41, 1.26]]
+        >>> audit["AA_LARGE"].tolist()
+        [[False, False, True, False]]
+
+    Arguments:
+        foregrounds: (N, 3) colors (see color_tools.as_rgb_array)
+        backgrounds: (N, 3) colors
+        model (str): Simulation model; "legacy" matches simulate_colorblindness().
+            The model must simulate every condition in AUDIT_VIEWS, so "vienot"
+            (no tritanopia) is rejected
+
+    Returns:
+        dict: "ratio" -> (N, 4) contrast ratios, and each WCAG level string ->
+            (N, 4) pass/fail mask (see color_tools.wcag_level_masks)
+
+    Raises:
+        ValueError: For mismatched lengths, an unknown model, or a model that
+            does not cover every audit view
+    """
+    foregrounds = as_rgb_array(foregrounds)
+    backgrounds = as_rgb_array(backgrounds)
+    if len(foregrounds) != len(backgrounds):
+        raise ValueError("foregrounds and backgrounds must have the same length")
+    if model != LEGACY:
+        if model not in CONDITION_MATRICES:
+            raise ValueError(f"unknown simulation model {model!r}")
+        uncovered = [view for view in AUDIT_VIEWS[1:] if view not in CONDITION_MATRICES[model]]
+        if uncovered:
+            raise ValueError(f"the {model} model does not simulate {', '.join(uncovered)}, "
+                             f"which the audit needs; use {MACHADO!r} or {LEGACY!r}")
+
+    if model != LEGACY:
+        fg_linear = _LINEAR_RGB_FLOAT32[foregrounds]
+        bg_linear = _LINEAR_RGB_FLOAT32[backgrounds]
+
+    ratios = np.empty((len(foregrounds), len(AUDIT_VIEWS)))
+    ratios[:, 0] = contrast_ratio_from_luminance(
+        calculate_luminance_batch(foregrounds), calculate_luminance_batch(backgrounds))
+    for column, condition in enumerate(AUDIT_VIEWS[1:], 1):
+        if model == LEGACY:
+            fg_seen = simulate_colorblindness_batch(foregrounds, condition)
+            bg_seen = simulate_colorblindness_batch(backgrounds, condition)
+        else:
+            matrix = condition_matrix(condition, model)
+            fg_seen = _simulate_linear(fg_linear, matrix)
+            bg_seen = _simulate_linear(bg_linear, matrix)
+        ratios[:, column] = contrast_ratio_from_luminance(
+            _luminance_of_uint8(fg_seen), _luminance_of_uint8(bg_seen))
+
+    audit = {"ratio": ratios}
+    audit.update(wcag_level_masks(ratios))
+    return audit
@@ -0,0 +1,253 @@
+"""
+Integer-only WCAG luminance and contrast checks.
+
+Luminances are fixed-point integers: the sum of the WCAG weights (scaled to
+integers) times a table of linear-light channel values scaled by
+2**FIXED_SHIFT. A contrast check against a level with ratio num/den is the
+cross-multiplication den * (lighter + offset) >= num * (darker + offset), so
+no division or float rounding is involved and every platform gets the same
+answer.
+
+The scale is chosen so that these checks agree with contrast_ratio() and
+passes_wcag_level() on every pair of colors at every WCAG level (see
+tests/test_fixed_point.py); a 32-bit table is not precise enough for that.
+All intermediate values fit in int64.
+
+This saves no memory: LINEAR_RGB_FIXED_ARRAY and the batch luminances are int64,
+the same size as their float64 counterparts (8 bytes per value). The point is exact,
+platform-independent pass/fail results, not a smaller footprint.
+
+The default tests check a strided sample of colors. The full-gamut proof
+(every pair of 24-bit colors, about a minute and 1 GB of memory) is opt-in:
+    FIXED_POINT_FULL_GAMUT=1 python -m pytest tests/test_fixed_point.py
+"""
+from color_tools import (BLUE_LUMINANCE_COEFFICIENT, CHANNEL_MASK, GREEN_LUMINANCE_COEFFICIENT,
+                         GREEN_SHIFT, LINEAR_RGB_TABLE, LUMINANCE_OFFSET, RED_LUMINANCE_COEFFICIENT,
+                         RED_SHIFT, RGB_MAX, RGB_MIN, WCAG_AA_NORMAL, WCAG_LEVEL_BITS,
+                         WCAG_LEVEL_RATIOS, as_rgb_array)
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed by the *_batch functions
+    np = None
+
+# Linear-light channel values are scaled by 2**FIXED_SHIFT
+FIXED_SHIFT = 47
+
+# The WCAG weights and offset are exact multiples of 1/FIXED_WEIGHT_SCALE
+FIXED_WEIGHT_SCALE = 5000
+FIXED_RED_WEIGHT = round(RED_LUMINANCE_COEFFICIENT * FIXED_WEIGHT_SCALE)      # 1063
+FIXED_GREEN_WEIGHT = round(GREEN_LUMINANCE_COEFFICIENT * FIXED_WEIGHT_SCALE)  # 3576
+FIXED_BLUE_WEIGHT = round(BLUE_LUMINANCE_COEFFICIENT * FIXED_WEIGHT_SCALE)    # 361
+
+# Luminance 1.0 and the 0.05 contrast offset in fixed point
+FIXED_ONE = FIXED_WEIGHT_SCALE << FIXED_SHIFT
+FIXED_OFFSET = round(LUMINANCE_OFFSET * FIXED_WEIGHT_SCALE) << FIXED_SHIFT
+
+# Linear-light value of each channel level, times 2**FIXED_SHIFT
+LINEAR_RGB_FIXED_TABLE = tuple(round(value * (1 << FIXED_SHIFT)) for value in LINEAR_RGB_TABLE)
+LINEAR_RGB_FIXED_ARRAY = None if np is None else np.array(LINEAR_RGB_FIXED_TABLE, dtype=np.int64)
+
+# Each WCAG level's ratio as an exact (numerator, denominator) pair
+FIXED_LEVEL_FRACTIONS = {level: ratio.as_integer_ratio() for level, ratio in WCAG_LEVEL_RATIOS.items()}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for the *_batch functions")
+
+
+def fixed_luminance_packed(color: int) -> int:
+    """
+    fixed_luminance() of a packed color (see color_tools.pack_rgb).
+
+    Examples:
+        >>> fixed_luminance_packed(0xFFFFFF) == FIXED_ONE
+        True
+
+    Arguments:
+        color (int): Packed color
+
+    Returns:
+        int: Fixed-point luminance (0-FIXED_ONE)
+    """
+    return (FIXED_RED_WEIGHT * LINEAR_RGB_FIXED_TABLE[color >> RED_SHIFT]
+            + FIXED_GREEN_WEIGHT * LINEAR_RGB_FIXED_TABLE[(color >> GREEN_SHIFT) & CHANNEL_MASK]
+            + FIXED_BLUE_WEIGHT * LINEAR_RGB_FIXED_TABLE[color & CHANNEL_MASK])
+
+
+def fixed_luminance(r: int, g: int, b: int) -> int:
+    """
+    Relative luminance as a fixed-point integer: FIXED_ONE is 1.0.
+
+    Examples:
+        >>> fixed_luminance(0, 0, 0)
+        0
+        >>> round(fixed_luminance(128, 128, 128) / FIXED_ONE, 3)
+        0.216
+
+    Arguments:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        int: Fixed-point luminance (0-FIXED_ONE)
+
+    Raises:
+        ValueError: If a channel is outside 0-255
+    """
+    if not (RGB_MIN <= r <= RGB_MAX and RGB_MIN <= g <= RGB_MAX and RGB_MIN <= b <= RGB_MAX):
+        raise ValueError("RGB values must be between 0 and 255")
+    return (FIXED_RED_WEIGHT * LINEAR_RGB_FIXED_TABLE[r]
+            + FIXED_GREEN_WEIGHT * LINEAR_RGB_FIXED_TABLE[g]
+            + FIXED_BLUE_WEIGHT * LINEAR_RGB_FIXED_TABLE[b])
+
+
+def fixed_passes(fg_lumin: int, bg_lumin: int, level: str = WCAG_AA_NORMAL) -> bool:
+    """
+    Whether two fixed-point luminances meet a WCAG level, without division.
+    Unknown levels never pass, as in passes_wcag_level().
+
+    Examples:
+        >>> fixed_passes(fixed_luminance(118, 118, 118), FIXED_ONE)
+        True
+        >>> fixed_passes(fixed_luminance(119, 119, 119), FIXED_ONE)
+        False
+
+    Arguments:
+        fg_lumin (int): Foreground fixed-point luminance
+        bg_lumin (int): Background fixed-point luminance
+        level (str): WCAG level, e.g. "AA_NORMAL"
+
+    Returns:
+        bool: True if the pair meets level
+    """
+    if level not in FIXED_LEVEL_FRACTIONS:
+        return False
+    numerator, denominator = FIXED_LEVEL_FRACTIONS[level]
+    if fg_lumin > bg_lumin:
+        return denominator * (fg_lumin + FIXED_OFFSET) >= numerator * (bg_lumin + FIXED_OFFSET)
+    return denominator * (bg_lumin + FIXED_OFFSET) >= numerator * (fg_lumin + FIXED_OFFSET)
+
+
+def fixed_level_mask(fg_lumin: int, bg_lumin: int) -> int:
+    """
+    Every WCAG level two fixed-point luminances meet, as a mask of
+    color_tools.WCAG_LEVEL_BITS (see color_tools.wcag_level_mask).
+
+    Examples:
+        >>> fixed_level_mask(0, FIXED_ONE)
+        15
+        >>> fixed_level_mask(FIXED_ONE, FIXED_ONE)
+        0
+
+    Arguments:
+        fg_lumin (int): Foreground fixed-point luminance
+        bg_lumin (int): Background fixed-point luminance
+
+    Returns:
+        int: Level mask (0-15)
+    """
+    lighter = max(fg_lumin, bg_lumin) + FIXED_OFFSET
+    darker = min(fg_lumin, bg_lumin) + FIXED_OFFSET
+    mask = 0
+    for level, (numerator, denominator) in FIXED_LEVEL_FRACTIONS.items():
+        if denominator * lighter >= numerator * darker:
+            mask |= WCAG_LEVEL_BITS[level]
+    return mask
+
+
+def fixed_contrast_passes(fg_r: int, fg_g: int, fg_b: int,
+                          bg_r: int, bg_g: int, bg_b: int,
+                          level: str = WCAG_AA_NORMAL) -> bool:
+    """
+    passes_wcag_level(contrast_ratio(...), level) in integer arithmetic.
+
+    Examples:
+        >>> fixed_contrast_passes(255, 0, 0, 255, 255, 255, "AA_LARGE")
+        True
+        >>> fixed_contrast_passes(255, 0, 0, 255, 255, 255, "AA_NORMAL")
+        False
+
+    Arguments:
+        fg_r, fg_g, fg_b (int): Foreground RGB values (0-255)
+        bg_r, bg_g, bg_b (int): Background RGB values (0-255)
+        level (str): WCAG level, e.g. "AA_NORMAL"
+
+    Returns:
+        bool: True if the pair meets level
+    """
+    return fixed_passes(fixed_luminance(fg_r, fg_g, fg_b), fixed_luminance(bg_r, bg_g, bg_b), level)
+
+
+def fixed_luminance_batch(colors) -> "np.ndarray":
+    """
+    fixed_luminance() of many colors.
+
+    Examples:
+        >>> fixed_luminance_batch([(255, 255, 255), (0, 0, 0)]).tolist() == [FIXED_ONE, 0]
+        True
+
+    Arguments:
+        colors: (N, 3) colors (see color_tools.as_rgb_array)
+
+    Returns:
+        np.ndarray: N int64 fixed-point luminances
+    """
+    _require_numpy()
+    colors = as_rgb_array(colors)
+    return (FIXED_RED_WEIGHT * LINEAR_RGB_FIXED_ARRAY[colors[:, 0]]
+            + FIXED_GREEN_WEIGHT * LINEAR_RGB_FIXED_ARRAY[colors[:, 1]]
+            + FIXED_BLUE_WEIGHT * LINEAR_RGB_FIXED_ARRAY[colors[:, 2]])
+
+
+def fixed_passes_batch(fg_lumins, bg_lumins, level: str = WCAG_AA_NORMAL) -> "np.ndarray":
+    """
+    fixed_passes() of arrays of fixed-point luminances (broadcast together).
+
+    Examples:
+        >>> fixed_passes_batch(fixed_luminance_batch([(0, 0, 0), (200, 200, 200)]), FIXED_ONE).tolist()
+        [True, False]
+
+    Arguments:
+        fg_lumins: Array-like of foreground fixed-point luminances
+        bg_lumins: Array-like of background fixed-point luminances
+        level (str): WCAG level, e.g. "AA_NORMAL"
+
+    Returns:
+        np.ndarray: Boolean array of the broadcast shape
+    """
+    _require_numpy()
+    fg_lumins = np.asarray(fg_lumins, dtype=np.int64)
+    bg_lumins = np.asarray(bg_lumins, dtype=np.int64)
+    if level not in FIXED_LEVEL_FRACTIONS:
+        return np.zeros(np.broadcast(fg_lumins, bg_lumins).shape, dtype=bool)
+    numerator, denominator = FIXED_LEVEL_FRACTIONS[level]
+    lighter = np.maximum(fg_lumins, bg_lumins) + FIXED_OFFSET
+    darker = np.minimum(fg_lumins, bg_lumins) + FIXED_OFFSET
+    return denominator * lighter >= numerator * darker
+
+
+def fixed_level_mask_batch(fg_lumins, bg_lumins) -> "np.ndarray":
+    """
+    fixed_level_mask() of arrays of fixed-point luminances (broadcast together).
+
+    Examples:
+        >>> fixed_level_mask_batch([0, FIXED_ONE], FIXED_ONE).tolist()
+        [15, 0]
+
+    Arguments:
+        fg_lumins: Array-like of foreground fixed-point luminances
+        bg_lumins: Array-like of background fixed-point luminances
+
+    Returns:
+        np.ndarray: uint8 level masks of the broadcast shape
+    """
+    _require_numpy()
+    fg_lumins = np.asarray(fg_lumins, dtype=np.int64)
+    bg_lumins = np.asarray(bg_lumins, dtype=np.int64)
+    lighter = np.maximum(fg_lumins, bg_lumins) + FIXED_OFFSET
+    darker = np.minimum(fg_lumins, bg_lumins) + FIXED_OFFSET
+    mask = np.zeros(lighter.shape, dtype=np.uint8)
+    for level, (numerator, denominator) in FIXED_LEVEL_FRACTIONS.items():
+        mask[denominator * lighter >= numerator * darker] |= WCAG_LEVEL_BITS[level]
+    return mask
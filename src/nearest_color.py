@@ -0,0 +1,282 @@
+"""
+Nearest accessible foreground: the passing color closest to a failing one.
+
+recommend_adjustment() only says which way to go; this module finds the
+foreground that meets a WCAG level against a background while staying as close
+as possible (Euclidean distance in CIELAB, i.e. delta E 1976) to the original.
+
+Candidate colors are indexed once in a k-d tree over their Lab coordinates.
+Every tree node also records the luminance range of its colors, which fixes
+the best contrast any color in the node can reach against a background, so a
+query skips nodes that cannot pass just as it skips nodes that are too far
+away. One tree therefore serves every background and WCAG level, where a plain
+k-d tree would need a separate candidate set per luminance threshold.
+
+The default index holds a grid of candidates, so its answer can be a few
+levels per channel from the best color in the full 24-bit gamut. Queries
+with refine > 0 close that gap: starting from the tree's answer, they search
+the full gamut within refine levels per channel, and repeat around each
+better color until none is found. This finds the full-gamut optimum whenever
+it lies in the same basin as the grid answer, which is the common case, but
+it is not guaranteed in general.
+"""
+import heapq
+
+import numpy as np
+
+from color_spaces import rgb_to_lab
+from color_tools import (LUMINANCE_OFFSET, RGB_MAX, WCAG_AA_NORMAL, WCAG_LEVEL_RATIOS,
+                         as_rgb_array, calculate_luminance_batch)
+
+# Candidate channel spacing of the default index: every 4th level plus 255,
+# 65^3 = 274,625 colors. A step of 1 indexes all 16,777,216 colors.
+DEFAULT_CANDIDATE_STEP = 4
+
+# Colors per k-d tree leaf
+LEAF_SIZE = 32
+
+_default_index = None
+
+
+def _contrast(lumin, bg_lumin):
+    """contrast_ratio() from luminances (floats or arrays), in the same float steps."""
+    lighter = np.maximum(lumin, bg_lumin)
+    darker = np.minimum(lumin, bg_lumin)
+    return (lighter + LUMINANCE_OFFSET) / (darker + LUMINANCE_OFFSET)
+
+
+def candidate_colors(step: int = DEFAULT_CANDIDATE_STEP) -> np.ndarray:
+    """
+    Every color whose channels are multiples of step, or 255.
+
+    Examples:
+        >>> candidate_colors(128).tolist()[:4]
+        [[0, 0, 0], [0, 0, 128], [0, 0, 255], [0, 128, 0]]
+
+    Arguments:
+        step (int): Channel spacing (1-255)
+
+    Returns:
+        np.ndarray: (K, 3) uint8 colors
+    """
+    if not 1 <= step <= RGB_MAX:
+        raise ValueError("step must be between 1 and 255")
+    levels = np.unique(np.append(np.arange(0, RGB_MAX + 1, step), RGB_MAX)).astype(np.uint8)
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    return np.stack([r.ravel(), g.ravel(), b.ravel()], axis=-1)
+
+
+class AccessibleColorIndex:
+    """
+    k-d tree over candidate colors in Lab, with per-node luminance ranges.
+
+    Attributes:
+        colors (np.ndarray): (K, 3) uint8 candidates, in tree order
+        lab (np.ndarray): (K, 3) Lab coordinates of colors
+        luminance (np.ndarray): (K,) WCAG luminance of colors
+    """
+
+    def __init__(self, colors=None, leaf_size: int = LEAF_SIZE) -> None:
+        colors = candidate_colors() if colors is None else as_rgb_array(colors)
+        lab = rgb_to_lab(colors)
+        luminance = calculate_luminance_batch(colors)
+        order = np.arange(len(colors))
+
+        # Node arrays; a leaf has left == -1 and covers order[start:stop]
+        self._start, self._stop, self._left, self._right = [], [], [], []
+        self._low, self._high, self._lumin_min, self._lumin_max = [], [], [], []
+
+        def build(start: int, stop: int) -> int:
+            indices = order[start:stop]
+            points = lab[indices]
+            node = len(self._start)
+            low, high = points.min(axis=0), points.max(axis=0)
+            self._start.append(start)
+            self._stop.append(stop)
+            self._low.append(tuple(low.tolist()))
+            self._high.append(tuple(high.tolist()))
+            self._lumin_min.append(float(luminance[indices].min()))
+            self._lumin_max.append(float(luminance[indices].max()))
+            self._left.append(-1)
+            self._right.append(-1)
+            if stop - start > leaf_size:
+                middle = (start + stop) // 2
+                axis = int(np.argmax(high - low))
+                order[start:stop] = indices[np.argpartition(points[:, axis], middle - start)]
+                self._left[node] = build(start, middle)
+                self._right[node] = build(middle, stop)
+            return node
+
+        if len(colors):
+            build(0, len(colors))
+        self.colors = colors[order]
+        self.lab = lab[order]
+        self.luminance = luminance[order]
+
+    def _node_may_pass(self, node: int, bg_lumin: float, ratio: float) -> bool:
+        """Whether any color in the node can reach ratio against bg_lumin."""
+        # Contrast falls then rises with luminance, so the extremes bound it
+        return (_contrast(self._lumin_min[node], bg_lumin) >= ratio
+                or _contrast(self._lumin_max[node], bg_lumin) >= ratio)
+
+    def _bound(self, node: int, point: tuple) -> float:
+        """Squared distance from point to the bounding box of a node."""
+        total = 0.0
+        for value, low, high in zip(point, self._low[node], self._high[node]):
+            if value < low:
+                total += (low - value) ** 2
+            elif value > high:
+                total += (value - high) ** 2
+        return total
+
+    def query(self, lab, bg_lumin: float, ratio: float) -> tuple:
+        """
+        Find the candidate nearest to a Lab point whose contrast against a
+        background luminance is at least ratio.
+
+        Arguments:
+            lab: (L*, a*, b*) of the original color
+            bg_lumin (float): Background luminance
+            ratio (float): Required contrast ratio
+
+        Returns:
+            tuple: (candidate position, squared distance), or (-1, inf) when
+                no candidate passes
+        """
+        point = tuple(float(value) for value in lab)
+        best, best_position = np.inf, -1
+        if not self._start or not self._node_may_pass(0, bg_lumin, ratio):
+            return best_position, best
+
+        heap = [(self._bound(0, point), 0)]
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if bound >= best:
+                break
+            if self._left[node] < 0:
+                start, stop = self._start[node], self._stop[node]
+                passing = _contrast(self.luminance[start:stop], bg_lumin) >= ratio
+                distances = ((self.lab[start:stop] - point) ** 2).sum(axis=1)
+                distances[~passing] = np.inf
+                position = int(np.argmin(distances))
+                if distances[position] < best:
+                    best, best_position = float(distances[position]), start + position
+                continue
+            for child in (self._left[node], self._right[node]):
+                child_bound = self._bound(child, point)
+                if child_bound < best and self._node_may_pass(child, bg_lumin, ratio):
+                    heapq.heappush(heap, (child_bound, child))
+        return best_position, best
+
+    def _refine(self, lab, bg_lumin: float, ratio: float, color, radius: int) -> tuple:
+        """Improve a passing color by local search over the full gamut (see the module notes)."""
+        offsets = np.arange(-radius, radius + 1)
+        best, best_distance = np.asarray(color, dtype=np.int64), np.inf
+        while True:
+            axes = [np.unique(np.clip(value + offsets, 0, RGB_MAX)) for value in best.tolist()]
+            box = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3).astype(np.uint8)
+            distances = ((rgb_to_lab(box) - lab) ** 2).sum(axis=1)
+            distances[_contrast(calculate_luminance_batch(box), bg_lumin) < ratio] = np.inf
+            position = int(np.argmin(distances))
+            if distances[position] >= best_distance:
+                return best.astype(np.uint8), best_distance
+            best, best_distance = box[position].astype(np.int64), float(distances[position])
+
+    def nearest_batch(self, foregrounds, backgrounds, level: str = WCAG_AA_NORMAL,
+                      refine: int = 0) -> tuple:
+        """
+        For each foreground/background pair, the foreground to use for the pair
+        to meet level: the original when it already passes, otherwise the
+        nearest passing candidate, optionally refined over the full gamut.
+
+        Examples:
+            >>> index = AccessibleColorIndex(candidate_colors(32))
+            >>> colors, distances = index.nearest_batch([(119, 119, 119), (0, 0, 0)],
+            ...                                         [(255, 255, 255)] * 2)
+            >>> colors.tolist(), distances.round(2).tolist()
+            ([[96, 96, 96], [0, 0, 0]], [9.3, 0.0])
+            >>> index.nearest_batch([(119, 119, 119)], [(255, 255, 255)], refine=32)[0].tolist()
+            [[118, 118, 118]]
+
+        Arguments:
+            foregrounds: (N, 3) colors (see color_tools.as_rgb_array)
+            backgrounds: (N, 3) colors
+            level (str): WCAG level, e.g. "AA_NORMAL"
+            refine (int): Channel radius of the full-gamut local search
+                (0: return candidates only; use the candidate spacing)
+
+        Returns:
+            tuple: ((N, 3) uint8 foregrounds, (N,) Lab distances from the
+                originals); a pair with no passing candidate keeps its original
+                foreground with distance inf
+
+        Raises:
+            ValueError: For an unknown level or mismatched lengths
+        """
+        if level not in WCAG_LEVEL_RATIOS:
+            raise ValueError(f"unknown WCAG level {level!r}")
+        ratio = WCAG_LEVEL_RATIOS[level]
+        foregrounds = as_rgb_array(foregrounds)
+        backgrounds = as_rgb_array(backgrounds)
+        if len(foregrounds) != len(backgrounds):
+            raise ValueError("foregrounds and backgrounds must have the same length")
+
+        fg_lumin = calculate_luminance_batch(foregrounds)
+        bg_lumin = calculate_luminance_batch(backgrounds)
+        passing = _contrast(fg_lumin, bg_lumin) >= ratio
+        labs = rgb_to_lab(foregrounds)
+
+        colors = foregrounds.copy()
+        distances = np.zeros(len(foregrounds))
+        for row in np.flatnonzero(~passing).tolist():
+            position, squared = self.query(labs[row], float(bg_lumin[row]), ratio)
+            if position >= 0:
+                colors[row] = self.colors[position]
+                if refine:
+                    colors[row], squared = self._refine(labs[row], float(bg_lumin[row]), ratio,
+                                                        colors[row], refine)
+            distances[row] = np.sqrt(squared)
+        return colors, distances
+
+
+def get_index() -> AccessibleColorIndex:
+    """
+    Return the default index (DEFAULT_CANDIDATE_STEP), building it on first use.
+
+    Returns:
+        AccessibleColorIndex: Shared index
+    """
+    global _default_index
+    if _default_index is None:
+        _default_index = AccessibleColorIndex()
+    return _default_index
+
+
+def nearest_accessible_foreground(fg_r: int, fg_g: int, fg_b: int,
+                                  bg_r: int, bg_g: int, bg_b: int,
+                                  level: str = WCAG_AA_NORMAL):
+    """
+    The color closest to the foreground (in Lab) that meets level against the
+    background, using the default index refined over the full gamut (see the
+    module notes).
+
+    Examples:
+        >>> nearest_accessible_foreground(119, 119, 119, 255, 255, 255)
+        (118, 118, 118)
+        >>> nearest_accessible_foreground(0, 0, 0, 255, 255, 255)
+        (0, 0, 0)
+
+    Arguments:
+        fg_r, fg_g, fg_b (int): Foreground RGB values (0-255)
+        bg_r, bg_g, bg_b (int): Background RGB values (0-255)
+        level (str): WCAG level, e.g. "AA_NORMAL"
+
+    Returns:
+        tuple or None: (r, g, b), or None when no color can meet level
+    """
+    colors, distances = get_index().nearest_batch([(fg_r, fg_g, fg_b)],
+                                                  [(bg_r, bg_g, bg_b)], level,
+                                                  refine=DEFAULT_CANDIDATE_STEP)
+    if np.isinf(distances[0]):
+        return None
+    return tuple(colors[0].tolist())
@@ -0,0 +1,166 @@
+"""
+Distinguishability checks for categorical palettes (chart series, status colors).
+
+Every pair of palette colors is compared with the CIEDE2000 color difference,
+both as the colors are and after each colorblindness simulation. Pairs whose
+difference falls below a threshold are reported, so a palette that only works
+for typical color vision can be caught before it ships.
+
+The pairwise distances are computed in row blocks of bounded size, so palettes
+of thousands of colors need neither an N x N matrix nor a Python-level loop
+over the pairs.
+"""
+import collections
+
+import numpy as np
+
+from color_spaces import rgb_to_lab
+from color_tools import as_rgb_array
+from colorblind_sim import AUDIT_VIEWS, LEGACY, ORIGINAL, simulate_image
+
+# Below this CIEDE2000 difference two categorical colors are easily confused
+# at chart sizes (a just-noticeable difference is about 2.3)
+MIN_DISTINGUISHABLE_DELTA_E = 10.0
+
+# Maximum pairwise distances held in memory at once
+DELTA_E_CHUNK_CELLS = 1 << 18
+
+# Pairs found for one view: (K, 2) palette indices (first < second) and their differences
+PairReport = collections.namedtuple("PairReport", ["pairs", "delta_e"])
+
+
+def delta_e_2000(lab1, lab2) -> np.ndarray:
+    """
+    CIEDE2000 color difference between CIELAB colors (broadcasting like any
+    numpy operation), following Sharma, Wu & Dalal (2005).
+
+    Examples:
+        >>> delta_e_2000([50.0, 2.6772, -79.7751], [50.0, 0.0, -82.7485]).round(4).tolist()
+        2.0425
+        >>> delta_e_2000([[50.0, 2.5, 0.0]], [[73.0, 25.0, -18.0]]).round(4).tolist()
+        [27.1492]
+
+    Arguments:
+        lab1: Array-like of (L, a, b) colors, last axis of length 3
+        lab2: Array-like of (L, a, b) colors, last axis of length 3
+
+    Returns:
+        np.ndarray: Differences (0.0 for identical colors)
+    """
+    lab1 = np.asarray(lab1, dtype=np.float64)
+    lab2 = np.asarray(lab2, dtype=np.float64)
+    l1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    l2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    c_mean7 = ((np.hypot(a1, b1) + np.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - np.sqrt(c_mean7 / (c_mean7 + 25.0 ** 7)))
+    a1, a2 = a1 * (1 + g), a2 * (1 + g)
+    c1, c2 = np.hypot(a1, b1), np.hypot(a2, b2)
+    h1 = np.degrees(np.arctan2(b1, a1)) % 360
+    h2 = np.degrees(np.arctan2(b2, a2)) % 360
+    chromatic = c1 * c2 != 0
+
+    # Hue difference and mean hue, taking the short way around the circle
+    dh = h2 - h1
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(chromatic, dh, 0.0)
+    h_sum = h1 + h2
+    h_mean = np.where(np.abs(h1 - h2) <= 180, h_sum / 2,
+                      np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2))
+    h_mean = np.where(chromatic, h_mean, h_sum)
+
+    dl = l2 - l1
+    dc = c2 - c1
+    dhh = 2 * np.sqrt(c1 * c2) * np.sin(np.radians(dh) / 2)
+    l_mean = (l1 + l2) / 2
+    c_mean = (c1 + c2) / 2
+
+    t = (1 - 0.17 * np.cos(np.radians(h_mean - 30))
+         + 0.24 * np.cos(np.radians(2 * h_mean))
+         + 0.32 * np.cos(np.radians(3 * h_mean + 6))
+         - 0.20 * np.cos(np.radians(4 * h_mean - 63)))
+    rotation = 30 * np.exp(-((h_mean - 275) / 25) ** 2)
+    c_mean7 = c_mean ** 7
+    r_t = -2 * np.sqrt(c_mean7 / (c_mean7 + 25.0 ** 7)) * np.sin(np.radians(2 * rotation))
+    s_l = 1 + 0.015 * (l_mean - 50) ** 2 / np.sqrt(20 + (l_mean - 50) ** 2)
+    s_c = 1 + 0.045 * c_mean
+    s_h = 1 + 0.015 * c_mean * t
+
+    dl, dc, dhh = dl / s_l, dc / s_c, dhh / s_h
+    return np.sqrt(np.maximum(dl * dl + dc * dc + dhh * dhh + r_t * dc * dhh, 0.0))
+
+
+def iter_close_pairs(labs, threshold: float, chunk_cells: int = DELTA_E_CHUNK_CELLS):
+    """
+    Yield the pairs of colors closer than threshold, one block of rows at a time.
+    Each pair (i, j) with i < j is computed once, and a block holds at most
+    chunk_cells differences (but always at least one row).
+
+    Examples:
+        >>> labs = [[50.0, 0.0, 0.0], [51.0, 0.0, 0.0], [90.0, 0.0, 0.0]]
+        >>> [(pairs.tolist(), distances.round(2).tolist())
+        ...  for pairs, distances in iter_close_pairs(labs, 5.0)]
+        [([[0, 1]], [1.0])]
+
+    Arguments:
+        labs: (N, 3) CIELAB colors
+        threshold (float): Pairs with a smaller difference are yielded
+        chunk_cells (int): Maximum number of differences per block
+
+    Yields:
+        tuple: ((K, 2) int64 index pairs, (K,) float64 differences) per block
+    """
+    labs = np.asarray(labs, dtype=np.float64)
+    count = len(labs)
+    rows = max(1, chunk_cells // max(1, count))
+    for start in range(0, count - 1, rows):
+        stop = min(start + rows, count - 1)
+        # Rows start..stop-1 against every later color
+        distances = delta_e_2000(labs[start:stop, None], labs[None, start + 1:])
+        row, offset = np.nonzero(distances < threshold)
+        column = start + 1 + offset
+        later = column > start + row
+        row, column = row[later], column[later]
+        if len(row):
+            yield (np.stack([start + row, column], axis=-1),
+                   distances[row, column - start - 1])
+
+
+def find_indistinguishable_pairs(palette, threshold: float = MIN_DISTINGUISHABLE_DELTA_E,
+                                 model: str = LEGACY,
+                                 chunk_cells: int = DELTA_E_CHUNK_CELLS) -> dict:
+    """
+    Find the palette color pairs that are hard to tell apart, as seen normally
+    and with each colorblindness condition. Pairs listed for a condition but
+    not for "original" are the ones the condition makes indistinguishable.
+
+    Examples:
+        >>> palette = [(255, 0, 0), (0, 128, 0), (0, 0, 255)]
+        >>> report = find_indistinguishable_pairs(palette, threshold=25.0)
+        >>> report["original"].pairs.tolist()
+        []
+        >>> report["protanopia"].pairs.tolist(), report["protanopia"].delta_e.round(1).tolist()
+        ([[0, 1]], [23.1])
+
+    Arguments:
+        palette: (N, 3) colors (see color_tools.as_rgb_array)
+        threshold (float): CIEDE2000 difference below which a pair is flagged
+        model (str): Simulation model (see colorblind_sim)
+        chunk_cells (int): Working-memory limit passed to iter_close_pairs()
+
+    Returns:
+        dict: View name (colorblind_sim.AUDIT_VIEWS) -> PairReport, pairs in
+            row-major order
+    """
+    palette = as_rgb_array(palette)
+    report = {}
+    for view in AUDIT_VIEWS:
+        seen = palette if view == ORIGINAL else simulate_image(palette, view, model)
+        blocks = list(iter_close_pairs(rgb_to_lab(seen), threshold, chunk_cells))
+        if blocks:
+            pairs = np.concatenate([pairs for pairs, _ in blocks])
+            delta_e = np.concatenate([distances for _, distances in blocks])
+        else:
+            pairs, delta_e = np.empty((0, 2), dtype=np.int64), np.empty(0)
+        report[view] = PairReport(pairs, delta_e)
+    return report
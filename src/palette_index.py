@@ -0,0 +1,115 @@
+"""
+Palette index for contrast queries against a fixed set of colors.
+
+Colors are stored sorted by luminance. Contrast against a color X only falls
+as a palette color's luminance approaches X's and rises again past it, so:
+
+- the colors with contrast >= r against X are a prefix and a suffix of the
+  sorted palette, found by bisecting at the cutoffs of
+  color_tools.plan_contrast_luminance();
+- the k highest-contrast partners of X are taken from the two ends of the
+  sorted palette, merging inwards, in O(k) instead of a scan of the palette.
+"""
+import array
+import bisect
+
+from color_tools import (LUMINANCE_OFFSET, PACKED_TYPECODE, calculate_luminance,
+                         calculate_luminance_packed, pack_colors, plan_contrast_luminance,
+                         unpack_rgb)
+
+
+def _contrast(lumin: float, other: float) -> float:
+    """contrast_ratio() from two luminances, in the same float steps."""
+    if lumin > other:
+        return (lumin + LUMINANCE_OFFSET) / (other + LUMINANCE_OFFSET)
+    return (other + LUMINANCE_OFFSET) / (lumin + LUMINANCE_OFFSET)
+
+
+class PaletteIndex:
+    """
+    Palette colors sorted by luminance (ties keep palette order).
+
+    Examples:
+        >>> index = PaletteIndex([(255, 255, 255), (0, 0, 0), (119, 119, 119), (118, 118, 118)])
+        >>> index.colors_with_contrast(255, 255, 255, 4.5)
+        [(0, 0, 0), (118, 118, 118)]
+        >>> [(color, round(ratio, 2)) for color, ratio in index.top_contrast(0, 0, 0, 2)]
+        [((255, 255, 255), 21.0), ((119, 119, 119), 4.69)]
+
+    Attributes:
+        packed (array.array): Packed colors (see color_tools.pack_rgb), darkest first
+        luminances (list): Luminance of each packed color
+    """
+
+    def __init__(self, colors) -> None:
+        packed = pack_colors(colors)
+        luminances = [calculate_luminance_packed(color) for color in packed]
+        order = sorted(range(len(packed)), key=luminances.__getitem__)
+        self.packed = array.array(PACKED_TYPECODE, (packed[position] for position in order))
+        self.luminances = [luminances[position] for position in order]
+
+    def __len__(self) -> int:
+        return len(self.packed)
+
+    def contrast_bounds(self, lumin: float, min_ratio: float) -> tuple:
+        """
+        Positions bounding the colors with contrast >= min_ratio against a
+        luminance: those before dark_stop and those from light_start on.
+
+        Arguments:
+            lumin (float): Luminance to contrast against
+            min_ratio (float): Required contrast ratio
+
+        Returns:
+            tuple: (dark_stop, light_start)
+        """
+        if min_ratio <= 1:
+            return len(self.packed), len(self.packed)  # every ratio is at least 1
+        dark_cutoff, light_cutoff = plan_contrast_luminance(lumin, min_ratio)
+        dark_stop = bisect.bisect_right(self.luminances, dark_cutoff)
+        light_start = max(bisect.bisect_left(self.luminances, light_cutoff), dark_stop)
+        return dark_stop, light_start
+
+    def colors_with_contrast(self, r: int, g: int, b: int, min_ratio: float) -> list:
+        """
+        Every palette color whose contrast_ratio() against (r, g, b) is at
+        least min_ratio, darkest first.
+
+        Arguments:
+            r, g, b (int): RGB values of the color to contrast against (0-255)
+            min_ratio (float): Required contrast ratio, e.g. WCAG_AA_NORMAL_RATIO
+
+        Returns:
+            list: (r, g, b) tuples
+        """
+        dark_stop, light_start = self.contrast_bounds(calculate_luminance(r, g, b), min_ratio)
+        packed = self.packed
+        return ([unpack_rgb(color) for color in packed[:dark_stop]]
+                + [unpack_rgb(color) for color in packed[light_start:]])
+
+    def top_contrast(self, r: int, g: int, b: int, k: int) -> list:
+        """
+        The k palette colors with the highest contrast against (r, g, b),
+        highest first; on equal ratios the darker color comes first.
+
+        Arguments:
+            r, g, b (int): RGB values of the color to contrast against (0-255)
+            k (int): Number of colors to return
+
+        Returns:
+            list: Up to k ((r, g, b), contrast ratio) pairs
+        """
+        lumin = calculate_luminance(r, g, b)
+        luminances = self.luminances
+        low, high = 0, len(luminances) - 1
+        partners = []
+        while low <= high and len(partners) < k:
+            low_ratio = _contrast(luminances[low], lumin)
+            high_ratio = _contrast(luminances[high], lumin)
+            if low_ratio >= high_ratio:
+                partners.append((unpack_rgb(self.packed[low]), low_ratio))
+                low += 1
+            else:
+                partners.append((unpack_rgb(self.packed[high]), high_ratio))
+                high -= 1
+        return partners
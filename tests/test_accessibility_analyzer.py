@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import accessibility_analyzer # type: ignore
+import color_tools # type: ignore
+
+
+def run(command, text, input_format="csv", **kwargs):
+    """Run a batch subcommand over text and return (output, skipped rows)."""
+    output = io.StringIO()
+    rows = accessibility_analyzer.read_rows(io.StringIO(text), input_format)
+    writer = accessibility_analyzer.BatchWriter(command, output, input_format)
+    skipped = accessibility_analyzer.run_batch(command, rows, writer, **kwargs)
+    return output.getvalue(), skipped
+
+
+class TestBatchCommands(unittest.TestCase):
+
+    def test_contrast_matches_check_contrast_logic(self) -> None:
+        """Tests the contrast subcommand against contrast_ratio and passes_wcag_level."""
+        text = "foreground,background\n#000000,#FFFFFF\n777777,ffffff\n"
+        output, skipped = run("contrast", text, chunk_rows=1)
+        lines = output.splitlines()
+        self.assertEqual(skipped, 0)
+        self.assertEqual(lines[0], "foreground,background,ratio,aa_normal,aa_large,aaa_normal,aaa_large,recommendation")
+        self.assertEqual(len(lines), 3, "Header should be written once across chunks")
+        ratio = color_tools.contrast_ratio(0x77, 0x77, 0x77, 255, 255, 255)
+        self.assertEqual(lines[2], f"#777777,#ffffff,{round(ratio, 2)},FAIL,PASS,FAIL,FAIL,{color_tools.recommend_adjustment(ratio, 4.5)}")
+
+    def test_ndjson_rows_and_invalid_input(self) -> None:
+        """Tests NDJSON input and output, and that invalid rows are skipped and counted."""
+        text = '{"color": "#000000"}\n["ffffff"]\n{broken\n{"color": "12"}\n42\nnull\n"#fff"\n'
+        output, skipped = run("grays", text, "ndjson", level="AA_NORMAL")
+        records = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(skipped, 5)
+        self.assertEqual([record["gray_count"] for record in records], [28, 24])
+        self.assertEqual(records[0]["darkest_gray"], "#757575", "Darkest gray for black text is 117")
+        self.assertEqual(records[0]["brightness_steps"], color_tools.find_minimum_brightness_steps(0, 0, 0, 128))
+
+    def test_analyze_and_simulate(self) -> None:
+        """Tests the analyze and simulate subcommands on single colors."""
+        output, _ = run("analyze", "808080\n")
+        self.assertEqual(output.splitlines()[1], "#808080,127,0.216,5,#000000,mid-tone")
+        output, _ = run("simulate", "ff8040\n")
+        self.assertEqual(output.splitlines()[1], "#ff8040,#bfbf40,#dfdf40,#ff8060")
+
+    def test_css_color_formats(self) -> None:
+        """Tests that batch rows accept named, rgb() and short hex colors."""
+        output, skipped = run("contrast", "navy,white\nrgb(119 119 119),#fff\nnavy,nonsense\n")
+        lines = output.splitlines()
+        self.assertEqual(skipped, 1)
+        self.assertEqual([line.split(",")[:2] for line in lines[1:]], [["#000080", "#ffffff"], ["#777777", "#ffffff"]])
+
+    def test_header_detection(self) -> None:
+        """Tests that a first row is only a header when none of its values is a color."""
+        output, skipped = run("contrast", "zzz,#fff\n#000,#fff\n")
+        self.assertEqual(skipped, 1, "An invalid first data row should be reported, not dropped")
+        self.assertEqual(len(output.splitlines()), 2)
+        output, skipped = run("contrast", "text,background\n#000,#fff\n")
+        self.assertEqual((skipped, len(output.splitlines())), (0, 2))
+
+    def test_batch_main_writes_one_table(self) -> None:
+        """Tests that several inputs, in mixed formats, give one output in one format."""
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "colors.csv")
+            ndjson_path = os.path.join(directory, "colors.ndjson")
+            with open(csv_path, "w") as stream:
+                stream.write("color\n#000000\n")
+            with open(ndjson_path, "w") as stream:
+                stream.write('{"color": "#ffffff"}\n')
+            stdout = sys.stdout
+            sys.stdout = output = io.StringIO()
+            try:
+                status = accessibility_analyzer.batch_main(["analyze", csv_path, ndjson_path, csv_path])
+            finally:
+                sys.stdout = stdout
+        lines = output.getvalue().splitlines()
+        self.assertEqual(status, 0)
+        self.assertEqual(lines[0], ",".join(accessibility_analyzer.batch_columns("analyze")))
+        self.assertEqual([line.split(",")[0] for line in lines[1:]], ["#000000", "#ffffff", "#000000"])
+
+    def test_colorblind_contrast(self) -> None:
+        """Tests that the colorblind-contrast subcommand reports each simulated view."""
+        output, _ = run("colorblind-contrast", "ff0000,008000\n")
+        lines = output.splitlines()
+        self.assertEqual(lines[0].split(",")[2:6], ["original_ratio", "original_aa_normal", "protanopia_ratio", "protanopia_aa_normal"])
+        self.assertEqual(lines[1], "#ff0000,#008000,1.28,FAIL,2.53,FAIL,8.41,PASS,1.26,FAIL")
+
+
+class TestInteractiveMenu(unittest.TestCase):
+
+    def test_main_without_atlas_module(self) -> None:
+        """Tests that the menu starts when the atlas (and so numpy) cannot be imported."""
+        output = io.StringIO()
+        with mock.patch.dict(sys.modules, {"color_atlas": None}), \
+                mock.patch("builtins.input", return_value="5"), \
+                mock.patch("sys.stdout", output):
+            self.assertFalse(color_tools.enable_color_atlas())
+            accessibility_analyzer.main([])
+        self.assertIn("Thanks for using the Web Accessibility Analyzer!", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
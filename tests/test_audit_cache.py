@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+import io
+import tempfile
+import multiprocessing
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import accessibility_analyzer # type: ignore
+import audit_cache # type: ignore
+
+
+def _write_entries(path: str, worker: int) -> None:
+    """Stores 20 entries from a separate process."""
+    with audit_cache.AuditCache(path, max_bytes=10_000) as cache:
+        for entry in range(20):
+            cache.put(f"{worker}-{entry}", bytes(100), worker)
+
+
+class TestAuditCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.sqlite")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_keys(self) -> None:
+        """Tests that keys change with the content, options and algorithm versions."""
+        key = audit_cache.content_key("ab", "grays", level="AA_NORMAL")
+        self.assertNotEqual(key, audit_cache.content_key("ac", "grays", level="AA_NORMAL"))
+        self.assertNotEqual(key, audit_cache.content_key("ab", "analyze", level="AA_NORMAL"))
+        version = audit_cache.ALGORITHM_VERSION
+        try:
+            audit_cache.ALGORITHM_VERSION = version + 1
+            self.assertNotEqual(key, audit_cache.content_key("ab", "grays", level="AA_NORMAL"),
+                                "A new algorithm version should invalidate old keys")
+        finally:
+            audit_cache.ALGORITHM_VERSION = version
+        version = audit_cache.SIMULATION_VERSION
+        try:
+            audit_cache.SIMULATION_VERSION = version + 1
+            self.assertNotEqual(key, audit_cache.content_key("ab", "grays", level="AA_NORMAL"),
+                                "A new simulation version should invalidate old keys")
+        finally:
+            audit_cache.SIMULATION_VERSION = version
+
+    def test_get_put_and_eviction(self) -> None:
+        """Tests hits, misses and that the least recently used entries are evicted first."""
+        with audit_cache.AuditCache(self.path, max_bytes=300) as cache:
+            self.assertIsNone(cache.get("a"))
+            for key in "abc":
+                cache.put(key, key.encode() * 100, 1)
+            self.assertEqual(cache.get("a"), (b"a" * 100, 1))
+            cache.put("d", b"d" * 100)
+            self.assertIsNone(cache.get("b"), "The least recently used entry should be evicted")
+            self.assertIsNotNone(cache.get("a"), "A recently read entry should be kept")
+            self.assertLessEqual(cache.total_bytes(), 300)
+            self.assertEqual(len(cache), 3)
+            cache.put("e", b"e" * 301)
+            self.assertIsNone(cache.get("e"), "An output larger than max_bytes should not be stored")
+            self.assertEqual(len(cache), 3, "Nothing should be evicted for an output that is not stored")
+
+    def test_concurrent_writers(self) -> None:
+        """Tests that processes sharing one cache file neither fail nor exceed the size limit."""
+        audit_cache.AuditCache(self.path).close()
+        processes = [multiprocessing.Process(target=_write_entries, args=(self.path, worker))
+                     for worker in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0, "A writer process failed")
+        with audit_cache.AuditCache(self.path, max_bytes=10_000) as cache:
+            self.assertEqual(len(cache), 80)
+
+    def test_batch_reuses_results(self) -> None:
+        """Tests that --cache returns the same output and reruns only changed files."""
+        input_path = os.path.join(self.directory.name, "colors.csv")
+        with open(input_path, "w") as stream:
+            stream.write("foreground,background\n#777777,#ffffff\nnope,#000000\n")
+
+        def run() -> str:
+            output = io.StringIO()
+            stdout, stderr = sys.stdout, sys.stderr
+            sys.stdout, sys.stderr = output, io.StringIO()
+            try:
+                status = accessibility_analyzer.batch_main(["contrast", input_path, "--cache", self.path])
+            finally:
+                sys.stdout, sys.stderr = stdout, stderr
+            self.assertEqual(status, 1, "The skipped row should still be counted")
+            return output.getvalue()
+
+        first = run()
+        with audit_cache.AuditCache(self.path) as cache:
+            self.assertEqual(len(cache), 1)
+        self.assertEqual(run(), first, "A cached run should reproduce the output")
+        with open(input_path, "a") as stream:
+            stream.write("#000000,#ffffff\n")
+        self.assertNotEqual(run(), first, "A changed file should be audited again")
+        with audit_cache.AuditCache(self.path) as cache:
+            self.assertEqual(len(cache), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import numpy as np
+
+import color_atlas # type: ignore
+import color_tools # type: ignore
+
+# A color outside the computed red = 0 slice, given made-up atlas values
+PLANTED_COLOR = (200, 10, 10)
+
+
+class TestColorAtlas(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Builds a synthetic atlas: only the red = 0 slice is computed, plus one planted color."""
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmpdir.name, "atlas.bin")
+        with open(cls.path, "wb") as atlas_file:
+            atlas_file.truncate(color_atlas._file_size())
+        color_atlas._fill_red_slice((cls.path, 0, 1))
+        sections = color_atlas._map_sections(cls.path, "r+")
+        index = color_atlas.color_index(*PLANTED_COLOR)
+        sections["gray_count"][index] = 99
+        sections["gray_background"][index] = 42
+        for section in sections.values():
+            section.flush()
+        del sections
+        color_atlas._write_header(cls.path)
+        cls.atlas = color_atlas.load_atlas(cls.path, verify=True)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        del cls.atlas
+        cls.tmpdir.cleanup()
+
+    def test_atlas_matches_color_tools(self) -> None:
+        """Tests computed atlas entries against the live color_tools functions, luminance exactly."""
+        rng = np.random.default_rng(7)
+        colors = [[0, g, b] for g, b in rng.integers(0, 256, size=(500, 2)).tolist()] + [[0, 0, 0], [0, 255, 255]]
+        for r, g, b in colors:
+            index = color_atlas.color_index(r, g, b)
+            self.assertEqual(self.atlas.luminance[index], color_tools.calculate_luminance(r, g, b))
+            self.assertEqual(self.atlas.brightness[index], color_tools.calculate_brightness(r, g, b))
+            self.assertEqual(self.atlas.gray_count[index], color_tools.calculate_contrast_with_grays(r, g, b))
+            self.assertEqual(self.atlas.gray_background[index], color_tools.find_accessible_gray_background(r, g, b))
+
+    def test_load_atlas_rejects_bad_files(self) -> None:
+        """Tests that truncated, foreign or outdated files are rejected."""
+        bad_path = os.path.join(self.tmpdir.name, "bad.bin")
+        with open(bad_path, "wb") as bad_file:
+            bad_file.write(b"not an atlas" * 10)
+        with self.assertRaises(ValueError):
+            color_atlas.load_atlas(bad_path)
+        with self.assertRaises(FileNotFoundError):
+            color_atlas.load_atlas(os.path.join(self.tmpdir.name, "missing.bin"))
+        version = color_atlas.ALGORITHM_VERSION
+        try:
+            color_atlas.ALGORITHM_VERSION = version + 1
+            with self.assertRaises(ValueError, msg="An atlas from another algorithm version should be stale"):
+                color_atlas.load_atlas(self.path)
+        finally:
+            color_atlas.ALGORITHM_VERSION = version
+
+    def test_queries_use_atlas_or_fall_back(self) -> None:
+        """Tests the query functions with and without an atlas file."""
+        saved = color_atlas._loaded_atlas, color_atlas._atlas_checked
+        try:
+            for loaded in (self.atlas, None):
+                color_atlas._loaded_atlas, color_atlas._atlas_checked = loaded, True
+                self.assertEqual(color_atlas.atlas_brightness(0, 255, 0), 149)
+                self.assertEqual(color_atlas.atlas_gray_count(0, 0, 0), 28)
+                self.assertEqual(color_atlas.atlas_gray_background(0, 100, 100), color_tools.find_accessible_gray_background(0, 100, 100))
+                self.assertEqual(color_atlas.atlas_luminance(0, 128, 128), color_tools.calculate_luminance(0, 128, 128))
+                batch = color_atlas.atlas_lookup_batch([(0, 0, 0), (0, 128, 128)])
+                self.assertEqual(batch["gray_count"].tolist(), [28, color_tools.calculate_contrast_with_grays(0, 128, 128)])
+            color_atlas._loaded_atlas = self.atlas
+            self.assertEqual(color_atlas.atlas_gray_count(*PLANTED_COLOR), 99)
+        finally:
+            color_atlas._loaded_atlas, color_atlas._atlas_checked = saved
+
+    def test_color_tools_reads_enabled_atlas(self) -> None:
+        """Tests that color_tools' gray queries read the atlas only when enabled and for default arguments."""
+        live_count = color_tools.calculate_contrast_with_grays(*PLANTED_COLOR)
+        try:
+            self.assertTrue(color_tools.enable_color_atlas(self.path))
+            self.assertEqual(color_tools.calculate_contrast_with_grays(*PLANTED_COLOR), 99)
+            self.assertEqual(color_tools.find_accessible_gray_background(*PLANTED_COLOR), 42)
+            self.assertEqual(color_tools.calculate_contrast_with_grays(*PLANTED_COLOR, step=1),
+                             color_tools.calculate_contrast_with_grays_batch([PLANTED_COLOR], step=1)[0],
+                             "Other steps should still be computed")
+            self.assertFalse(color_tools.enable_color_atlas(os.path.join(self.tmpdir.name, "missing.bin")))
+        finally:
+            color_tools.disable_color_atlas()
+        self.assertEqual(color_tools.calculate_contrast_with_grays(*PLANTED_COLOR), live_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
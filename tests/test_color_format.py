@@ -0,0 +1,39 @@
+import unittest
+import sys
+import os
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import numpy as np
+
+import color_format # type: ignore
+import accessibility_analyzer # type: ignore
+
+
+class TestColorFormat(unittest.TestCase):
+
+    def test_scalar_formatting(self) -> None:
+        """Tests the table against format() for every channel value, and the swatch link."""
+        for value in range(256):
+            self.assertEqual(color_format.format_hex(value, 255 - value, value // 2),
+                             f"#{value:02x}{255 - value:02x}{value // 2:02x}")
+        self.assertEqual(accessibility_analyzer.rgb_to_hex(255, 128, 64), "#ff8040")
+        with mock.patch.dict(os.environ, {"TERM_PROGRAM": "", "WT_SESSION": ""}):
+            self.assertEqual(accessibility_analyzer.create_color_swatch_link(255, 128, 64),
+                             "https://www.color-hex.com/color/ff8040")
+
+    def test_column_and_bytes_formatting(self) -> None:
+        """Tests the array formatters against the scalar formatter."""
+        colors = np.random.default_rng(19).integers(0, 256, size=(1000, 3), dtype=np.uint8)
+        expected = [color_format.format_hex(*color) for color in colors.tolist()]
+        self.assertEqual(color_format.format_hex_column(colors), expected)
+        self.assertEqual(color_format.format_hex_column(colors, prefix=""), [code[1:] for code in expected])
+        self.assertEqual(color_format.format_hex_bytes(colors), "".join(code + "\n" for code in expected).encode("ascii"))
+        self.assertEqual(color_format.format_hex_bytes(colors[:2], prefix=b"", separator=b","),
+                         (expected[0][1:] + "," + expected[1][1:] + ",").encode("ascii"))
+        self.assertEqual(color_format.format_hex_column(np.empty((0, 3), dtype=np.uint8)), [])
+        self.assertEqual(color_format.format_hex_bytes(np.empty((0, 3), dtype=np.uint8)), b"")
+
+
+if __name__ == '__main__':
+    unittest.main()
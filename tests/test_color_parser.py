@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import numpy as np
+
+import color_parser # type: ignore
+import accessibility_analyzer # type: ignore
+
+
+class TestColorParser(unittest.TestCase):
+
+    def test_hex_lengths(self) -> None:
+        """Tests 3, 4, 6 and 8 digit hex colors and rejected hex strings."""
+        self.assertEqual(color_parser.parse_color("#FF8040"), (255, 128, 64))
+        self.assertEqual(color_parser.parse_color("ff8040"), (255, 128, 64))
+        self.assertEqual(color_parser.parse_color("#f84"), (255, 136, 68))
+        self.assertEqual(color_parser.parse_color("#f84c"), (255, 136, 68), "Alpha digit should be ignored")
+        self.assertEqual(color_parser.parse_color("#FF8040CC"), (255, 128, 64), "Alpha byte should be ignored")
+        for text in ("", "#", "#12", "#12345", "#1234567", "#GGGGGG", "#-fff", "# fff", "+fff", "0xfff", "#ff_ff0",
+                     "0xff", "#0xff", "0x12345f"):
+            self.assertIsNone(color_parser.parse_hex(text), f"{text!r} is not a hex color")
+
+    def test_functions_and_names(self) -> None:
+        """Tests rgb(), hsl() and named colors, including CSS syntax variants."""
+        cases = {
+            "rgb(255, 128, 0)": (255, 128, 0),
+            "RGBA(255,128,0,0.3)": (255, 128, 0),
+            "rgb(255 128 0 / 50%)": (255, 128, 0),
+            "rgb(100%, 50%, 0%)": (255, 128, 0),
+            "rgb(300, -20, 12.6)": (255, 0, 13),
+            "rgb(100% 0 50%)": (255, 0, 128),
+            "hsl(0, 100%, 50%)": (255, 0, 0),
+            "hsl(120deg 100% 25%)": (0, 128, 0),
+            "hsla(0.6667turn, 100%, 50%, 1)": (0, 0, 255),
+            "hsl(-120, 50%, 50%)": (64, 64, 191),
+            "  White ": (255, 255, 255),
+            "RebeccaPurple": (102, 51, 153),
+            "grey": (128, 128, 128),
+        }
+        for text, expected in cases.items():
+            self.assertEqual(color_parser.parse_color(text), expected, f"{text!r}")
+        for text in ("rgb(1, 2)", "rgb(1, 2, 3, 4, 5)", "rgb(a, b, c)", "hsl(120, 100, 50)", "notacolor", "rgb(1,2,3",
+                     "rgb(100%, 0, 0)", "rgba(255, 0%, 0, 1)"):
+            self.assertIsNone(color_parser.parse_color(text), f"{text!r} is not a color")
+        self.assertEqual(len(color_parser.NAMED_COLORS), 148)
+
+    def test_parse_color_column(self) -> None:
+        """Tests bulk parsing against single-string parsing."""
+        values = ["#000", "red", "rgb(1,2,3)", "nope", "#ABCDEF", "red", ""] * 50
+        colors, valid = color_parser.parse_color_column(values)
+        self.assertEqual(colors.dtype, np.uint8)
+        for value, color, ok in zip(values, colors.tolist(), valid.tolist()):
+            expected = color_parser.parse_color(value)
+            self.assertEqual(ok, expected is not None, f"{value!r}")
+            if ok:
+                self.assertEqual(tuple(color), expected)
+        empty, empty_valid = color_parser.parse_color_column([])
+        self.assertEqual((empty.shape, empty_valid.shape), ((0, 3), (0,)))
+
+    def test_analyzer_hex_to_rgb(self) -> None:
+        """Tests that hex_to_rgb uses the parser and rejects malformed strings."""
+        self.assertEqual(accessibility_analyzer.hex_to_rgb("#abc"), (170, 187, 204))
+        with self.assertRaises(ValueError):
+            accessibility_analyzer.hex_to_rgb("#FF8040ZZ")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import numpy as np
+
+import color_spaces # type: ignore
+import color_tools # type: ignore
+
+
+class TestColorSpaces(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.colors = np.random.default_rng(14).integers(0, 256, size=(500, 3), dtype=np.uint8)
+
+    def test_reference_colors(self) -> None:
+        """Tests well-known Lab values for white, black, primaries and mid gray."""
+        colors = [(255, 255, 255), (0, 0, 0), (255, 0, 0), (0, 255, 0), (0, 0, 255), (119, 119, 119)]
+        expected = [[100.0, 0.0, 0.0], [0.0, 0.0, 0.0], [53.2, 80.1, 67.2],
+                    [87.7, -86.2, 83.2], [32.3, 79.2, -107.9], [50.0, 0.0, 0.0]]
+        lab = color_spaces.rgb_to_lab(colors)
+        self.assertTrue(np.allclose(lab, expected, atol=0.1), f"Unexpected Lab values {lab.round(1).tolist()}")
+
+    def test_y_is_wcag_luminance(self) -> None:
+        """Tests that Y equals calculate_luminance and that srgb_to_linear matches the table."""
+        xyz = color_spaces.rgb_to_xyz(self.colors)
+        expected = [color_tools.calculate_luminance(*color) for color in self.colors.tolist()]
+        self.assertTrue(np.allclose(xyz[:, 1], expected, rtol=0, atol=1e-15))
+        levels = np.arange(256)
+        self.assertTrue(np.allclose(color_spaces.srgb_to_linear(levels / 255), color_tools.LINEAR_RGB_ARRAY))
+
+    def test_lch_round_trip_and_scalar_cache(self) -> None:
+        """Tests LCh round trips and that the cached scalar functions match the arrays."""
+        lab = color_spaces.rgb_to_lab(self.colors)
+        self.assertTrue(np.allclose(color_spaces.lch_to_lab(color_spaces.lab_to_lch(lab)), lab))
+        lch = color_spaces.rgb_to_lch(self.colors)
+        self.assertTrue(np.all((lch[:, 2] >= 0) & (lch[:, 2] < 360)), "Hues should be in [0, 360)")
+
+        color_spaces.lab.cache_clear()
+        scalar = [color_spaces.lab(*color) for color in self.colors.tolist()]
+        self.assertTrue(np.allclose(scalar, lab, rtol=0, atol=1e-9))
+        self.assertTrue(np.allclose([color_spaces.lch(*color) for color in self.colors[:20].tolist()], lch[:20]))
+        info = color_spaces.lab.cache_info()
+        self.assertEqual(info.hits, 20, "lch() should reuse the cached Lab values")
+        with self.assertRaises(ValueError):
+            color_spaces.lab(256, 0, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,17 @@
 import unittest
 import sys
 import os
+import math
+import random
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
 import color_tools # type: ignore
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # This is a sample unit test library
 # you can run this by going into the folder and running
 # python3 test_color_tools.py   
@@ -207,6 +214,333 @@ class TestColorTools(unittest.TestCase):
         self.assertGreater(extreme_bright_grays, 0, "Near-white should be compatible with some grays")
         self.assertGreater(extreme_dark_grays, 0, "Near-black should be compatible with some grays")
 
+    def test_linear_rgb_table_matches_gamma_formula(self) -> None:
+        """Tests the precomputed linear-light table against the WCAG gamma formula."""
+        self.assertEqual(len(color_tools.LINEAR_RGB_TABLE), 256, "Table should hold one entry per 8-bit channel value")
+        for value in range(256):
+            channel = value / 255
+            if channel <= 0.03928:
+                expected = channel / 12.92
+            else:
+                expected = ((channel + 0.055) / 1.055) ** 2.4
+            self.assertEqual(color_tools.LINEAR_RGB_TABLE[value], expected, f"LINEAR_RGB_TABLE[{value}] should match the gamma formula exactly")
+            self.assertEqual(color_tools.calculate_luminance(value, value, 0), 0.2126 * expected + 0.7152 * expected, "calculate_luminance should use the table values")
+        for channels in ((-1, 0, 0), (0, 256, 0), (0, 0, -255)):
+            with self.assertRaises(ValueError, msg=f"{channels} should not index the table"):
+                color_tools.calculate_luminance(*channels)
+
+    # BATCH TESTS (need numpy)
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_calculate_luminance_batch_matches_scalar(self) -> None:
+        """Tests calculate_luminance_batch against calculate_luminance over a grid of colors."""
+        levels = list(range(0, 256, 7)) + [255]
+        colors = np.array([(r, g, b) for r in levels for g in levels for b in levels], dtype=np.uint8)
+        batch = color_tools.calculate_luminance_batch(colors)
+        self.assertEqual(batch.shape, (len(colors),), "Batch result should have one value per color")
+        expected = [color_tools.calculate_luminance(int(r), int(g), int(b)) for r, g, b in colors]
+        self.assertEqual(batch.tolist(), expected, "Batch luminance should exactly match the scalar function")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_calculate_luminance_batch_inputs(self) -> None:
+        """Tests calculate_luminance_batch with packed buffers, lists and invalid input."""
+        packed = bytes([255, 0, 0, 0, 255, 0])
+        self.assertEqual(color_tools.calculate_luminance_batch(packed).tolist(),
+                         [color_tools.calculate_luminance(255, 0, 0), color_tools.calculate_luminance(0, 255, 0)],
+                         "Packed RGB bytes should be read as consecutive colors")
+        self.assertEqual(color_tools.calculate_luminance_batch([[0, 0, 255]]).tolist(), [color_tools.calculate_luminance(0, 0, 255)])
+        self.assertEqual(color_tools.calculate_luminance_batch(np.zeros((0, 3), dtype=np.uint8)).shape, (0,))
+        with self.assertRaises(ValueError):
+            color_tools.calculate_luminance_batch([[300, 0, 0]])
+        with self.assertRaises(ValueError):
+            color_tools.calculate_luminance_batch(bytes([1, 2]))
+        with self.assertRaises(ValueError, msg="RGBA rows must not be regrouped into RGB"):
+            color_tools.calculate_luminance_batch(np.zeros((3, 4), dtype=np.uint8))
+        with self.assertRaises(ValueError, msg="Fractional channels must not be truncated"):
+            color_tools.calculate_luminance_batch([[0.5, 0, 0]])
+        self.assertEqual(color_tools.as_rgb_array(np.zeros((2, 2, 3))).shape, (4, 3))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_contrast_ratio_matrix_matches_scalar(self) -> None:
+        """Tests contrast_ratio_matrix and its chunking against contrast_ratio."""
+        rng = np.random.default_rng(3)
+        foregrounds = rng.integers(0, 256, size=(37, 3), dtype=np.uint8)
+        backgrounds = rng.integers(0, 256, size=(11, 3), dtype=np.uint8)
+        matrix = color_tools.contrast_ratio_matrix(foregrounds, backgrounds)
+        self.assertEqual(matrix.shape, (37, 11))
+        for i, fg in enumerate(foregrounds.tolist()):
+            for j, bg in enumerate(backgrounds.tolist()):
+                self.assertEqual(matrix[i, j], color_tools.contrast_ratio(*fg, *bg), "Matrix entry should exactly match contrast_ratio")
+
+        chunked = color_tools.contrast_ratio_matrix(foregrounds, backgrounds, chunk_cells=25)
+        self.assertTrue(np.array_equal(matrix, chunked), "Chunk size should not change the result")
+        blocks = list(color_tools.iter_contrast_matrix(foregrounds, backgrounds, chunk_cells=25))
+        self.assertTrue(all(ratios.size <= 25 for _, ratios in blocks), "Blocks should respect the cell budget")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_wcag_level_masks_match_passes_wcag_level(self) -> None:
+        """Tests wcag_level_masks against passes_wcag_level at and around every threshold."""
+        ratios = np.array([1.0, 2.99, 3.0, 4.49, 4.5, 6.99, 7.0, 21.0])
+        masks = color_tools.wcag_level_masks(ratios)
+        self.assertEqual(set(masks), {"AA_NORMAL", "AA_LARGE", "AAA_NORMAL", "AAA_LARGE"})
+        for level, mask in masks.items():
+            expected = [color_tools.passes_wcag_level(ratio, level) for ratio in ratios.tolist()]
+            self.assertEqual(mask.tolist(), expected, f"{level} mask should match passes_wcag_level")
+
+    def test_find_minimum_brightness_steps_matches_loop(self) -> None:
+        """Tests the solved find_minimum_brightness_steps against a one-step-at-a-time loop."""
+        def loop_steps(r, g, b, target):
+            target = max(0, min(255, target))
+            brightness = color_tools.calculate_brightness(r, g, b)
+            steps = 0
+            while brightness < target:
+                r, g, b = min(r + 1, 255), min(g + 1, 255), min(b + 1, 255)
+                brightness = color_tools.calculate_brightness(r, g, b)
+                steps += 1
+                if r == g == b == 255:
+                    break
+            return steps
+
+        levels = [0, 1, 17, 64, 128, 200, 254, 255]
+        for r in levels:
+            for g in levels:
+                for b in levels:
+                    for target in (-1, 0, 50, 128, 200, 255, 300):
+                        self.assertEqual(color_tools.find_minimum_brightness_steps(r, g, b, target), loop_steps(r, g, b, target),
+                                         f"find_minimum_brightness_steps({r}, {g}, {b}, {target}) should match the loop")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_find_minimum_brightness_steps_batch_matches_scalar(self) -> None:
+        """Tests find_minimum_brightness_steps_batch and calculate_brightness_batch against the scalar functions."""
+        rng = np.random.default_rng(4)
+        colors = rng.integers(0, 256, size=(2000, 3), dtype=np.uint8)
+        targets = rng.integers(-10, 300, size=2000)
+        steps = color_tools.find_minimum_brightness_steps_batch(colors, targets)
+        expected = [color_tools.find_minimum_brightness_steps(*color, target) for color, target in zip(colors.tolist(), targets.tolist())]
+        self.assertEqual(steps.tolist(), expected, "Batch steps should match the scalar function")
+        self.assertEqual(color_tools.find_minimum_brightness_steps_batch(colors[:3], 128).shape, (3,))
+
+        brightness = color_tools.calculate_brightness_batch(colors)
+        self.assertEqual(brightness.tolist(), [color_tools.calculate_brightness(*color) for color in colors.tolist()])
+
+    def test_find_accessible_gray_background_matches_scan(self) -> None:
+        """Tests the bisection search against checking every gray, for every WCAG level."""
+        levels = [0, 30, 64, 100, 128, 160, 200, 255]
+        for level in ("AA_NORMAL", "AA_LARGE", "AAA_NORMAL", "AAA_LARGE"):
+            for color in [(r, g, b) for r in levels for g in levels for b in levels]:
+                passing = [gray for gray in range(256) if color_tools.passes_wcag_level(color_tools.contrast_ratio(*color, gray, gray, gray), level)]
+                expected = passing[0] if passing else 255
+                self.assertEqual(color_tools.find_accessible_gray_background(*color, level), expected,
+                                 f"find_accessible_gray_background{color} at {level} should be the darkest passing gray")
+        self.assertEqual(color_tools.find_accessible_gray_background(0, 0, 0, "INVALID"), 255, "Unknown level should fall back to 255")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_find_accessible_gray_background_batch_matches_scalar(self) -> None:
+        """Tests find_accessible_gray_background_batch against the scalar function."""
+        rng = np.random.default_rng(5)
+        colors = rng.integers(0, 256, size=(3000, 3), dtype=np.uint8)
+        for level in ("AA_NORMAL", "AA_LARGE", "AAA_NORMAL", "AAA_LARGE", "INVALID"):
+            grays = color_tools.find_accessible_gray_background_batch(colors, level)
+            expected = [color_tools.find_accessible_gray_background(*color, level) for color in colors.tolist()]
+            self.assertEqual(grays.tolist(), expected, f"Batch grays at {level} should match the scalar function")
+
+    def test_calculate_contrast_with_grays_parameters(self) -> None:
+        """Tests calculate_contrast_with_grays with other step sizes and WCAG levels against a full scan."""
+        levels = [0, 45, 100, 128, 180, 255]
+        for color in [(r, g, b) for r in levels for g in levels for b in levels]:
+            for level in ("AA_NORMAL", "AA_LARGE", "AAA_NORMAL", "AAA_LARGE"):
+                for step in (1, 5, 16, 255):
+                    expected = sum(color_tools.passes_wcag_level(color_tools.contrast_ratio(*color, gray, gray, gray), level) for gray in range(0, 256, step))
+                    self.assertEqual(color_tools.calculate_contrast_with_grays(*color, step, level), expected,
+                                     f"calculate_contrast_with_grays{color} with step {step} at {level} should match a full scan")
+        self.assertEqual(color_tools.calculate_contrast_with_grays(0, 0, 0, level="INVALID"), 0, "Unknown level should pass no grays")
+        with self.assertRaises(ValueError):
+            color_tools.calculate_contrast_with_grays(0, 0, 0, step=0)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_calculate_contrast_with_grays_batch_matches_scalar(self) -> None:
+        """Tests calculate_contrast_with_grays_batch against the scalar function."""
+        rng = np.random.default_rng(6)
+        colors = rng.integers(0, 256, size=(2000, 3), dtype=np.uint8)
+        for step, level in ((5, "AA_NORMAL"), (1, "AA_LARGE"), (3, "AAA_NORMAL"), (10, "AAA_LARGE"), (5, "INVALID")):
+            counts = color_tools.calculate_contrast_with_grays_batch(colors, step, level)
+            expected = [color_tools.calculate_contrast_with_grays(*color, step, level) for color in colors.tolist()]
+            self.assertEqual(counts.tolist(), expected, f"Batch counts with step {step} at {level} should match the scalar function")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_pairwise_and_simulation_batches_match_scalar(self) -> None:
+        """Tests contrast_ratio_batch and simulate_colorblindness_batch against the scalar functions."""
+        rng = np.random.default_rng(8)
+        foregrounds = rng.integers(0, 256, size=(1000, 3), dtype=np.uint8)
+        backgrounds = rng.integers(0, 256, size=(1000, 3), dtype=np.uint8)
+        ratios = color_tools.contrast_ratio_batch(foregrounds, backgrounds)
+        self.assertEqual(ratios.tolist(), [color_tools.contrast_ratio(*fg, *bg) for fg, bg in zip(foregrounds.tolist(), backgrounds.tolist())])
+        with self.assertRaises(ValueError):
+            color_tools.contrast_ratio_batch(foregrounds, backgrounds[:5])
+
+        for condition in ("protanopia", "deuteranopia", "tritanopia", "unknown"):
+            simulated = color_tools.simulate_colorblindness_batch(foregrounds, condition)
+            expected = [list(color_tools.simulate_colorblindness(*color, condition)) for color in foregrounds.tolist()]
+            self.assertEqual(simulated.tolist(), expected, f"Batch {condition} should match simulate_colorblindness")
+
+    def test_adjust_lightness_keeps_hue_and_is_minimal(self) -> None:
+        """Tests that adjust_lightness_for_contrast passes, keeps hue, and changes lightness minimally."""
+        if np is None:
+            self.skipTest("numpy not installed")
+        cases = [((119, 119, 119), (255, 255, 255)), ((230, 90, 60), (255, 255, 255)), ((30, 60, 200), (20, 20, 20)),
+                 ((90, 160, 90), (120, 120, 120)), ((240, 240, 10), (255, 250, 240))]
+        for color, background in cases:
+            adjusted = color_tools.adjust_lightness_for_contrast(*color, *background, 4.5)
+            self.assertGreaterEqual(color_tools.contrast_ratio(*adjusted, *background), 4.5, f"{adjusted} on {background}")
+            hue, saturation, lightness = color_tools._rgb_to_hsl(*color)
+            self.assertEqual(color_tools._hsl_to_rgb(hue, saturation, lightness), color, "HSL should round-trip")
+            change = color_tools.adjust_lightness_for_contrast_batch([color], [background], 4.5)[1][0]
+            # Every lightness strictly closer to the original fails, in both directions
+            for fraction in (0.25, 0.5, 0.75, 0.9):
+                closer = lightness - abs(change) * fraction
+                candidate = color_tools._hsl_to_rgb(hue, saturation, closer)
+                self.assertLess(color_tools.contrast_ratio(*candidate, *background), 4.5, f"{candidate} should fail on {background}")
+                closer = lightness + abs(change) * fraction
+                candidate = color_tools._hsl_to_rgb(hue, saturation, closer)
+                self.assertLess(color_tools.contrast_ratio(*candidate, *background), 4.5, f"{candidate} should fail on {background}")
+        self.assertEqual(color_tools.adjust_lightness_for_contrast(0, 0, 0, 255, 255, 255, 4.5), (0, 0, 0))
+        self.assertIsNone(color_tools.adjust_lightness_for_contrast(0, 0, 0, 118, 118, 118, 7.0))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_adjust_lightness_batch_matches_scalar(self) -> None:
+        """Tests adjust_lightness_for_contrast_batch against the scalar function."""
+        rng = np.random.default_rng(16)
+        colors = rng.integers(0, 256, size=(1000, 3), dtype=np.uint8)
+        backgrounds = rng.integers(0, 256, size=(1000, 3), dtype=np.uint8)
+        for target in (3.0, 4.5, 7.0):
+            adjusted, changes = color_tools.adjust_lightness_for_contrast_batch(colors, backgrounds, target)
+            for color, background, result, change in zip(colors.tolist(), backgrounds.tolist(), adjusted.tolist(), changes.tolist()):
+                expected = color_tools.adjust_lightness_for_contrast(*color, *background, target)
+                if expected is None:
+                    self.assertTrue(np.isnan(change) and result == color, f"{color} on {background} cannot reach {target}")
+                else:
+                    self.assertEqual(tuple(result), expected, f"{color} on {background} at {target}")
+        with self.assertRaises(ValueError):
+            color_tools.adjust_lightness_for_contrast_batch(colors, backgrounds[:3], 4.5)
+
+    def test_packed_colors_match_channel_functions(self) -> None:
+        """Tests that the packed-color functions agree with the (r, g, b) functions."""
+        colors = [(0, 0, 0), (255, 255, 255), (255, 128, 64), (1, 2, 3), (200, 17, 250), (128, 128, 128)]
+        packed = color_tools.pack_colors(colors)
+        self.assertEqual(packed.itemsize * len(packed), 4 * len(colors), "Packed colors should take 4 bytes each")
+        for color, value in zip(colors, packed):
+            self.assertEqual(value, color_tools.pack_rgb(*color))
+            self.assertEqual(color_tools.unpack_rgb(value), color)
+            self.assertEqual(color_tools.calculate_luminance_packed(value), color_tools.calculate_luminance(*color))
+            self.assertEqual(color_tools.calculate_brightness_packed(value), color_tools.calculate_brightness(*color))
+            self.assertEqual(color_tools.contrast_ratio_packed(value, 0xFFFFFF), color_tools.contrast_ratio(*color, 255, 255, 255))
+            for condition in ("protanopia", "deuteranopia", "tritanopia", "unknown"):
+                self.assertEqual(color_tools.unpack_rgb(color_tools.simulate_colorblindness_packed(value, condition)),
+                                 color_tools.simulate_colorblindness(*color, condition))
+        self.assertEqual(color_tools.calculate_brightness(0, 300, 0), 176, "Channels should not be masked to 8 bits")
+        self.assertEqual(color_tools.calculate_brightness(100.5, 0, 0), 30, "Float channels should still be accepted")
+        with self.assertRaises(ValueError):
+            color_tools.pack_colors([(0, 256, 0)])
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_packed_arrays(self) -> None:
+        """Tests packing arrays and passing array('I') containers to the batch functions."""
+        rng = np.random.default_rng(17)
+        colors = rng.integers(0, 256, size=(500, 3), dtype=np.uint8)
+        packed = color_tools.pack_rgb_array(colors)
+        self.assertEqual(packed.tolist(), [color_tools.pack_rgb(*color) for color in colors.tolist()])
+        self.assertTrue(np.array_equal(color_tools.unpack_rgb_array(packed), colors))
+        container = color_tools.pack_colors(colors.tolist())
+        self.assertTrue(np.array_equal(color_tools.as_rgb_array(container), colors))
+        self.assertEqual(color_tools.calculate_luminance_batch(container).tolist(),
+                         [color_tools.calculate_luminance_packed(value) for value in container])
+        with self.assertRaises(ValueError):
+            color_tools.unpack_rgb_array([0x1000000])
+
+    def test_contrast_cache_matches_and_counts(self) -> None:
+        """Tests that ContrastCache gives the uncached values and counts hits, misses and evictions."""
+        rng = random.Random(21)
+        palette = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(12)]
+        cache = color_tools.ContrastCache(capacity=50)
+        for _ in range(2000):
+            fg, bg = rng.choice(palette), rng.choice(palette)
+            self.assertEqual(cache.contrast_ratio(*fg, *bg), color_tools.contrast_ratio(*fg, *bg))
+            self.assertEqual(cache.luminance(*fg), color_tools.calculate_luminance(*fg))
+        info = cache.contrast_info()
+        self.assertEqual(info.hits + info.misses, 2000)
+        self.assertEqual(info.size, 50, "The cache should stay at its capacity")
+        self.assertEqual(info.misses - info.evictions, info.size)
+        self.assertGreater(info.evictions, 0, "144 pairs should not fit in 50 entries")
+        self.assertEqual(cache.luminance_info().misses, 12, "Each palette color should be computed once")
+        cache.clear()
+        self.assertEqual(cache.contrast_info(), (0, 0, 0, 0, 50))
+        with self.assertRaises(ValueError):
+            color_tools.PackedLRUCache(color_tools.calculate_luminance_packed, capacity=0)
+        for args in [(-1, 0, 0, 0, 0, 0), (0, 0, 0, 0, 256, 0)]:
+            with self.assertRaises(ValueError, msg=f"{args} should be rejected before packing"):
+                cache.contrast_ratio(*args)
+        with self.assertRaises(ValueError):
+            cache.contrast_ratio_packed(0x1000000, 0)
+        with self.assertRaises(ValueError):
+            cache.luminance(0, 0, 256)
+
+    def test_wcag_level_mask_matches_passes_wcag_level(self) -> None:
+        """Tests that every mask bit equals passes_wcag_level, including at the thresholds."""
+        rng = random.Random(22)
+        ratios = [1.0, 21.0, float("nan"), 2.9999999999999996] + list(color_tools.WCAG_LEVEL_RATIOS.values())
+        ratios += [math.nextafter(ratio, 0) for ratio in color_tools.WCAG_LEVEL_RATIOS.values()]
+        ratios += [rng.uniform(1, 21) for _ in range(500)]
+        batch = color_tools.wcag_level_mask_batch(ratios).tolist() if np is not None else None
+        for position, ratio in enumerate(ratios):
+            expected = sum(bit for level, bit in color_tools.WCAG_LEVEL_BITS.items()
+                           if color_tools.passes_wcag_level(ratio, level))
+            self.assertEqual(color_tools.wcag_level_mask(ratio), expected, f"Wrong mask for {ratio!r}")
+            if batch is not None:
+                self.assertEqual(batch[position], expected, f"Wrong batch mask for {ratio!r}")
+
+    def test_contrast_plan_matches_contrast_ratio(self) -> None:
+        """Tests that plan cutoffs give the same pass/fail as contrast_ratio for every level."""
+        rng = random.Random(23)
+        backgrounds = [(0, 0, 0), (255, 255, 255), (119, 119, 119)]
+        backgrounds += [tuple(rng.randrange(256) for _ in range(3)) for _ in range(7)]
+        foregrounds = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(300)]
+        foregrounds += [(gray, gray, gray) for gray in range(256)]
+        for background in backgrounds:
+            for level in list(color_tools.WCAG_LEVEL_RATIOS) + ["POTATOES"]:
+                plan = color_tools.plan_contrast(*background, level)
+                for foreground in foregrounds:
+                    expected = color_tools.passes_wcag_level(color_tools.contrast_ratio(*foreground, *background), level)
+                    self.assertEqual(color_tools.plan_passes(plan, color_tools.calculate_luminance(*foreground)),
+                                     expected, f"{foreground} on {background} at {level}")
+
+                # Luminances one float away from each cutoff fall on the expected sides
+                bg_lumin = color_tools.calculate_luminance(*background)
+                for cutoff in plan:
+                    if math.isinf(cutoff):
+                        continue
+                    for lumin in (math.nextafter(cutoff, -1), cutoff, math.nextafter(cutoff, 2)):
+                        lighter, darker = max(lumin, bg_lumin), min(lumin, bg_lumin)
+                        ratio = (lighter + color_tools.LUMINANCE_OFFSET) / (darker + color_tools.LUMINANCE_OFFSET)
+                        self.assertEqual(color_tools.plan_passes(plan, lumin),
+                                         color_tools.passes_wcag_level(ratio, level))
+
+        # The most extreme ratio: only black passes against white
+        plan = color_tools.plan_contrast_luminance(1.0, 21.0)
+        self.assertTrue(color_tools.plan_passes(plan, 0.0))
+        self.assertFalse(color_tools.plan_passes(plan, color_tools.calculate_luminance(0, 0, 1)))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_contrast_plan_batch(self) -> None:
+        """Tests plan_passes_batch against the contrast ratios of many candidates."""
+        rng = np.random.default_rng(23)
+        candidates = rng.integers(0, 256, size=(100000, 3), dtype=np.uint8)
+        luminances = color_tools.calculate_luminance_batch(candidates)
+        for background in rng.integers(0, 256, size=(5, 3)).tolist():
+            ratios = color_tools.contrast_ratio_batch(candidates, [background] * len(candidates))
+            for level, target in color_tools.WCAG_LEVEL_RATIOS.items():
+                plan = color_tools.plan_contrast(*background, level)
+                self.assertTrue(np.array_equal(color_tools.plan_passes_batch(plan, luminances), ratios >= target),
+                                f"Plan disagrees on {background} at {level}")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import numpy as np
+
+import colorblind_lut # type: ignore
+import colorblind_sim # type: ignore
+
+
+class TestColorblindLut(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(11)
+        self.image = rng.integers(0, 256, size=(64, 48, 3), dtype=np.uint8)
+
+    def test_exact_lut_matches_simulation(self) -> None:
+        """Tests that an exact table (built, saved and memory-mapped) reproduces simulate_image."""
+        with tempfile.TemporaryDirectory() as directory:
+            lut = colorblind_lut.ensure_exact_lut(directory, "tritanopia")
+            self.assertTrue(os.path.exists(colorblind_lut.exact_lut_path(directory, "tritanopia")))
+            simulated = colorblind_lut.apply_exact_lut(self.image, lut)
+            self.assertTrue(np.array_equal(simulated, colorblind_sim.simulate_image(self.image, "tritanopia")))
+            del lut
+            with self.assertRaises(FileNotFoundError):
+                colorblind_lut.load_exact_lut(directory, "protanopia")
+            version = colorblind_lut.SIMULATION_VERSION
+            try:
+                colorblind_lut.SIMULATION_VERSION = version + 1
+                with self.assertRaises(FileNotFoundError, msg="A table from another simulation version should not load"):
+                    colorblind_lut.load_exact_lut(directory, "tritanopia")
+            finally:
+                colorblind_lut.SIMULATION_VERSION = version
+
+
+if __name__ == '__main__':
+    unittest.main()
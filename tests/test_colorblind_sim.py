@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import numpy as np
+
+import colorblind_sim # type: ignore
+import color_tools # type: ignore
+
+
+def reference_simulation(color, matrix):
+    """Per-color float64 simulation straight from the WCAG gamma formulas."""
+    linear = [color_tools.gamma_correct(channel / 255) for channel in color]
+    result = []
+    for row in matrix:
+        value = min(max(sum(weight * channel for weight, channel in zip(row, linear)), 0.0), 1.0)
+        if value <= 0.03928 / 12.92:
+            encoded = value * 12.92
+        else:
+            encoded = 1.055 * value ** (1 / 2.4) - 0.055
+        result.append(round(encoded * 255))
+    return result
+
+
+class TestColorblindSim(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rng = np.random.default_rng(10)
+        self.image = rng.integers(0, 256, size=(40, 30, 3), dtype=np.uint8)
+
+    def test_matrix_models_match_reference(self) -> None:
+        """Tests each model and condition against a per-pixel reference (within one level)."""
+        for model, matrices in colorblind_sim.CONDITION_MATRICES.items():
+            for condition, matrix in matrices.items():
+                simulated = colorblind_sim.simulate_image(self.image, condition, model)
+                self.assertEqual(simulated.shape, self.image.shape)
+                expected = np.array([reference_simulation(color, matrix) for color in self.image.reshape(-1, 3).tolist()])
+                difference = np.abs(simulated.reshape(-1, 3).astype(int) - expected)
+                self.assertLessEqual(difference.max(), 1, f"{model} {condition} should match the reference")
+
+    def test_legacy_model_matches_simulate_colorblindness(self) -> None:
+        """Tests that the legacy model is the original simplified simulation."""
+        for condition in ("protanopia", "deuteranopia", "tritanopia", "unknown"):
+            simulated = colorblind_sim.simulate_image(self.image, condition, colorblind_sim.LEGACY)
+            expected = [list(color_tools.simulate_colorblindness(*color, condition)) for color in self.image.reshape(-1, 3).tolist()]
+            self.assertEqual(simulated.reshape(-1, 3).tolist(), expected)
+
+    def test_blocks_and_edge_cases(self) -> None:
+        """Tests block processing, gray and unknown inputs, and invalid model/condition pairs."""
+        whole = colorblind_sim.simulate_image(self.image, "deuteranopia")
+        saved = colorblind_sim.SIMULATION_BLOCK_PIXELS
+        colorblind_sim.SIMULATION_BLOCK_PIXELS = 7
+        try:
+            self.assertTrue(np.array_equal(colorblind_sim.simulate_image(self.image, "deuteranopia"), whole))
+        finally:
+            colorblind_sim.SIMULATION_BLOCK_PIXELS = saved
+
+        self.assertTrue(np.array_equal(colorblind_sim.simulate_image(self.image, "unknown"), self.image))
+        gray = colorblind_sim.simulate_color(128, 128, 128, "protanopia")
+        self.assertTrue(all(abs(channel - 128) <= 1 for channel in gray), "Grays should stay (nearly) gray")
+        with self.assertRaises(ValueError):
+            colorblind_sim.simulate_image(self.image, "tritanopia", colorblind_sim.VIENOT)
+        with self.assertRaises(ValueError):
+            colorblind_sim.simulate_image(self.image, "protanopia", "nonsense")
+        with self.assertRaises(ValueError):
+            colorblind_sim.simulate_image(np.zeros((4, 4), dtype=np.uint8), "protanopia")
+
+    def test_contrast_audit_matches_scalar_functions(self) -> None:
+        """Tests every audit view against contrast_ratio of the simulated colors."""
+        foregrounds = self.image[:, 0].reshape(-1, 3)
+        backgrounds = self.image[:, 1].reshape(-1, 3)
+        for model in (colorblind_sim.LEGACY, colorblind_sim.MACHADO):
+            audit = colorblind_sim.audit_colorblind_contrast(foregrounds, backgrounds, model)
+            self.assertEqual(audit["ratio"].shape, (len(foregrounds), 4))
+            for column, view in enumerate(colorblind_sim.AUDIT_VIEWS):
+                expected = []
+                for fg, bg in zip(foregrounds.tolist(), backgrounds.tolist()):
+                    if view != colorblind_sim.ORIGINAL:
+                        fg = colorblind_sim.simulate_color(*fg, view, model)
+                        bg = colorblind_sim.simulate_color(*bg, view, model)
+                    expected.append(color_tools.contrast_ratio(*fg, *bg))
+                self.assertEqual(audit["ratio"][:, column].tolist(), expected, f"{model} {view} ratios")
+                self.assertEqual(audit["AA_NORMAL"][:, column].tolist(),
+                                 [ratio >= 4.5 for ratio in expected], f"{model} {view} AA")
+        with self.assertRaises(ValueError):
+            colorblind_sim.audit_colorblind_contrast(foregrounds, backgrounds[1:])
+        with self.assertRaisesRegex(ValueError, "does not simulate tritanopia"):
+            colorblind_sim.audit_colorblind_contrast(foregrounds, backgrounds, colorblind_sim.VIENOT)
+        with self.assertRaises(ValueError):
+            colorblind_sim.audit_colorblind_contrast(foregrounds, backgrounds, "unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
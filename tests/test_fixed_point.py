@@ -0,0 +1,132 @@
+import unittest
+import sys
+import os
+import random
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import color_tools # type: ignore
+import fixed_point # type: ignore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Set to 1 to check every pair of 24-bit colors (about a minute and 1 GB of memory)
+FULL_GAMUT = os.environ.get("FIXED_POINT_FULL_GAMUT") == "1"
+
+# Color index spacing of the default gamut sample (66,841 colors)
+SAMPLE_STRIDE = 251
+
+
+class TestFixedPoint(unittest.TestCase):
+
+    def test_scalar_matches_float_functions(self) -> None:
+        """Tests fixed-point checks against contrast_ratio and passes_wcag_level on random pairs."""
+        rng = random.Random(24)
+        for _ in range(3000):
+            fg = tuple(rng.randrange(256) for _ in range(3))
+            bg = tuple(rng.randrange(256) for _ in range(3))
+            ratio = color_tools.contrast_ratio(*fg, *bg)
+            fg_lumin, bg_lumin = fixed_point.fixed_luminance(*fg), fixed_point.fixed_luminance(*bg)
+            self.assertEqual(fixed_point.fixed_level_mask(fg_lumin, bg_lumin), color_tools.wcag_level_mask(ratio))
+            for level in list(color_tools.WCAG_LEVEL_RATIOS) + ["POTATOES"]:
+                self.assertEqual(fixed_point.fixed_contrast_passes(*fg, *bg, level),
+                                 color_tools.passes_wcag_level(ratio, level), f"{fg} on {bg} at {level}")
+
+    def check_pair_agreement(self, packed) -> None:
+        """
+        Checks that every pair of the given colors gets the same pass/fail as contrast_ratio at every level.
+        For each background, the passing foregrounds are those at or below one luminance cutoff and
+        at or above another, so with the colors sorted by float luminance it is enough to find the
+        float cutoffs and check the fixed-point result on both sides of each, plus checking the
+        few colors whose fixed-point luminances are out of float order against every background.
+        """
+        colors = color_tools.unpack_rgb_array(packed)
+        lumin = color_tools.calculate_luminance_batch(colors)
+        fixed = fixed_point.fixed_luminance_batch(colors)
+        del colors
+        order = np.argsort(lumin, kind="stable")
+        sorted_lumin, sorted_fixed = lumin[order], fixed[order]
+        count = len(order)
+
+        # Colors the fixed-point luminance does not order strictly like the float one
+        unordered = np.flatnonzero(np.diff(sorted_fixed) <= 0)
+        self.assertLess(len(unordered), 10, "The fixed-point scale is too coarse")
+        for position in np.union1d(unordered, unordered + 1).tolist():
+            index = order[position]
+            ratios = color_tools.contrast_ratio_from_luminance(lumin[index], lumin)
+            for level, target in color_tools.WCAG_LEVEL_RATIOS.items():
+                self.assertTrue(np.array_equal(fixed_point.fixed_passes_batch(fixed[index], fixed, level),
+                                               ratios >= target), f"Color {index:06x} disagrees at {level}")
+
+        def float_passes(positions, bg_lumin, target):
+            positions = np.clip(positions, 0, count - 1)
+            return color_tools.contrast_ratio_from_luminance(sorted_lumin[positions], bg_lumin) >= target
+
+        def fixed_passes(positions, bg_fixed, level):
+            return fixed_point.fixed_passes_batch(sorted_fixed[np.clip(positions, 0, count - 1)], bg_fixed, level)
+
+        def step_while(positions, step, condition):
+            while True:
+                mask = condition()
+                if not mask.any():
+                    return
+                positions[mask] += step
+
+        for start in range(0, count, 1 << 21):
+            backgrounds = order[start:start + (1 << 21)]
+            bg_lumin, bg_fixed = lumin[backgrounds], fixed[backgrounds]
+            for target, level in {target: level for level, target in color_tools.WCAG_LEVEL_RATIOS.items()}.items():
+                # First passing position lighter than the background
+                light = np.searchsorted(sorted_lumin, target * (bg_lumin + 0.05) - 0.05)
+                step_while(light, -1, lambda: (light > 0) & float_passes(light - 1, bg_lumin, target)
+                           & (sorted_lumin[np.maximum(light - 1, 0)] > bg_lumin))
+                step_while(light, 1, lambda: (light < count) & ~float_passes(light, bg_lumin, target))
+                agree = ((light == count) | fixed_passes(light, bg_fixed, level)) & (
+                    (sorted_lumin[np.maximum(light - 1, 0)] <= bg_lumin) | ~fixed_passes(light - 1, bg_fixed, level))
+
+                # Last passing position darker than the background
+                dark = np.searchsorted(sorted_lumin, (bg_lumin + 0.05) / target - 0.05, side="right") - 1
+                step_while(dark, -1, lambda: (dark >= 0) & ~float_passes(dark, bg_lumin, target))
+                step_while(dark, 1, lambda: (dark < count - 1) & float_passes(dark + 1, bg_lumin, target)
+                           & (sorted_lumin[np.minimum(dark + 1, count - 1)] <= bg_lumin))
+                agree &= ((dark < 0) | fixed_passes(dark, bg_fixed, level)) & (
+                    (sorted_lumin[np.minimum(dark + 1, count - 1)] > bg_lumin) | ~fixed_passes(dark + 1, bg_fixed, level))
+
+                self.assertTrue(agree.all(), f"{np.count_nonzero(~agree)} backgrounds disagree at {level}")
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_sampled_gamut_agreement(self) -> None:
+        """Tests every pair of an evenly spread sample of colors, plus black, white and the grays."""
+        sample = np.arange(0, 1 << 24, SAMPLE_STRIDE, dtype=np.uint32)
+        grays = np.arange(256, dtype=np.uint32) * 0x010101
+        self.check_pair_agreement(np.union1d(sample, grays))
+
+    @unittest.skipIf(np is None or not FULL_GAMUT, "set FIXED_POINT_FULL_GAMUT=1 to check every pair")
+    def test_full_gamut_agreement(self) -> None:
+        """Tests every pair of 24-bit colors."""
+        self.check_pair_agreement(np.arange(1 << 24, dtype=np.uint32))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_batch_matches_scalar(self) -> None:
+        """Tests that the batch functions match the scalar ones."""
+        rng = np.random.default_rng(24)
+        foregrounds = rng.integers(0, 256, size=(1000, 3), dtype=np.uint8)
+        backgrounds = rng.integers(0, 256, size=(1000, 3), dtype=np.uint8)
+        fg_fixed = fixed_point.fixed_luminance_batch(foregrounds)
+        bg_fixed = fixed_point.fixed_luminance_batch(backgrounds)
+        self.assertEqual(fg_fixed.tolist(), [fixed_point.fixed_luminance(*color) for color in foregrounds.tolist()])
+        self.assertEqual(fixed_point.fixed_level_mask_batch(fg_fixed, bg_fixed).tolist(),
+                         [fixed_point.fixed_level_mask(fg, bg) for fg, bg in zip(fg_fixed.tolist(), bg_fixed.tolist())])
+        self.assertFalse(fixed_point.fixed_passes_batch(fg_fixed, bg_fixed, "POTATOES").any())
+
+    def test_out_of_range_channels(self) -> None:
+        """Tests that channels outside 0-255 are rejected rather than wrapped around the table."""
+        for channels in ((-1, 0, 0), (0, 256, 0)):
+            with self.assertRaises(ValueError):
+                fixed_point.fixed_luminance(*channels)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import numpy as np
+
+import nearest_color # type: ignore
+import color_spaces # type: ignore
+import color_tools # type: ignore
+
+
+class TestNearestColor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.index = nearest_color.AccessibleColorIndex(nearest_color.candidate_colors(17), leaf_size=8)
+
+    def test_matches_brute_force(self) -> None:
+        """Tests the tree search against scanning every candidate, for each WCAG level."""
+        rng = np.random.default_rng(15)
+        foregrounds = rng.integers(0, 256, size=(80, 3), dtype=np.uint8)
+        backgrounds = rng.integers(0, 256, size=(80, 3), dtype=np.uint8)
+        candidates = nearest_color.candidate_colors(17)
+        candidate_lab = color_spaces.rgb_to_lab(candidates)
+        for level, ratio in color_tools.WCAG_LEVEL_RATIOS.items():
+            colors, distances = self.index.nearest_batch(foregrounds, backgrounds, level)
+            for fg, bg, color, distance in zip(foregrounds.tolist(), backgrounds.tolist(), colors.tolist(), distances.tolist()):
+                if color_tools.contrast_ratio(*fg, *bg) >= ratio:
+                    self.assertEqual((color, distance), (fg, 0.0), "Passing pairs should be unchanged")
+                    continue
+                passing = np.array([color_tools.contrast_ratio(*candidate, *bg) >= ratio for candidate in candidates.tolist()])
+                if not passing.any():
+                    self.assertEqual((color, distance), (fg, float("inf")))
+                    continue
+                expected = np.sqrt(((candidate_lab[passing] - color_spaces.rgb_to_lab([fg])) ** 2).sum(axis=1)).min()
+                self.assertAlmostEqual(distance, expected, places=9, msg=f"{level} {fg} on {bg}")
+                self.assertGreaterEqual(color_tools.contrast_ratio(*color, *bg), ratio)
+
+    def test_refine_improves_candidates(self) -> None:
+        """Tests that refined answers still pass and are never farther than the candidate answers."""
+        rng = np.random.default_rng(16)
+        foregrounds = rng.integers(0, 256, size=(40, 3), dtype=np.uint8)
+        backgrounds = rng.integers(0, 256, size=(40, 3), dtype=np.uint8)
+        colors, distances = self.index.nearest_batch(foregrounds, backgrounds)
+        refined, refined_distances = self.index.nearest_batch(foregrounds, backgrounds, refine=17)
+        self.assertTrue(np.all(refined_distances <= distances))
+        self.assertLess(refined_distances[np.isfinite(distances)].sum(), distances[np.isfinite(distances)].sum())
+        for color, bg, distance in zip(refined.tolist(), backgrounds.tolist(), refined_distances.tolist()):
+            if np.isfinite(distance):
+                self.assertGreaterEqual(color_tools.contrast_ratio(*color, *bg), color_tools.WCAG_AA_NORMAL_RATIO)
+
+    def test_default_index_and_errors(self) -> None:
+        """Tests the single-color helper, unreachable levels and invalid input."""
+        self.assertEqual(nearest_color.nearest_accessible_foreground(119, 119, 119, 255, 255, 255), (118, 118, 118),
+                         "#767676 is the closest gray that passes on white")
+        self.assertIsNone(nearest_color.nearest_accessible_foreground(0, 0, 0, 118, 118, 118, "AAA_NORMAL"),
+                          "No color reaches 7:1 against a mid gray")
+        with self.assertRaises(ValueError):
+            self.index.nearest_batch([(0, 0, 0)], [(255, 255, 255)], "AA")
+        with self.assertRaises(ValueError):
+            self.index.nearest_batch([(0, 0, 0)], [], "AA_NORMAL")
+        with self.assertRaises(ValueError):
+            nearest_color.candidate_colors(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
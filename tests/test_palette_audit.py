@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import numpy as np
+
+import palette_audit # type: ignore
+import colorblind_sim # type: ignore
+import color_spaces # type: ignore
+
+# (lab1, lab2, expected difference) from Sharma, Wu & Dalal's CIEDE2000 test data
+SHARMA_PAIRS = [
+    ((50.0, 2.6772, -79.7751), (50.0, 0.0, -82.7485), 2.0425),
+    ((50.0, 0.0, 0.0), (50.0, -1.0, 2.0), 2.3669),
+    ((50.0, 2.49, -0.001), (50.0, -2.49, 0.0009), 7.1792),
+    ((50.0, 2.49, -0.001), (50.0, -2.49, 0.0011), 7.2195),
+    ((50.0, -0.001, 2.49), (50.0, 0.0009, -2.49), 4.8045),
+    ((50.0, -0.001, 2.49), (50.0, 0.0011, -2.49), 4.7461),
+    ((50.0, 2.5, 0.0), (73.0, 25.0, -18.0), 27.1492),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((2.0776, 0.0795, -1.135), (0.9033, -0.0636, -0.5514), 0.9082),
+]
+
+
+class TestPaletteAudit(unittest.TestCase):
+
+    def test_delta_e_2000_reference_data(self) -> None:
+        """Tests delta_e_2000 against published reference values, in both orders."""
+        lab1 = np.array([pair[0] for pair in SHARMA_PAIRS])
+        lab2 = np.array([pair[1] for pair in SHARMA_PAIRS])
+        expected = [pair[2] for pair in SHARMA_PAIRS]
+        self.assertEqual(palette_audit.delta_e_2000(lab1, lab2).round(4).tolist(), expected)
+        self.assertEqual(palette_audit.delta_e_2000(lab2, lab1).round(4).tolist(), expected)
+        self.assertEqual(palette_audit.delta_e_2000(lab1, lab1).tolist(), [0.0] * len(expected))
+
+    def test_pairs_match_brute_force(self) -> None:
+        """Tests the chunked pair search against a full distance matrix for every view."""
+        palette = np.random.default_rng(13).integers(0, 256, size=(120, 3), dtype=np.uint8)
+        report = palette_audit.find_indistinguishable_pairs(palette, threshold=15.0)
+        chunked = palette_audit.find_indistinguishable_pairs(palette, threshold=15.0, chunk_cells=50)
+        self.assertEqual(list(report), list(colorblind_sim.AUDIT_VIEWS))
+        for view in colorblind_sim.AUDIT_VIEWS:
+            seen = palette if view == "original" else colorblind_sim.simulate_image(palette, view, "legacy")
+            labs = color_spaces.rgb_to_lab(seen)
+            distances = palette_audit.delta_e_2000(labs[:, None], labs[None, :])
+            expected = [[i, j] for i in range(len(palette)) for j in range(i + 1, len(palette))
+                        if distances[i, j] < 15.0]
+            self.assertEqual(report[view].pairs.tolist(), expected, f"{view} pairs")
+            self.assertTrue(np.allclose(report[view].delta_e, [distances[i, j] for i, j in expected]))
+            self.assertEqual(chunked[view].pairs.tolist(), expected, f"{view} pairs with tiny chunks")
+
+    def test_small_palettes(self) -> None:
+        """Tests palettes with fewer than two colors."""
+        for palette in ([(10, 20, 30)], np.empty((0, 3), dtype=np.uint8)):
+            report = palette_audit.find_indistinguishable_pairs(palette)
+            self.assertEqual(report["protanopia"].pairs.shape, (0, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
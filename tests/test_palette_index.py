@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+import random
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import color_tools # type: ignore
+import palette_index # type: ignore
+
+
+class TestPaletteIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.rng = random.Random(25)
+        self.palette = [tuple(self.rng.randrange(256) for _ in range(3)) for _ in range(2000)]
+        self.palette += [(gray, gray, gray) for gray in range(256)] + [(0, 0, 0), (255, 255, 255)]
+        self.index = palette_index.PaletteIndex(self.palette)
+        self.queries = [tuple(self.rng.randrange(256) for _ in range(3)) for _ in range(50)]
+        self.queries += [(0, 0, 0), (255, 255, 255), (119, 119, 119)]
+
+    def test_range_matches_scan(self) -> None:
+        """Tests that colors_with_contrast returns exactly the colors a contrast_ratio scan passes."""
+        self.assertEqual(len(self.index), len(self.palette))
+        for query in self.queries:
+            for min_ratio in [1.0, 1.5] + sorted(set(color_tools.WCAG_LEVEL_RATIOS.values())) + [21.0]:
+                expected = sorted(color for color in self.palette
+                                  if color_tools.contrast_ratio(*color, *query) >= min_ratio)
+                self.assertEqual(sorted(self.index.colors_with_contrast(*query, min_ratio)), expected,
+                                 f"Wrong colors for {query} at {min_ratio}")
+
+    def test_top_contrast_matches_scan(self) -> None:
+        """Tests that top_contrast returns the k highest ratios, in order, with matching colors."""
+        for query in self.queries:
+            expected = sorted((color_tools.contrast_ratio(*color, *query) for color in self.palette), reverse=True)
+            for k in (0, 1, 10, 300):
+                partners = self.index.top_contrast(*query, k)
+                self.assertEqual([ratio for _, ratio in partners], expected[:k], f"Wrong ratios for {query}")
+                for color, ratio in partners:
+                    self.assertEqual(color_tools.contrast_ratio(*color, *query), ratio)
+        self.assertEqual(len(self.index.top_contrast(0, 0, 0, len(self.palette) + 5)), len(self.palette))
+
+
+if __name__ == '__main__':
+    unittest.main()
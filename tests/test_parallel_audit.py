@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+import io
+import contextlib
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import accessibility_analyzer # type: ignore
+import parallel_audit # type: ignore
+
+
+class TestShardedExecutor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.executor = parallel_audit.ShardedExecutor(workers=2, shard_rows=100)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.executor.close()
+
+    def test_map_text_keeps_shard_order(self) -> None:
+        """Tests that map_text returns each shard's text and extra value in shard order."""
+        shards = [[(line, ["#000", "#fff"]) for line in range(start, start + 3)] for start in range(0, 30, 3)]
+        shards.append([(99, ["nope", "#fff"])])
+        expected = [accessibility_analyzer.audit_rows(shard, "contrast", "ndjson") for shard in shards]
+        self.assertEqual(self.executor.map_text(accessibility_analyzer.audit_rows, shards,
+                                                command="contrast", output_format="ndjson"), expected)
+        self.assertEqual(expected[-1], ("", [(99, ["nope", "#fff"])]))
+
+    def test_run_batch_with_executor(self) -> None:
+        """Tests that the batch command line output and skipped rows are unchanged when sharded."""
+        text = "".join(f"{value:06x},{(value * 7919) % 0xFFFFFF:06x}\n" for value in range(0, 0xFFFFFF, 9973))
+        text += "nope,#fff\n#000\n"
+        outputs = []
+        for executor in (None, self.executor):
+            output = io.StringIO()
+            rows = accessibility_analyzer.read_rows(io.StringIO(text), "csv")
+            writer = accessibility_analyzer.BatchWriter("contrast", output, "csv")
+            with contextlib.redirect_stderr(io.StringIO()) as errors:
+                skipped = accessibility_analyzer.run_batch("contrast", rows, writer, chunk_rows=500, executor=executor)
+            outputs.append((output.getvalue(), skipped, errors.getvalue()))
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[0][1], 2)
+
+if __name__ == '__main__':
+    unittest.main()